@@ -0,0 +1,93 @@
+"""Add service_category_scores ranking table
+
+Revision ID: 002_service_category_scores
+Revises: 001_initial
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002_service_category_scores'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'service_category_scores',
+        sa.Column('service_name', sa.String(), primary_key=True),
+        sa.Column('document_type', sa.String(), primary_key=True),
+        sa.Column('category', sa.String(), primary_key=True),
+        sa.Column('summary_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('critical_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('warning_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('info_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('severity_score', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('clarity_score', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+    )
+    # Covering index so ranking reads are index-only scans
+    op.create_index(
+        'ix_service_category_scores_ranking',
+        'service_category_scores',
+        ['category', 'document_type', 'severity_score'],
+        postgresql_include=[
+            'service_name',
+            'clarity_score',
+            'critical_count',
+            'warning_count',
+            'info_count',
+            'summary_id',
+        ],
+    )
+    
+    # Backfill from the latest summary of every service and document type
+    op.execute("""
+        WITH latest AS (
+            SELECT DISTINCT ON (d.service_name, d.document_type)
+                s.id, d.service_name, d.document_type, s.clarity_score,
+                s.red_flags, s.rules, s.concessions
+            FROM summaries s
+            JOIN documents d ON d.id = s.document_id
+            ORDER BY d.service_name, d.document_type, s.generated_at DESC, s.version DESC
+        ),
+        items AS (
+            SELECT l.id, l.service_name, l.document_type, l.clarity_score,
+                   f->>'category' AS category, f->>'severity' AS severity
+            FROM latest l, json_array_elements(l.red_flags) f
+            UNION ALL
+            SELECT l.id, l.service_name, l.document_type, l.clarity_score,
+                   r->>'category', NULL
+            FROM latest l, json_array_elements(l.rules) r
+            UNION ALL
+            SELECT l.id, l.service_name, l.document_type, l.clarity_score,
+                   c->>'category', NULL
+            FROM latest l, json_array_elements(l.concessions) c
+        ),
+        counts AS (
+            SELECT service_name, document_type, category, id, clarity_score,
+                   count(*) FILTER (WHERE severity = 'critical') AS critical_count,
+                   count(*) FILTER (WHERE severity = 'warning') AS warning_count,
+                   count(*) FILTER (WHERE severity = 'info') AS info_count
+            FROM items
+            GROUP BY service_name, document_type, category, id, clarity_score
+        )
+        INSERT INTO service_category_scores (
+            service_name, document_type, category, summary_id,
+            critical_count, warning_count, info_count, severity_score, clarity_score
+        )
+        SELECT service_name, document_type, category, id,
+               critical_count, warning_count, info_count,
+               3 * critical_count + 2 * warning_count + info_count, clarity_score
+        FROM counts
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_service_category_scores_ranking', table_name='service_category_scores')
+    op.drop_table('service_category_scores')
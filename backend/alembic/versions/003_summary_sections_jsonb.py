@@ -0,0 +1,48 @@
+"""Store summary sections as JSONB and GIN-index red flags
+
+Revision ID: 003_summary_sections_jsonb
+Revises: 002_service_category_scores
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '003_summary_sections_jsonb'
+down_revision = '002_service_category_scores'
+branch_labels = None
+depends_on = None
+
+SECTION_COLUMNS = ('red_flags', 'rules', 'concessions')
+
+
+def _convert(column_type, cast: str) -> None:
+    for column in SECTION_COLUMNS:
+        # The JSON-typed default cannot be cast in place; swap it around the type change
+        op.alter_column('summaries', column, server_default=None)
+        op.alter_column(
+            'summaries',
+            column,
+            type_=column_type,
+            postgresql_using=f'{column}::{cast}',
+            existing_nullable=False,
+        )
+        op.alter_column('summaries', column, server_default=sa.text(f"'[]'::{cast}"))
+
+
+def upgrade() -> None:
+    _convert(postgresql.JSONB(), 'jsonb')
+    op.create_index(
+        'ix_summaries_red_flags',
+        'summaries',
+        ['red_flags'],
+        postgresql_using='gin',
+        postgresql_ops={'red_flags': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_summaries_red_flags', table_name='summaries')
+    _convert(postgresql.JSON(), 'json')
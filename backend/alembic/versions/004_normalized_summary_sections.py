@@ -0,0 +1,75 @@
+"""Add normalized summary section tables
+
+Revision ID: 004_normalized_summary_sections
+Revises: 003_summary_sections_jsonb
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '004_normalized_summary_sections'
+down_revision = '003_summary_sections_jsonb'
+branch_labels = None
+depends_on = None
+
+
+def _summary_columns():
+    return [
+        sa.Column('summary_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('position', sa.Integer(), primary_key=True),
+        sa.Column('category', sa.String(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'summary_red_flags',
+        *_summary_columns(),
+        sa.Column('severity', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+    )
+    op.create_index('ix_summary_red_flags_category_severity', 'summary_red_flags', ['category', 'severity'])
+    
+    op.create_table(
+        'summary_rules',
+        *_summary_columns(),
+        sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+    )
+    op.create_index(op.f('ix_summary_rules_category'), 'summary_rules', ['category'])
+    
+    op.create_table(
+        'summary_concessions',
+        *_summary_columns(),
+        sa.Column('can_opt_out', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+    )
+    op.create_index('ix_summary_concessions_category_opt_out', 'summary_concessions', ['category', 'can_opt_out'])
+    
+    # Backfill from the JSONB sections of existing summaries
+    op.execute("""
+        INSERT INTO summary_red_flags (summary_id, position, category, severity)
+        SELECT s.id, f.ordinality - 1, f.value->>'category', f.value->>'severity'
+        FROM summaries s, jsonb_array_elements(s.red_flags) WITH ORDINALITY f
+    """)
+    op.execute("""
+        INSERT INTO summary_rules (summary_id, position, category)
+        SELECT s.id, r.ordinality - 1, r.value->>'category'
+        FROM summaries s, jsonb_array_elements(s.rules) WITH ORDINALITY r
+    """)
+    op.execute("""
+        INSERT INTO summary_concessions (summary_id, position, category, can_opt_out)
+        SELECT s.id, c.ordinality - 1, c.value->>'category', coalesce((c.value->>'can_opt_out')::boolean, false)
+        FROM summaries s, jsonb_array_elements(s.concessions) WITH ORDINALITY c
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_summary_concessions_category_opt_out', table_name='summary_concessions')
+    op.drop_table('summary_concessions')
+    op.drop_index(op.f('ix_summary_rules_category'), table_name='summary_rules')
+    op.drop_table('summary_rules')
+    op.drop_index('ix_summary_red_flags_category_severity', table_name='summary_red_flags')
+    op.drop_table('summary_red_flags')
@@ -0,0 +1,24 @@
+"""Allow documents to keep their text in the blob store
+
+Revision ID: 005_document_blob_storage
+Revises: 004_normalized_summary_sections
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_document_blob_storage'
+down_revision = '004_normalized_summary_sections'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # New rows reference a blob by content_hash and leave raw_content NULL
+    op.alter_column('documents', 'raw_content', existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('documents', 'raw_content', existing_type=sa.Text(), nullable=False)
@@ -0,0 +1,25 @@
+"""Track document version chains
+
+Revision ID: 006_document_version_chains
+Revises: 005_document_blob_storage
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_document_version_chains'
+down_revision = '005_document_blob_storage'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('base_content_hash', sa.String(), nullable=True))
+    op.add_column('documents', sa.Column('chain_depth', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'chain_depth')
+    op.drop_column('documents', 'base_content_hash')
@@ -0,0 +1,24 @@
+"""Record clause provenance of summary items
+
+Revision ID: 007_summary_provenance
+Revises: 006_document_version_chains
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007_summary_provenance'
+down_revision = '006_document_version_chains'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('summaries', sa.Column('provenance', postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('summaries', 'provenance')
@@ -0,0 +1,35 @@
+"""Add rescan_targets table
+
+Revision ID: 008_rescan_targets
+Revises: 007_summary_provenance
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_rescan_targets'
+down_revision = '007_summary_provenance'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rescan_targets',
+        sa.Column('url', sa.String(), primary_key=True),
+        sa.Column('domain', sa.String(), nullable=False),
+        sa.Column('etag', sa.String(), nullable=True),
+        sa.Column('last_modified', sa.String(), nullable=True),
+        sa.Column('body_hash', sa.String(), nullable=True),
+        sa.Column('last_status', sa.Integer(), nullable=True),
+        sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('next_check_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(op.f('ix_rescan_targets_next_check_at'), 'rescan_targets', ['next_check_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_rescan_targets_next_check_at'), table_name='rescan_targets')
+    op.drop_table('rescan_targets')
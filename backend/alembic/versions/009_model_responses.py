@@ -0,0 +1,36 @@
+"""Add model_responses cache table
+
+Revision ID: 009_model_responses
+Revises: 008_rescan_targets
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009_model_responses'
+down_revision = '008_rescan_targets'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'model_responses',
+        sa.Column('model_version', sa.String(), primary_key=True),
+        sa.Column('prompt_hash', sa.String(length=16), primary_key=True),
+        sa.Column('chunk_hash', sa.String(length=64), primary_key=True),
+        sa.Column('section', sa.String(), nullable=False),
+        sa.Column('items', postgresql.JSONB(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(op.f('ix_model_responses_last_used_at'), 'model_responses', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_model_responses_last_used_at'), table_name='model_responses')
+    op.drop_table('model_responses')
@@ -0,0 +1,41 @@
+"""Add indexes for latest summary lookups
+
+Revision ID: 010_latest_summary_indexes
+Revises: 009_model_responses
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010_latest_summary_indexes'
+down_revision = '009_model_responses'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The correlated "latest summary of a service and type" subquery used by
+    # analytics and rankings seeks the documents, then each document's newest
+    # summary. The composite indexes replace the single-column ones they start with.
+    op.create_index(
+        'ix_documents_service_name_document_type',
+        'documents',
+        ['service_name', 'document_type'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_summaries_document_id_generated_at_version',
+        'summaries',
+        ['document_id', 'generated_at', 'version'],
+        unique=False,
+    )
+    op.drop_index(op.f('ix_documents_service_name'), table_name='documents')
+    op.drop_index(op.f('ix_summaries_document_id'), table_name='summaries')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_summaries_document_id'), 'summaries', ['document_id'], unique=False)
+    op.create_index(op.f('ix_documents_service_name'), 'documents', ['service_name'], unique=False)
+    op.drop_index('ix_summaries_document_id_generated_at_version', table_name='summaries')
+    op.drop_index('ix_documents_service_name_document_type', table_name='documents')
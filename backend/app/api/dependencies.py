@@ -1,34 +1,39 @@
 """API dependencies for dependency injection."""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from redis.asyncio import Redis, from_url
 from app.config import settings
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator
 
-# Database setup
-engine = create_engine(
-    settings.database_url,
+# Database setup (async engine; the sync psycopg2 engine is only used by Alembic)
+engine = create_async_engine(
+    settings.async_database_url,
     echo=settings.database_echo,
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
-__all__ = ["engine", "get_db", "get_redis"]
+__all__ = ["engine", "AsyncSessionLocal", "get_db", "get_redis", "get_http_client"]
 
 # Redis client (singleton)
 _redis_client: Redis | None = None
 
+# Outbound HTTP client (singleton), so connections are reused per host
+_http_client: httpx.AsyncClient | None = None
+
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency for getting database session."""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 async def get_redis() -> Redis:
@@ -41,3 +46,21 @@ async def get_redis() -> Redis:
             decode_responses=True,
         )
     return _redis_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared HTTP/2 client with per-host connection pooling and keep-alive."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=settings.fetch_http2,
+            follow_redirects=True,
+            timeout=settings.fetch_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.fetch_max_connections,
+                max_keepalive_connections=settings.fetch_max_keepalive_connections,
+                keepalive_expiry=settings.fetch_keepalive_expiry_seconds,
+            ),
+            headers={"User-Agent": settings.fetch_user_agent},
+        )
+    return _http_client
@@ -0,0 +1,24 @@
+"""Aggregate analytics endpoint routes."""
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_db
+from app.models.schemas import SectionAggregateResponse
+from app.services.analytics import aggregate_section
+
+router = APIRouter()
+
+
+@router.get("/analytics/{section}", response_model=SectionAggregateResponse)
+async def get_section_aggregates(
+    section: Literal["red_flags", "rules", "concessions"],
+    document_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Anonymized per-category counts for one summary section.
+    
+    e.g. how many services have a class action waiver rule. Every category is
+    returned in one response, read from the normalized section tables.
+    """
+    return await aggregate_section(db, section, document_type)
@@ -1,21 +1,39 @@
 """Compare endpoint routes."""
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.api.dependencies import get_db
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_db, get_redis
+from app.config import settings
+from app.models.schemas import ComparisonResponse
+from app.services.comparison import compare_features, load_features
+from redis.asyncio import Redis
 from typing import List
 from uuid import UUID
 
 router = APIRouter()
 
 
-@router.post("/compare")
+@router.post("/compare", response_model=ComparisonResponse)
 async def compare_services(
     summary_ids: List[UUID],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     """
     Compare multiple service summaries.
     
-    TODO: Implement comparison logic (Phase 3)
+    Red flags, rules and concessions are aligned by category; the response
+    holds per-category severity matrices and score deltas.
     """
-    return {"message": "Comparison feature coming soon", "summary_ids": summary_ids}
+    summary_ids = list(dict.fromkeys(summary_ids))
+    if not 2 <= len(summary_ids) <= settings.compare_max_summaries:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Provide between 2 and {settings.compare_max_summaries} summary ids",
+        )
+    
+    features = await load_features(db, redis, summary_ids)
+    missing = [str(summary_id) for summary_id in summary_ids if summary_id not in features]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Summaries not found: {', '.join(missing)}")
+    
+    return compare_features([features[summary_id] for summary_id in summary_ids])
@@ -0,0 +1,73 @@
+"""Job status endpoint routes."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.api.dependencies import get_redis
+from app.config import settings
+from app.models.schemas import JobStatusResponse
+from app.services.job_events import read_job_state, watch_job
+from app.services.sections import JobSection
+from redis.asyncio import Redis
+from typing import Optional
+from uuid import UUID
+
+router = APIRouter()
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: UUID,
+    wait: float = Query(0, ge=0, description="Seconds to wait for a status change"),
+    since: Optional[str] = Query(None, description="Status the client already has"),
+    redis: Redis = Depends(get_redis),
+):
+    """
+    Retrieve the status of an analysis job.
+    
+    With ``wait`` > 0 this long-polls: the request blocks until the status
+    differs from ``since`` (or from the status at request time), the job
+    finishes, or the wait elapses.
+    """
+    wait = min(wait, settings.job_long_poll_max_seconds)
+    latest = None
+    async for state in watch_job(redis, job_id, wait):
+        if latest is None and since is None:
+            since = state.status
+        latest = state
+        if wait == 0 or state.status != since:
+            break
+    
+    if latest is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return latest
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: UUID,
+    redis: Redis = Depends(get_redis),
+):
+    """
+    Stream job progress as Server-Sent Events.
+    
+    Emits one ``status`` event per change (processing, fetched, extracted,
+    analyzing, completed/failed) and a ``section`` event for each summary
+    section as soon as it is analyzed. Sections finished before (re)connecting are
+    replayed first. The stream closes once the job reaches a final state.
+    """
+    if await read_job_state(redis, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        async for event in watch_job(
+            redis, job_id, settings.job_stream_max_seconds, include_sections=True
+        ):
+            if isinstance(event, JobSection):
+                yield f"event: section\ndata: {event.model_dump_json()}\n\n"
+            else:
+                yield f"event: status\ndata: {event.model_dump_json()}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
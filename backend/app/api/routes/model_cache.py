@@ -0,0 +1,23 @@
+"""Model response cache endpoint routes."""
+from fastapi import APIRouter, Depends
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_db, get_redis
+from app.models.schemas import ModelCacheStatsResponse
+from app.services.response_cache import cache_stats
+
+router = APIRouter()
+
+
+@router.get("/model-cache/stats", response_model=ModelCacheStatsResponse)
+async def get_model_cache_stats(
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+):
+    """
+    Hit rates of the model response cache per section.
+    
+    Also lists stored entries per prompt version; stale versions can be
+    purged with ``python -m app.model_cache purge``.
+    """
+    return await cache_stats(db, redis)
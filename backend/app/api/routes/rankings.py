@@ -0,0 +1,40 @@
+"""Category ranking endpoint routes."""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_db
+from app.models.schemas import CategoryRankingEntry, CategoryRankingResponse
+from app.services.rankings import get_category_ranking
+
+router = APIRouter()
+
+
+@router.get("/rankings/{category}", response_model=CategoryRankingResponse)
+async def get_rankings(
+    category: str,
+    document_type: str = Query("tos"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Rank services by red-flag severity within a category.
+    
+    Only services whose latest summary mentions the category are ranked.
+    """
+    rows = await get_category_ranking(db, category, document_type, limit)
+    return CategoryRankingResponse(
+        category=category,
+        document_type=document_type,
+        rankings=[
+            CategoryRankingEntry(
+                rank=rank,
+                service_name=row.service_name,
+                summary_id=row.summary_id,
+                severity_score=row.severity_score,
+                critical_count=row.critical_count,
+                warning_count=row.warning_count,
+                info_count=row.info_count,
+                clarity_score=row.clarity_score,
+            )
+            for rank, row in enumerate(rows, start=1)
+        ],
+    )
@@ -1,9 +1,28 @@
 """Summary endpoint routes."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.api.dependencies import get_db
-from app.models.schemas import SummaryResponse
-from app.models.database import Summary, Document
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_db, get_redis
+from app.models.schemas import (
+    FlaggedSummarySchema,
+    FlagSearchResponse,
+    SummaryBatchRequest,
+    SummaryBatchResponse,
+    SummaryResponse,
+)
+from app.models.database import Summary
+from app.services.summaries import (
+    find_flagged_summaries,
+    serialize_summary_row,
+    summary_response_select,
+)
+from app.services.summary_cache import (
+    cache_summaries,
+    cache_summary,
+    get_cached_summaries,
+    get_cached_summary,
+)
+from redis.asyncio import Redis
 from uuid import UUID
 
 router = APIRouter()
@@ -12,37 +31,77 @@ router = APIRouter()
 @router.get("/summary/{summary_id}", response_model=SummaryResponse)
 async def get_summary(
     summary_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     """
     Retrieve a summary by ID.
+    
+    Serialized responses are cached in Redis and returned verbatim on a hit.
     """
-    summary = db.query(Summary).filter(Summary.id == summary_id).first()
+    cached = await get_cached_summary(redis, summary_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    result = await db.execute(summary_response_select().where(Summary.id == summary_id))
+    row = result.first()
     
-    if not summary:
+    if row is None:
         raise HTTPException(status_code=404, detail="Summary not found")
     
-    document = db.query(Document).filter(Document.id == summary.document_id).first()
-    
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-    
-    # Convert JSON columns to Pydantic models
-    from app.models.schemas import RedFlagSchema, RuleSchema, ConcessionSchema
-    
-    return SummaryResponse(
-        id=summary.id,
-        service_name=document.service_name,
-        document_type=document.document_type,
-        analyzed_at=summary.generated_at,
-        clarity_score=summary.clarity_score,
-        red_flags=[RedFlagSchema(**flag) for flag in summary.red_flags],
-        rules=[RuleSchema(**rule) for rule in summary.rules],
-        concessions=[ConcessionSchema(**concession) for concession in summary.concessions],
-        metadata={
-            "original_word_count": summary.original_word_count,
-            "summary_word_count": summary.summary_word_count,
-            "reading_level": summary.reading_level,
-            "model_version": summary.model_version,
-        },
+    payload = serialize_summary_row(row)
+    await cache_summary(redis, summary_id, payload)
+    
+    return Response(content=payload, media_type="application/json")
+
+
+@router.post("/summaries:batch", response_model=SummaryBatchResponse)
+async def get_summaries_batch(
+    request: SummaryBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+):
+    """
+    Retrieve many summaries in one call.
+    
+    Ids are resolved through the cache tiers with a single MGET; misses are
+    loaded with one ``IN`` query. Unknown ids map to ``null``.
+    """
+    summary_ids = list(dict.fromkeys(request.ids))
+    payloads = await get_cached_summaries(redis, summary_ids)
+    
+    missing = [summary_id for summary_id, payload in payloads.items() if payload is None]
+    if missing:
+        result = await db.execute(summary_response_select().where(Summary.id.in_(missing)))
+        loaded = {row.id: serialize_summary_row(row) for row in result}
+        await cache_summaries(redis, loaded)
+        payloads.update(loaded)
+    
+    # Splice the cached JSON blobs together instead of re-validating them.
+    body = ",".join(
+        f'"{summary_id}":{payload if payload is not None else "null"}'
+        for summary_id, payload in payloads.items()
+    )
+    return Response(content=f'{{"summaries":{{{body}}}}}', media_type="application/json")
+
+
+@router.get("/summaries", response_model=FlagSearchResponse)
+async def search_summaries_by_flag(
+    flag_category: str,
+    flag_severity: Optional[Literal["critical", "warning", "info"]] = None,
+    document_type: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Find services whose latest summary carries a matching red flag.
+    
+    e.g. ``?flag_category=arbitration&flag_severity=critical``; answered by a
+    GIN-indexed containment query on ``red_flags``.
+    """
+    rows = await find_flagged_summaries(db, flag_category, flag_severity, document_type, limit)
+    return FlagSearchResponse(
+        category=flag_category,
+        severity=flag_severity,
+        results=[FlaggedSummarySchema(**row._mapping) for row in rows],
     )
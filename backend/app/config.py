@@ -1,6 +1,6 @@
 """Application configuration."""
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -19,14 +19,125 @@ class Settings(BaseSettings):
     # Redis Settings
     redis_url: str = "redis://localhost:6379/0"
     redis_ttl_seconds: int = 3600  # 1 hour default cache TTL
+    # Keyspace notifications used for job status push ("" leaves the server config alone):
+    # K keyspace channel, g generic, h hash (streamed sections), $ string (status), x expired
+    redis_keyspace_events: str = "Kgh$x"
+    
+    # In-process cache tier (per worker, in front of Redis)
+    local_cache_max_entries: int = 512
+    local_cache_max_bytes: int = 32 * 1024 * 1024  # 32 MiB
+    local_cache_ttl_seconds: int = 30  # Upper bound on staleness if an invalidation is missed
+    cache_invalidation_channel: str = "cache:invalidate:summary"
+    
+    # Batch retrieval limit for POST /api/summaries:batch
+    summary_batch_max_ids: int = 500
+    
+    # Raw document blob store (zstd-compressed, keyed by content hash)
+    blob_store_backend: Literal["local", "s3"] = "local"
+    blob_store_path: str = "./data/blobs"
+    blob_store_s3_bucket: Optional[str] = None
+    blob_store_s3_prefix: str = "documents/"
+    blob_store_s3_endpoint_url: Optional[str] = None  # e.g. MinIO for S3-compatible stores
+    blob_compression_level: int = 10
+    # Version chains: a full snapshot every N versions, line diffs in between
+    version_snapshot_interval: int = 10
+    version_delta_max_ratio: float = 0.5  # Snapshot instead when a diff is larger than this share of the text
+    version_cache_max_entries: int = 64  # Recently reconstructed texts kept in process
+    version_cache_max_bytes: int = 64 * 1024 * 1024  # 64 MiB
+    
+    # Map-reduce analysis of long documents
+    analysis_chunk_max_tokens: int = 6000  # Token budget of document text per model call
+    
+    # Persistent model response cache (see ``app.services.response_cache``)
+    model_cache_enabled: bool = True
+    model_cache_max_entries: int = 200_000  # Least recently used entries beyond this are evicted
+    model_cache_maintenance_interval_seconds: float = 60.0  # How often workers flush hits and evict
+    
+    # Incremental re-analysis of changed clauses
+    incremental_analysis_enabled: bool = True
+    incremental_max_changed_ratio: float = 0.5  # Re-analyze everything above this share of changed words
+    
+    # Analytics Settings
+    normalized_sections_enabled: bool = True  # Also write flags/rules/concessions as child rows
+    
+    # Comparison Settings
+    compare_max_summaries: int = 20
+    summary_features_ttl_seconds: int = 7 * 24 * 3600  # Features never change once written
+    
+    # Job queue / worker Settings
+    job_ttl_seconds: int = 3600  # How long job status and payloads are kept
+    job_visibility_timeout_seconds: int = 300  # Reserved jobs are redelivered after this
+    job_handler_margin_seconds: int = 30  # Handlers are stopped this long before their reservation expires
+    job_max_attempts: int = 3  # Attempts before a job is dead-lettered
+    job_retry_backoff_seconds: float = 5.0  # Base delay, doubled per failed attempt
+    job_retry_backoff_max_seconds: float = 300.0
+    worker_concurrency: int = 4  # Concurrent jobs per worker process
+    job_long_poll_max_seconds: int = 60
+    job_stream_max_seconds: int = 600
+    extraction_cache_ttl_seconds: int = 86400  # How long a URL's extracted content hash is trusted
+    
+    # Document fetching (shared pooled HTTP client)
+    fetch_timeout_seconds: float = 20.0
+    fetch_max_bytes: int = 5 * 1024 * 1024  # Cap on the decompressed response body
+    fetch_max_connections: int = 100
+    fetch_max_keepalive_connections: int = 20
+    fetch_keepalive_expiry_seconds: float = 30.0
+    fetch_http2: bool = True
+    fetch_user_agent: str = "ToSClarity/0.1 (+https://github.com/mmitsui/tandc)"
+    extraction_min_words: int = 150  # Fewer words from a static fetch escalate to a headless browser
+    
+    # Parsing process pool (CPU-bound HTML/PDF parsing off the event loop)
+    parse_processes: int = 0  # 0 = one per CPU
+    parse_max_pending: int = 32  # Documents waiting or parsing before callers block
+    parse_timeout_seconds: float = 30.0  # Per document
+    parse_memory_limit_bytes: int = 1024 * 1024 * 1024  # Address space cap per parser process
+    parse_inline_max_bytes: int = 256 * 1024  # Smaller HTML is parsed in-process
+    
+    # Headless browser pool (per worker process), for pages that need JavaScript
+    browser_pool_size: int = 2  # Warm browser instances
+    browser_contexts_per_browser: int = 4  # Concurrent pages per browser
+    browser_max_pages_per_browser: int = 100  # Recycle a browser after this many pages
+    browser_navigation_timeout_seconds: float = 15.0
+    browser_blocked_resource_types: list[str] = ["image", "font", "media"]
+    
+    # Re-scan scheduler (``python -m app.scheduler``)
+    rescan_interval_seconds: int = 86400  # How often each tracked URL is re-fetched
+    rescan_jitter_ratio: float = 0.1  # Spread checks by +/- this share of the interval
+    rescan_domain_min_interval_seconds: float = 5.0  # Per-domain spacing between fetches
+    rescan_batch_size: int = 50  # Due URLs checked per scheduler pass
+    rescan_concurrency: int = 8
+    rescan_timeout_seconds: float = 30.0
+    rescan_poll_interval_seconds: float = 60.0
     
     # Anthropic API Settings
     anthropic_api_key: Optional[str] = None
     anthropic_model: str = "claude-3-5-sonnet-20241022"
+    anthropic_base_url: str = "https://api.anthropic.com"
+    anthropic_api_version: str = "2023-06-01"
+    
+    # Model client (see ``app.services.model_client``); buckets are shared by all workers
+    model_requests_per_minute: int = 50
+    model_tokens_per_minute: int = 80_000  # Input plus output tokens
+    model_max_output_tokens: int = 4096
+    model_background_reserve_ratio: float = 0.2  # Share of each bucket re-scans leave to user jobs
+    model_concurrency_initial: int = 4  # Per process; halved on 429, grown on success
+    model_concurrency_min: int = 1
+    model_concurrency_max: int = 16
+    model_max_attempts: int = 5
+    model_retry_backoff_seconds: float = 1.0  # Base delay when no Retry-After is given
+    model_retry_backoff_max_seconds: float = 60.0
+    model_timeout_seconds: float = 120.0
     
     # CORS Settings
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:5173"]
     
+    @property
+    def async_database_url(self) -> str:
+        """Database URL using the asyncpg driver for the application engine."""
+        if self.database_url.startswith("postgresql://"):
+            return self.database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        return self.database_url
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,11 +1,14 @@
 """FastAPI application entry point."""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from app.config import settings
-from app.api.dependencies import get_db, get_redis, engine
+from app.api.dependencies import AsyncSessionLocal, get_redis, engine
 from app.models.database import Base
-from app.api.routes import analyze, summary, compare
+from app.api.routes import analyze, summary, compare, jobs, rankings, analytics, model_cache
+from app.services.job_events import enable_keyspace_events
+from app.services.summary_cache import listen_for_invalidations
 
 
 def create_app() -> FastAPI:
@@ -29,15 +32,33 @@ def create_app() -> FastAPI:
     app.include_router(analyze.router, prefix=settings.api_prefix, tags=["analyze"])
     app.include_router(summary.router, prefix=settings.api_prefix, tags=["summary"])
     app.include_router(compare.router, prefix=settings.api_prefix, tags=["compare"])
+    app.include_router(jobs.router, prefix=settings.api_prefix, tags=["jobs"])
+    app.include_router(rankings.router, prefix=settings.api_prefix, tags=["rankings"])
+    app.include_router(analytics.router, prefix=settings.api_prefix, tags=["analytics"])
+    app.include_router(model_cache.router, prefix=settings.api_prefix, tags=["model-cache"])
     
     @app.on_event("startup")
     async def startup_event():
         """Initialize database and Redis connections on startup."""
         # Create database tables
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         # Test Redis connection
         redis_client = await get_redis()
         await redis_client.ping()
+        # Job status endpoints are driven by keyspace notifications
+        await enable_keyspace_events(redis_client)
+        # Keep this worker's in-process summary cache in sync with other workers
+        app.state.cache_invalidation_task = asyncio.create_task(
+            listen_for_invalidations(redis_client)
+        )
+    
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Stop background tasks started on startup."""
+        task = getattr(app.state, "cache_invalidation_task", None)
+        if task is not None:
+            task.cancel()
     
     @app.get("/")
     async def root():
@@ -53,9 +74,8 @@ def create_app() -> FastAPI:
         """Health check endpoint."""
         try:
             # Check database
-            db = next(get_db())
-            db.execute(text("SELECT 1"))
-            db.close()
+            async with AsyncSessionLocal() as db:
+                await db.execute(text("SELECT 1"))
             
             # Check Redis
             redis_client = await get_redis()
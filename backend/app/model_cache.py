@@ -0,0 +1,37 @@
+"""Model response cache maintenance.
+
+    poetry run python -m app.model_cache stats
+    poetry run python -m app.model_cache purge <prompt_hash>
+    poetry run python -m app.model_cache purge --stale
+"""
+import argparse
+import asyncio
+import json
+from app.api.dependencies import AsyncSessionLocal, get_redis
+from app.services.response_cache import cache_stats, purge_prompt_version, purge_stale_prompts
+
+
+async def _run(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        if args.command == "stats":
+            print(json.dumps(await cache_stats(db, await get_redis()), indent=2))
+        elif args.stale:
+            print(f"Purged {await purge_stale_prompts(db)} entries of outdated prompts")
+        else:
+            print(f"Purged {await purge_prompt_version(db, args.prompt_hash)} entries of prompt {args.prompt_hash}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Inspect or purge the model response cache.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="print hit rates and entries per prompt version")
+    purge = commands.add_parser("purge", help="delete the entries of a prompt version")
+    target = purge.add_mutually_exclusive_group(required=True)
+    target.add_argument("prompt_hash", nargs="?", help="prompt version to delete")
+    target.add_argument("--stale", action="store_true", help="delete every prompt version that is no longer current")
+    asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
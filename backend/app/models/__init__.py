@@ -1,5 +1,13 @@
 """Database models and schemas."""
-from app.models.database import Document, Summary
+from app.models.database import (
+    Document,
+    Summary,
+    ServiceCategoryScore,
+    SummaryRedFlag,
+    SummaryRule,
+    SummaryConcession,
+    RescanTarget,
+)
 from app.models.schemas import (
     DocumentSchema,
     SummarySchema,
@@ -9,11 +17,21 @@ from app.models.schemas import (
     AnalyzeRequest,
     AnalyzeResponse,
     SummaryResponse,
+    SummaryBatchRequest,
+    SummaryBatchResponse,
+    FlagSearchResponse,
+    CategoryRankingResponse,
+    SectionAggregateResponse,
 )
 
 __all__ = [
     "Document",
     "Summary",
+    "ServiceCategoryScore",
+    "SummaryRedFlag",
+    "SummaryRule",
+    "SummaryConcession",
+    "RescanTarget",
     "DocumentSchema",
     "SummarySchema",
     "RedFlagSchema",
@@ -22,4 +40,9 @@ __all__ = [
     "AnalyzeRequest",
     "AnalyzeResponse",
     "SummaryResponse",
+    "SummaryBatchRequest",
+    "SummaryBatchResponse",
+    "FlagSearchResponse",
+    "CategoryRankingResponse",
+    "SectionAggregateResponse",
 ]
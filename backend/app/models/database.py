@@ -1,12 +1,18 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, ForeignKey, Index, Text, JSON
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import declarative_base, deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 
-Base = declarative_base()
+# AsyncAttrs exposes ``obj.awaitable_attrs.<relationship>`` so lazy relationships
+# can be loaded explicitly from an AsyncSession without implicit IO.
+Base = declarative_base(cls=AsyncAttrs)
+
+# Binary JSON on Postgres so sections are parsed once on write and can be
+# GIN-indexed; plain JSON elsewhere (e.g. SQLite in tests).
+SectionJSON = JSON().with_variant(JSONB(), "postgresql")
 
 
 class Document(Base):
@@ -15,15 +21,28 @@ class Document(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     url = Column(String, nullable=False, index=True)
-    service_name = Column(String, nullable=False, index=True)
+    service_name = Column(String, nullable=False)
     document_type = Column(String, nullable=False)  # "tos", "privacy", "community_guidelines", "other"
-    raw_content = Column(Text, nullable=False)
-    content_hash = Column(String, nullable=False, index=True)  # For detecting changes
+    # Legacy inline text. New documents keep their text in the blob store under
+    # ``content_hash`` (see ``app.services.blob_store``) and leave this NULL.
+    # Deferred so it is never loaded as part of a normal row load.
+    raw_content = deferred(Column(Text, nullable=True))
+    content_hash = Column(String, nullable=False, index=True)  # Blob key; also detects changes
+    # Version chain: the text is stored as a diff against ``base_content_hash``
+    # (NULL for a full snapshot), ``chain_depth`` diffs away from the last snapshot.
+    base_content_hash = Column(String, nullable=True)
+    chain_depth = Column(Integer, nullable=False, default=0)
     extracted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     summaries = relationship("Summary", back_populates="document", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Documents of a service and type, as searched by ``latest_summary_select``;
+        # also serves lookups by service name alone
+        Index("ix_documents_service_name_document_type", "service_name", "document_type"),
+    )
+    
     def __repr__(self):
         return f"<Document(id={self.id}, service_name={self.service_name}, type={self.document_type})>"
 
@@ -33,13 +52,16 @@ class Summary(Base):
     __tablename__ = "summaries"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False)
     version = Column(Integer, nullable=False, default=1)
     
-    # Structured summary sections stored as JSON
-    red_flags = Column(JSON, nullable=False, default=list)
-    rules = Column(JSON, nullable=False, default=list)
-    concessions = Column(JSON, nullable=False, default=list)
+    # Structured summary sections stored as JSONB
+    red_flags = Column(SectionJSON, nullable=False, default=list)
+    rules = Column(SectionJSON, nullable=False, default=list)
+    concessions = Column(SectionJSON, nullable=False, default=list)
+    # Per section, the clause hashes each item was drawn from (parallel to the
+    # items; an empty list means unknown). Drives incremental re-analysis.
+    provenance = Column(SectionJSON, nullable=True)
     
     # Metadata
     clarity_score = Column(Integer, nullable=False)  # 0-100
@@ -52,5 +74,129 @@ class Summary(Base):
     # Relationships
     document = relationship("Document", back_populates="summaries")
     
+    __table_args__ = (
+        # jsonb_path_ops serves ``red_flags @> '[{"category": ..., "severity": ...}]'``
+        Index(
+            "ix_summaries_red_flags",
+            "red_flags",
+            postgresql_using="gin",
+            postgresql_ops={"red_flags": "jsonb_path_ops"},
+        ),
+        # Newest summary of a document first: serves the ``latest_summary_select``
+        # ordering and lookups by document alone
+        Index("ix_summaries_document_id_generated_at_version", "document_id", "generated_at", "version"),
+    )
+    
     def __repr__(self):
         return f"<Summary(id={self.id}, document_id={self.document_id}, clarity_score={self.clarity_score})>"
+
+
+class ServiceCategoryScore(Base):
+    """
+    Denormalized per-service, per-category scores of the latest summary.
+    
+    Maintained incrementally by ``save_summary`` so that category rankings are
+    read from the covering ranking index instead of parsing summary JSON.
+    """
+    __tablename__ = "service_category_scores"
+    
+    service_name = Column(String, primary_key=True)
+    document_type = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    summary_id = Column(UUID(as_uuid=True), ForeignKey("summaries.id", ondelete="CASCADE"), nullable=False)
+    critical_count = Column(Integer, nullable=False, default=0)
+    warning_count = Column(Integer, nullable=False, default=0)
+    info_count = Column(Integer, nullable=False, default=0)
+    severity_score = Column(Integer, nullable=False, default=0)  # critical=3, warning=2, info=1
+    clarity_score = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index(
+            "ix_service_category_scores_ranking",
+            "category",
+            "document_type",
+            "severity_score",
+            postgresql_include=[
+                "service_name",
+                "clarity_score",
+                "critical_count",
+                "warning_count",
+                "info_count",
+                "summary_id",
+            ],
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<ServiceCategoryScore(service_name={self.service_name}, category={self.category}, score={self.severity_score})>"
+
+
+# Normalized copies of the summary sections. Only the fields analytics group
+# by are kept; full texts stay in the JSONB columns on ``summaries``.
+
+class SummaryRedFlag(Base):
+    """One red flag of a summary."""
+    __tablename__ = "summary_red_flags"
+    
+    summary_id = Column(UUID(as_uuid=True), ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    category = Column(String, nullable=False)
+    severity = Column(String, nullable=False)
+    
+    __table_args__ = (Index("ix_summary_red_flags_category_severity", "category", "severity"),)
+
+
+class SummaryRule(Base):
+    """One rule of a summary."""
+    __tablename__ = "summary_rules"
+    
+    summary_id = Column(UUID(as_uuid=True), ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    category = Column(String, nullable=False, index=True)
+
+
+class SummaryConcession(Base):
+    """One concession of a summary."""
+    __tablename__ = "summary_concessions"
+    
+    summary_id = Column(UUID(as_uuid=True), ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    category = Column(String, nullable=False)
+    can_opt_out = Column(Boolean, nullable=False)
+    
+    __table_args__ = (Index("ix_summary_concessions_category_opt_out", "category", "can_opt_out"),)
+
+
+class RescanTarget(Base):
+    """A tracked URL and the validators of its last fetch, for periodic re-scans."""
+    __tablename__ = "rescan_targets"
+    
+    url = Column(String, primary_key=True)
+    domain = Column(String, nullable=False)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    body_hash = Column(String, nullable=True)  # Content hash of the text extracted at the last fetch
+    last_status = Column(Integer, nullable=True)
+    last_checked_at = Column(DateTime(timezone=True), nullable=True)
+    next_check_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<RescanTarget(url={self.url}, next_check_at={self.next_check_at})>"
+
+
+class ModelResponse(Base):
+    """Cached model output for one section prompt over one text chunk."""
+    __tablename__ = "model_responses"
+    
+    model_version = Column(String, primary_key=True)
+    prompt_hash = Column(String(16), primary_key=True)  # See ``app.prompts.sections.prompt_hash``
+    chunk_hash = Column(String(64), primary_key=True)  # SHA-256 of the chunk text
+    section = Column(String, nullable=False)
+    items = Column(SectionJSON, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)  # LRU order
+    
+    def __repr__(self):
+        return f"<ModelResponse(section={self.section}, prompt_hash={self.prompt_hash}, chunk_hash={self.chunk_hash})>"
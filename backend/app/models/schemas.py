@@ -1,5 +1,6 @@
 """Pydantic schemas for API requests and responses."""
 from pydantic import BaseModel, Field, HttpUrl
+from app.config import settings
 from typing import Literal, Optional
 from datetime import datetime
 from uuid import UUID
@@ -23,6 +24,7 @@ class RuleSchema(BaseModel):
     title: str
     description: str
     consequence: Optional[str] = None
+    source_quote: Optional[str] = None  # Clause the rule was drawn from
     
     class Config:
         from_attributes = True
@@ -36,6 +38,7 @@ class ConcessionSchema(BaseModel):
     why_they_want_it: str
     can_opt_out: bool
     opt_out_instructions: Optional[str] = None
+    source_quote: Optional[str] = None  # Clause the concession was drawn from
     
     class Config:
         from_attributes = True
@@ -84,6 +87,17 @@ class AnalyzeResponse(BaseModel):
     job_id: UUID
     status: str
     estimated_time_seconds: int
+    coalesced: bool = False  # True if joined an identical in-flight job
+
+
+class JobStatusResponse(BaseModel):
+    """Response schema for job status endpoints."""
+    job_id: UUID
+    status: str  # processing, fetched, extracted, analyzing, completed or failed
+    summary_id: Optional[UUID] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    coalesced_callers: int = 0
 
 
 class SummaryResponse(BaseModel):
@@ -97,3 +111,120 @@ class SummaryResponse(BaseModel):
     rules: list[RuleSchema]
     concessions: list[ConcessionSchema]
     metadata: dict
+
+
+class SummaryBatchRequest(BaseModel):
+    """Request schema for batch summary retrieval."""
+    ids: list[UUID] = Field(min_length=1, max_length=settings.summary_batch_max_ids)
+
+
+class SummaryBatchResponse(BaseModel):
+    """Response schema for batch summary retrieval; ``None`` marks an unknown id."""
+    summaries: dict[UUID, Optional[SummaryResponse]]
+
+
+class FlaggedSummarySchema(BaseModel):
+    """Latest summary of a service that carries a matching red flag."""
+    summary_id: UUID
+    service_name: str
+    document_type: str
+    url: str
+    version: int
+    clarity_score: int
+
+
+class FlagSearchResponse(BaseModel):
+    """Response schema for red flag search."""
+    category: str
+    severity: Optional[str]
+    results: list[FlaggedSummarySchema]
+
+
+class ComparedServiceSchema(BaseModel):
+    """One service in a comparison."""
+    summary_id: UUID
+    service_name: str
+    document_type: str
+    clarity_score: int
+    risk_score: int
+    risk_rank: int
+
+
+class ComparisonResponse(BaseModel):
+    """
+    Response schema for compare endpoint.
+    
+    Matrices are indexed ``[service][category]`` (and ``[severity]`` for
+    ``red_flag_severity``) in the order of ``services`` and ``categories``.
+    """
+    summary_ids: list[UUID]
+    services: list[ComparedServiceSchema]
+    categories: list[str]
+    severities: list[str]
+    red_flag_severity: list[list[list[int]]]
+    category_scores: list[list[int]]
+    category_deltas: list[list[int]]
+    rule_counts: list[list[int]]
+    concession_counts: list[list[int]]
+    opt_out_counts: list[list[int]]
+    risk_score_deltas: list[list[int]]
+
+
+class CategoryRankingEntry(BaseModel):
+    """One service in a category ranking."""
+    rank: int
+    service_name: str
+    summary_id: UUID
+    severity_score: int
+    critical_count: int
+    warning_count: int
+    info_count: int
+    clarity_score: int
+    
+    class Config:
+        from_attributes = True
+
+
+class CategoryRankingResponse(BaseModel):
+    """Response schema for category rankings; lower severity ranks first."""
+    category: str
+    document_type: str
+    rankings: list[CategoryRankingEntry]
+
+
+class SectionAggregateBucket(BaseModel):
+    """Counts for one category (and severity or opt-out state) of a section."""
+    category: str
+    severity: Optional[str] = None
+    can_opt_out: Optional[bool] = None
+    services: int
+    occurrences: int
+
+
+class SectionAggregateResponse(BaseModel):
+    """Anonymized counts over the latest summary of every service."""
+    section: str
+    document_type: Optional[str]
+    total_services: int
+    buckets: list[SectionAggregateBucket]
+
+
+class ModelCacheSectionStats(BaseModel):
+    """Model response cache lookups for one section's current prompt."""
+    prompt_hash: str
+    hits: int
+    misses: int
+    hit_rate: Optional[float]
+
+
+class ModelCacheEntryCount(BaseModel):
+    """Stored model responses of one prompt version."""
+    section: str
+    prompt_hash: str
+    entries: int
+
+
+class ModelCacheStatsResponse(BaseModel):
+    """Response schema for model response cache statistics."""
+    sections: dict[str, ModelCacheSectionStats]
+    entries: list[ModelCacheEntryCount]
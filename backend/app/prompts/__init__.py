@@ -0,0 +1 @@
+"""AI prompt templates."""
@@ -0,0 +1,43 @@
+"""Prompt templates for the summary sections."""
+import hashlib
+
+# Templates only depend on the excerpt, so a model response can be cached
+# per excerpt and reused across services and document versions.
+_PREAMBLE = """You are reviewing an excerpt of a website's terms or privacy policy.
+Read the excerpt below and answer with a JSON array only, no prose.
+Quote the excerpt verbatim in every "source_quote"; never invent text.
+
+<excerpt>
+{text}
+</excerpt>
+"""
+
+SECTION_PROMPTS = {
+    "red_flags": _PREAMBLE + """
+List terms that are unusually harmful to users. Each item is an object with
+"severity" ("critical", "warning" or "info"), "category" (snake_case, e.g.
+"arbitration", "data_sharing"), "title", "explanation" (one plain-English
+sentence) and "source_quote".
+""",
+    "rules": _PREAMBLE + """
+List what users must or must not do. Each item is an object with "category"
+(snake_case), "title", "description" (one plain-English sentence),
+"consequence" (what happens on a breach, or null) and "source_quote".
+""",
+    "concessions": _PREAMBLE + """
+List the rights, data or licenses users give up. Each item is an object with
+"category" (snake_case), "title", "what_you_give", "why_they_want_it",
+"can_opt_out" (true or false), "opt_out_instructions" (or null) and
+"source_quote".
+""",
+}
+
+
+def render_prompt(section: str, text: str) -> str:
+    """Fill in the template of ``section`` for one excerpt."""
+    return SECTION_PROMPTS[section].format(text=text)
+
+
+def prompt_hash(section: str) -> str:
+    """Version of a section's template: the first 16 hex chars of its SHA-256."""
+    return hashlib.sha256(SECTION_PROMPTS[section].encode("utf-8")).hexdigest()[:16]
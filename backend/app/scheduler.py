@@ -0,0 +1,62 @@
+"""Re-scan scheduler.
+
+Periodically re-fetches every analyzed URL with conditional requests and
+queues a new analysis only when the page changed:
+
+    poetry run python -m app.scheduler
+"""
+import asyncio
+import logging
+import signal
+import httpx
+from redis.asyncio import Redis
+from app.api.dependencies import get_http_client, get_redis
+from app.config import settings
+from app.services.rescan import run_rescan_batch
+
+logger = logging.getLogger(__name__)
+
+
+async def run_scheduler(
+    redis: Redis,
+    client: httpx.AsyncClient,
+    stop: asyncio.Event | None = None,
+    poll_interval_seconds: float | None = None,
+) -> None:
+    """Run re-scan passes until ``stop`` is set; full batches are followed up immediately."""
+    stop = stop or asyncio.Event()
+    poll_interval = settings.rescan_poll_interval_seconds if poll_interval_seconds is None else poll_interval_seconds
+    while not stop.is_set():
+        try:
+            outcomes = await run_rescan_batch(redis, client)
+        except Exception:
+            logger.exception("Re-scan pass failed")
+            outcomes = {}
+        if outcomes:
+            logger.info("Re-scan pass: %s", dict(outcomes))
+        if sum(outcomes.values()) >= settings.rescan_batch_size:
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _serve() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    redis = await get_redis()
+    logger.info("Re-scan scheduler started")
+    await run_scheduler(redis, get_http_client(), stop=stop)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()
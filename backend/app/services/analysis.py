@@ -0,0 +1,191 @@
+"""Analysis pipeline executed by the job workers."""
+import asyncio
+import json
+from typing import Callable
+from uuid import UUID
+from pydantic import BaseModel, ValidationError
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import AsyncSessionLocal, get_http_client
+from app.config import settings
+from app.models.schemas import ConcessionSchema, RedFlagSchema, RuleSchema
+from app.prompts.sections import render_prompt
+from app.services.chunking import chunk_text, merge_items
+from app.services.dedup import (
+    analysis_lock,
+    cache_extraction,
+    find_summary_by_content_hash,
+    get_cached_extraction,
+)
+from app.services.extraction import ExtractedDocument, extract_page
+from app.services.fetcher import fetch_page
+from app.services.incremental import IncrementalPlan, plan_incremental
+from app.services.job_queue import AnalysisJob, set_job_status
+from app.services.model_client import ModelAPIError, current_priority, get_model_client
+from app.services.response_cache import get_cached_response, store_response
+from app.services.sections import SECTIONS, publish_section
+from app.services.summaries import store_analysis
+
+
+async def _find_existing_summary(db: AsyncSession, redis: Redis, url: str) -> UUID | None:
+    """Summary for a fresh cached extraction of ``url``, without fetching it again."""
+    digest = await get_cached_extraction(redis, url)
+    if digest is None:
+        return None
+    return await find_summary_by_content_hash(db, digest)
+
+
+SECTION_SCHEMAS: dict[str, type[BaseModel]] = {
+    "red_flags": RedFlagSchema,
+    "rules": RuleSchema,
+    "concessions": ConcessionSchema,
+}
+
+
+def parse_items(reply: str, section: str) -> list[dict]:
+    """
+    The items of ``section`` in a model reply, ignoring any text around the JSON array.
+    
+    Every item is validated against the section's response schema, so only
+    items the summary endpoints can serve are stored (and cached). Raises
+    ``ModelAPIError`` on anything else.
+    """
+    start, end = reply.find("["), reply.rfind("]")
+    try:
+        items = json.loads(reply[start:end + 1]) if start != -1 else None
+    except json.JSONDecodeError:
+        items = None
+    if not isinstance(items, list):
+        raise ModelAPIError(f"Model reply is not a JSON array: {reply[:200]!r}")
+    schema = SECTION_SCHEMAS[section]
+    try:
+        return [schema.model_validate(item).model_dump(exclude_unset=True) for item in items]
+    except ValidationError as exc:
+        raise ModelAPIError(f"Model reply has invalid {section} items: {exc}") from exc
+
+
+async def analyze_section(document: ExtractedDocument, section: str) -> list[dict]:
+    """Produce the items of one summary section (``red_flags``, ``rules`` or ``concessions``)."""
+    client = await get_model_client()
+    return parse_items(await client.complete(render_prompt(section, document.text)), section)
+
+
+async def _gather_or_cancel(*aws):
+    """Like ``asyncio.gather``, but the first failure cancels and awaits all the others."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _analyze_chunk(redis: Redis, chunk: ExtractedDocument, section: str) -> list[dict]:
+    # Each lookup and store uses its own short session, as chunks run concurrently.
+    if settings.model_cache_enabled:
+        async with AsyncSessionLocal() as db:
+            cached = await get_cached_response(db, redis, section, chunk.text)
+        if cached is not None:
+            return cached
+    # Concurrency is limited, per priority lane, by the model client.
+    items = await analyze_section(chunk, section)
+    if settings.model_cache_enabled:
+        async with AsyncSessionLocal() as db:
+            await store_response(db, section, chunk.text, items)
+    return items
+
+
+async def analyze_sections(
+    redis: Redis,
+    job: AnalysisJob,
+    document: ExtractedDocument,
+    merge: Callable[[str, list[dict]], list[dict]] | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Analyze all sections concurrently, publishing each one as soon as it finishes.
+    
+    Long documents are split into token-budgeted chunks that are analyzed
+    concurrently and merged per section. Chunks already answered for the
+    current model and prompt come from the response cache. ``merge``
+    post-processes each section's items before they are published. If any
+    model call fails, all others of the job are cancelled before the error
+    propagates, so nothing keeps running after the job has failed.
+    """
+    chunks = [document.model_copy(update={"text": text}) for text in chunk_text(document.text)]
+    results = {}
+    
+    async def run(section: str) -> None:
+        per_chunk = await _gather_or_cancel(*(_analyze_chunk(redis, chunk, section) for chunk in chunks))
+        items = merge_items(per_chunk)
+        if merge is not None:
+            items = merge(section, items)
+        results[section] = items
+        await publish_section(redis, job.job_id, section, items)
+    
+    await _gather_or_cancel(*(run(section) for section in SECTIONS))
+    return results
+
+
+async def analyze_changes(redis: Redis, job: AnalysisJob, plan: IncrementalPlan) -> dict[str, list[dict]]:
+    """Re-analyze only the changed clauses and merge them into the previous summary."""
+    if plan.changed_clauses:
+        return await analyze_sections(redis, job, plan.partial_document, merge=plan.merge)
+    
+    # Whitespace-only edits: carry everything over without calling the model.
+    results = {}
+    for section in SECTIONS:
+        results[section] = plan.merge(section, [])
+        await publish_section(redis, job.job_id, section, results[section])
+    return results
+
+
+async def run_analysis(job: AnalysisJob, redis: Redis) -> None:
+    """
+    Fetch, extract and analyze the document at ``job.url``.
+    
+    Each step is reported as a job status (``fetched``, ``extracted``,
+    ``analyzing``) as soon as it finishes. Sets ``job.summary_id`` on success. Jobs whose URL was extracted recently,
+    or whose content hashes to an already summarized document, finish against
+    the existing summary without calling the model. New versions of an already
+    summarized URL only have their changed clauses re-analyzed when the edit
+    is small enough (see ``plan_incremental``). Raising marks the attempt
+    as failed; the queue retries it with backoff and dead-letters it after
+    ``settings.job_max_attempts``.
+    """
+    # Model calls of this job (including the chunk tasks it spawns) use its lane.
+    current_priority.set(job.priority)
+    # Each database step uses its own short session: none is held (idle in
+    # transaction) across the fetch or the model calls, which take minutes.
+    async with analysis_lock(redis, job.url):
+        async with AsyncSessionLocal() as db:
+            job.summary_id = await _find_existing_summary(db, redis, job.url)
+        if job.summary_id is not None:
+            return
+        
+        page = await fetch_page(get_http_client(), job.url)
+        await set_job_status(redis, job.job_id, "fetched")
+        document = await extract_page(job.url, page)
+        await set_job_status(redis, job.job_id, "extracted")
+        async with AsyncSessionLocal() as db:
+            job.summary_id = await find_summary_by_content_hash(db, document.content_hash)
+        if job.summary_id is not None:
+            await cache_extraction(redis, job.url, document.content_hash)
+            return
+        
+        await set_job_status(redis, job.job_id, "analyzing")
+        async with AsyncSessionLocal() as db:
+            # The previous summary's columns stay loaded once the session closes.
+            plan = await plan_incremental(db, document)
+        if plan is None:
+            sections = await analyze_sections(redis, job, document)
+            provenance = None
+        else:
+            sections = await analyze_changes(redis, job, plan)
+            provenance = plan.provenance
+        async with AsyncSessionLocal() as db:
+            summary = await store_analysis(db, redis, document, sections, provenance)
+        job.summary_id = summary.id
+        # Only cache the extraction once a summary exists for its hash.
+        await cache_extraction(redis, job.url, document.content_hash)
@@ -0,0 +1,93 @@
+"""Normalized section rows and aggregate analytics over them."""
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.database import (
+    Document,
+    Summary,
+    SummaryConcession,
+    SummaryRedFlag,
+    SummaryRule,
+)
+from app.services.rankings import latest_summary_select
+
+SECTION_MODELS = {
+    "red_flags": SummaryRedFlag,
+    "rules": SummaryRule,
+    "concessions": SummaryConcession,
+}
+
+# Columns each section is grouped by, after ``category``
+SECTION_GROUPS = {
+    "red_flags": (SummaryRedFlag.severity,),
+    "rules": (),
+    "concessions": (SummaryConcession.can_opt_out,),
+}
+
+
+async def write_section_rows(db: AsyncSession, summary: Summary) -> None:
+    """Mirror the summary's JSON sections into the child tables in the caller's transaction."""
+    for model in SECTION_MODELS.values():
+        await db.execute(delete(model).where(model.summary_id == summary.id))
+    
+    db.add_all(
+        SummaryRedFlag(summary_id=summary.id, position=position, category=flag["category"], severity=flag["severity"])
+        for position, flag in enumerate(summary.red_flags)
+    )
+    db.add_all(
+        SummaryRule(summary_id=summary.id, position=position, category=rule["category"])
+        for position, rule in enumerate(summary.rules)
+    )
+    db.add_all(
+        SummaryConcession(
+            summary_id=summary.id,
+            position=position,
+            category=concession["category"],
+            can_opt_out=bool(concession.get("can_opt_out")),
+        )
+        for position, concession in enumerate(summary.concessions)
+    )
+
+
+def _latest_summary_ids(document_type: str | None):
+    """Latest summary of every service and document type, including summaries without items."""
+    document = aliased(Document)
+    query = (
+        select(Summary.id)
+        .join(document, document.id == Summary.document_id)
+        .where(Summary.id == latest_summary_select(document.service_name, document.document_type).scalar_subquery())
+    )
+    if document_type is not None:
+        query = query.where(document.document_type == document_type)
+    return query
+
+
+async def aggregate_section(db: AsyncSession, section: str, document_type: str | None = None) -> dict:
+    """
+    Count services and occurrences per category of ``section``.
+    
+    Only the latest summary of each service is counted and no service names
+    are returned.
+    """
+    model = SECTION_MODELS[section]
+    latest = _latest_summary_ids(document_type)
+    groups = (model.category, *SECTION_GROUPS[section])
+    
+    result = await db.execute(
+        select(
+            *groups,
+            func.count(model.summary_id.distinct()).label("services"),
+            func.count().label("occurrences"),
+        )
+        .where(model.summary_id.in_(latest))
+        .group_by(*groups)
+        .order_by(*groups)
+    )
+    total_services = await db.scalar(select(func.count()).select_from(latest.subquery()))
+    
+    return {
+        "section": section,
+        "document_type": document_type,
+        "total_services": total_services,
+        "buckets": [dict(row._mapping) for row in result],
+    }
@@ -0,0 +1,177 @@
+"""Content-addressed, zstd-compressed storage for raw document texts."""
+from abc import ABC, abstractmethod
+import asyncio
+import json
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+import zstandard
+from app.config import settings
+
+_CONTENT_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobNotFoundError(LookupError):
+    """No blob is stored under the requested content hash."""
+
+
+def compress_text(text: str, level: int | None = None) -> bytes:
+    """Compress a document text into a single zstd frame."""
+    level = settings.blob_compression_level if level is None else level
+    return zstandard.ZstdCompressor(level=level).compress(text.encode("utf-8"))
+
+
+def decompress_text(data: bytes) -> str:
+    """Inverse of ``compress_text``."""
+    return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+
+
+class BlobStore(ABC):
+    """
+    Base class for blob backends.
+    
+    Blobs are immutable and keyed by the SHA-256 of their text, so a text is
+    written at most once no matter how often it is re-extracted. A text is
+    stored either as a full snapshot or as a delta against another stored
+    text (see ``app.services.version_chain``). Backends implement the
+    blocking ``_exists``/``_read``/``_write`` primitives over blob names,
+    which run in a worker thread together with (de)compression.
+    """
+    
+    @abstractmethod
+    def _exists(self, name: str) -> bool:
+        """Whether a blob named ``name`` is stored."""
+    
+    @abstractmethod
+    def _read(self, name: str) -> bytes:
+        """The stored bytes of ``name``; raises ``BlobNotFoundError`` if there are none."""
+    
+    @abstractmethod
+    def _write(self, name: str, data: bytes) -> None:
+        """Store ``data`` under ``name``, never exposing a partial blob to readers."""
+    
+    def _stored(self, key: str) -> bool:
+        return self._exists(key) or self._exists(_delta_name(key))
+    
+    def _put(self, name: str, content_hash: str, payload: str) -> bool:
+        if self._stored(_check_hash(content_hash)):
+            return False
+        self._write(name, compress_text(payload))
+        return True
+    
+    async def put_text(self, content_hash: str, text: str) -> bool:
+        """Store ``text`` under ``content_hash``; returns False if it was already stored."""
+        return await asyncio.to_thread(self._put, content_hash, content_hash, text)
+    
+    async def put_delta(self, content_hash: str, base_hash: str, ops: list) -> bool:
+        """Store a text as diff ``ops`` against the text stored under ``base_hash``."""
+        payload = json.dumps({"base": _check_hash(base_hash), "ops": ops}, separators=(",", ":"))
+        return await asyncio.to_thread(self._put, _delta_name(content_hash), content_hash, payload)
+    
+    async def get_text(self, content_hash: str) -> str:
+        """Load a stored snapshot; raises ``BlobNotFoundError`` if there is none."""
+        data = await asyncio.to_thread(self._read, _check_hash(content_hash))
+        return decompress_text(data)
+    
+    async def get_delta(self, content_hash: str) -> tuple[str, list]:
+        """Load a stored delta as ``(base_hash, ops)``; raises ``BlobNotFoundError`` if there is none."""
+        data = await asyncio.to_thread(self._read, _delta_name(_check_hash(content_hash)))
+        delta = json.loads(decompress_text(data))
+        return delta["base"], delta["ops"]
+    
+    async def exists(self, content_hash: str) -> bool:
+        """Whether a snapshot or delta is stored under ``content_hash``."""
+        return await asyncio.to_thread(self._stored, _check_hash(content_hash))
+
+
+def _delta_name(content_hash: str) -> str:
+    return f"{content_hash}.delta"
+
+
+def _check_hash(content_hash: str) -> str:
+    # Keys become file paths and object names, so only accept real hashes.
+    if not _CONTENT_HASH.match(content_hash):
+        raise ValueError(f"Invalid content hash: {content_hash!r}")
+    return content_hash
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as ``<root>/ab/cd/<hash>.zst`` files, written atomically."""
+    
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+    
+    def _path(self, name: str) -> Path:
+        return self.root / name[:2] / name[2:4] / f"{name}.zst"
+    
+    def _exists(self, name: str) -> bool:
+        return self._path(name).exists()
+    
+    def _read(self, name: str) -> bytes:
+        try:
+            return self._path(name).read_bytes()
+        except FileNotFoundError:
+            raise BlobNotFoundError(name) from None
+    
+    def _write(self, name: str, data: bytes) -> None:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial blob.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class S3BlobStore(BlobStore):
+    """Blobs as objects in an S3-compatible bucket (AWS S3, MinIO, ...)."""
+    
+    def __init__(self, bucket: str, prefix: str = "", client=None, endpoint_url: str | None = None):
+        if client is None:
+            # Optional dependency: only needed when the S3 backend is configured.
+            import boto3
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+    
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}.zst"
+    
+    def _exists(self, name: str) -> bool:
+        response = self.client.list_objects_v2(Bucket=self.bucket, Prefix=self._key(name), MaxKeys=1)
+        return response.get("KeyCount", 0) > 0
+    
+    def _read(self, name: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(name))
+        except self.client.exceptions.NoSuchKey:
+            raise BlobNotFoundError(name) from None
+        return response["Body"].read()
+    
+    def _write(self, name: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(name),
+            Body=data,
+            ContentType="application/zstd",
+        )
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    """Blob store configured by ``settings.blob_store_backend``."""
+    if settings.blob_store_backend == "s3":
+        return S3BlobStore(
+            settings.blob_store_s3_bucket,
+            settings.blob_store_s3_prefix,
+            endpoint_url=settings.blob_store_s3_endpoint_url,
+        )
+    return LocalBlobStore(settings.blob_store_path)
+
@@ -0,0 +1,174 @@
+"""Headless browser rendering for pages that need JavaScript.
+
+Each worker process keeps a small pool of warm Chromium instances. Every page
+is rendered in a fresh context (no shared cookies or storage), at most
+``browser_pool_size * browser_contexts_per_browser`` at a time, and browsers
+are replaced after ``browser_max_pages_per_browser`` pages so leaks cannot
+grow without bound. A replaced browser keeps its place in the pool until its
+last page closes, so at most ``browser_pool_size`` browsers ever run.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+from app.config import settings
+
+Launcher = Callable[[], Awaitable[Any]]
+
+
+async def _block_heavy_resources(route) -> None:
+    # Images, fonts and media never contribute text.
+    if route.request.resource_type in settings.browser_blocked_resource_types:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _PooledBrowser:
+    def __init__(self, browser, max_pages: int):
+        self.browser = browser
+        self.max_pages = max_pages
+        self.active = 0
+        self.pages = 0
+    
+    @property
+    def retiring(self) -> bool:
+        return self.pages >= self.max_pages or not self.browser.is_connected()
+
+
+class BrowserPool:
+    """Warm browser instances shared by the renders of one process."""
+    
+    def __init__(
+        self,
+        launch: Launcher | None = None,
+        size: int | None = None,
+        contexts_per_browser: int | None = None,
+        max_pages_per_browser: int | None = None,
+    ):
+        self.size = size or settings.browser_pool_size
+        self.contexts_per_browser = contexts_per_browser or settings.browser_contexts_per_browser
+        self.max_pages_per_browser = max_pages_per_browser or settings.browser_max_pages_per_browser
+        self._launch = launch or self._launch_chromium
+        self._browsers: list[_PooledBrowser] = []
+        self._semaphore = asyncio.Semaphore(self.size * self.contexts_per_browser)
+        self._lock = asyncio.Lock()
+        self._changed = asyncio.Condition(self._lock)  # Notified when a context or browser frees up
+        self._launching = 0
+        self._playwright = None
+    
+    async def _launch_chromium(self):
+        if self._playwright is None:
+            # Optional dependency: only needed once a page needs rendering.
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(args=["--disable-dev-shm-usage"])
+    
+    async def _acquire(self) -> _PooledBrowser:
+        stale = []
+        async with self._lock:
+            while True:
+                # Browsers that crashed while idle have no release left to drop them.
+                stale += [pooled for pooled in self._browsers if pooled.retiring and pooled.active == 0]
+                self._browsers = [pooled for pooled in self._browsers if pooled not in stale]
+                available = [
+                    pooled for pooled in self._browsers
+                    if not pooled.retiring and pooled.active < self.contexts_per_browser
+                ]
+                if available:
+                    pooled = min(available, key=lambda candidate: candidate.active)
+                    pooled.active += 1
+                    pooled.pages += 1
+                    break
+                # Retiring browsers count toward ``size`` until their last context closes.
+                if len(self._browsers) + self._launching < self.size:
+                    self._launching += 1
+                    pooled = None
+                    break
+                await self._changed.wait()
+        for retired in stale:
+            await retired.browser.close()
+        if pooled is not None:
+            return pooled
+        
+        # Launching takes seconds; other renders keep using the pool meanwhile.
+        try:
+            launched = await self._launch()
+        except BaseException:
+            async with self._lock:
+                self._launching -= 1
+                self._changed.notify_all()
+            raise
+        pooled = _PooledBrowser(launched, self.max_pages_per_browser)
+        pooled.active = pooled.pages = 1
+        async with self._lock:
+            self._launching -= 1
+            self._browsers.append(pooled)
+            self._changed.notify_all()
+        return pooled
+    
+    async def _release(self, pooled: _PooledBrowser) -> None:
+        async with self._lock:
+            pooled.active -= 1
+            drained = pooled.retiring and pooled.active == 0
+            if drained:
+                self._browsers.remove(pooled)
+            self._changed.notify_all()
+        if drained:
+            await pooled.browser.close()
+    
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """A page in a fresh context with heavy resources blocked."""
+        async with self._semaphore:
+            pooled = await self._acquire()
+            try:
+                context = await pooled.browser.new_context(user_agent=settings.fetch_user_agent)
+                try:
+                    await context.route("**/*", _block_heavy_resources)
+                    page = await context.new_page()
+                    page.set_default_navigation_timeout(settings.browser_navigation_timeout_seconds * 1000)
+                    yield page
+                finally:
+                    await context.close()
+            finally:
+                await self._release(pooled)
+    
+    async def render(self, url: str) -> str:
+        """Load ``url`` and return the rendered HTML."""
+        async with self.page() as page:
+            await page.goto(url, wait_until="networkidle")
+            return await page.content()
+    
+    async def close(self) -> None:
+        """Close every browser; in-flight renders should have finished."""
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for pooled in browsers:
+            await pooled.browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """The browser pool of this process."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_browser_pool() -> None:
+    """Shut the process's browser pool down, if one was started."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def render_page(url: str) -> str:
+    """Load ``url`` in the process's browser pool and return the rendered HTML."""
+    return await get_browser_pool().render(url)
@@ -0,0 +1,103 @@
+"""Token-aware chunking of document text and merging of per-chunk results."""
+import math
+import re
+from app.config import settings
+from app.utils.html_text import normalize_text
+
+# Rough average for English legal text; chunk budgets leave headroom for it.
+CHARS_PER_TOKEN = 4
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model token count of ``text``."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _sections(text: str) -> list[list[str]]:
+    # A section is a ``#`` heading block plus the blocks up to the next heading.
+    sections: list[list[str]] = []
+    for block in (b.strip() for b in text.split("\n\n")):
+        if not block:
+            continue
+        if block.startswith("#") or not sections:
+            sections.append([block])
+        else:
+            sections[-1].append(block)
+    return sections
+
+
+def _split_block(block: str, max_tokens: int) -> list[str]:
+    # Oversized paragraph: break between sentences, then hard-wrap as a last resort.
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces, current = [], ""
+    for sentence in _SENTENCE_END.split(block):
+        while len(sentence) > max_chars:
+            pieces.extend([current] if current else [])
+            current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        candidate = f"{current} {sentence}" if current else sentence
+        if len(candidate) > max_chars:
+            pieces.append(current)
+            candidate = sentence
+        current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int | None = None) -> list[str]:
+    """
+    Split ``text`` into chunks of at most ``max_tokens`` (estimated) tokens.
+    
+    Whole sections are packed together where they fit; a section larger than
+    the budget is split between its paragraphs, and a paragraph larger than
+    the budget between its sentences.
+    """
+    max_tokens = max_tokens or settings.analysis_chunk_max_tokens
+    chunks: list[str] = []
+    current: list[str] = []
+    
+    def flush():
+        if current:
+            chunks.append("\n\n".join(current))
+            current.clear()
+    
+    def fits(blocks: list[str]) -> bool:
+        return estimate_tokens("\n\n".join(current + blocks)) <= max_tokens
+    
+    for section in _sections(text):
+        if fits(section):
+            current.extend(section)
+            continue
+        flush()
+        for block in section:
+            for piece in ([block] if estimate_tokens(block) <= max_tokens else _split_block(block, max_tokens)):
+                if not fits([piece]):
+                    flush()
+                current.append(piece)
+    flush()
+    return chunks or [text]
+
+
+def _dedup_key(item: dict) -> tuple[str, str]:
+    evidence = item.get("source_quote") or item.get("title") or ""
+    return item.get("category", ""), normalize_text(evidence).lower()
+
+
+def merge_items(per_chunk: list[list[dict]]) -> list[dict]:
+    """
+    Concatenate the items of all chunks in document order, dropping items
+    with the same category and source quote (or title, for items without a
+    quote) as an earlier one.
+    """
+    seen = set()
+    merged = []
+    for items in per_chunk:
+        for item in items:
+            key = _dedup_key(item)
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+    return merged
@@ -0,0 +1,180 @@
+"""Vectorized comparison of service summaries.
+
+Each summary is reduced once, when it is written, to a compact feature record
+of per-category counts that is cached in Redis. A comparison only loads those
+records, aligns them on a shared category axis and does all scoring as NumPy
+array operations.
+"""
+from uuid import UUID
+import numpy as np
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.database import Document, Summary
+
+SEVERITIES = ("critical", "warning", "info")
+SEVERITY_WEIGHTS = np.array([3, 2, 1], dtype=np.int64)
+
+
+class SummaryFeatures(BaseModel):
+    """Per-category counts of a summary, keyed by category name."""
+    summary_id: UUID
+    service_name: str
+    document_type: str
+    clarity_score: int
+    red_flags: dict[str, list[int]]  # category -> count per SEVERITIES
+    rules: dict[str, int]
+    concessions: dict[str, list[int]]  # category -> [total, opt-outs]
+
+
+def features_key(summary_id: UUID | str) -> str:
+    """Redis key holding the cached features of a summary."""
+    return f"summary:{summary_id}:features"
+
+
+def summary_features(
+    summary_id: UUID,
+    service_name: str,
+    document_type: str,
+    clarity_score: int,
+    red_flags: list[dict],
+    rules: list[dict],
+    concessions: list[dict],
+) -> SummaryFeatures:
+    """Reduce a summary's JSON sections to per-category counts."""
+    flag_counts: dict[str, list[int]] = {}
+    for flag in red_flags:
+        counts = flag_counts.setdefault(flag["category"], [0] * len(SEVERITIES))
+        counts[SEVERITIES.index(flag["severity"])] += 1
+    
+    rule_counts: dict[str, int] = {}
+    for rule in rules:
+        rule_counts[rule["category"]] = rule_counts.get(rule["category"], 0) + 1
+    
+    concession_counts: dict[str, list[int]] = {}
+    for concession in concessions:
+        counts = concession_counts.setdefault(concession["category"], [0, 0])
+        counts[0] += 1
+        counts[1] += int(bool(concession.get("can_opt_out")))
+    
+    return SummaryFeatures(
+        summary_id=summary_id,
+        service_name=service_name,
+        document_type=document_type,
+        clarity_score=clarity_score,
+        red_flags=flag_counts,
+        rules=rule_counts,
+        concessions=concession_counts,
+    )
+
+
+async def cache_features(redis: Redis, features: list[SummaryFeatures]) -> None:
+    """Store feature records for ``settings.summary_features_ttl_seconds``."""
+    if not features:
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        for feature in features:
+            pipe.setex(
+                features_key(feature.summary_id),
+                settings.summary_features_ttl_seconds,
+                feature.model_dump_json(),
+            )
+        await pipe.execute()
+
+
+async def load_features(
+    db: AsyncSession, redis: Redis, summary_ids: list[UUID]
+) -> dict[UUID, SummaryFeatures]:
+    """Feature records for the given summaries; unknown ids are omitted."""
+    cached = await redis.mget([features_key(summary_id) for summary_id in summary_ids])
+    features = {
+        summary_id: SummaryFeatures.model_validate_json(payload)
+        for summary_id, payload in zip(summary_ids, cached)
+        if payload is not None
+    }
+    
+    missing = [summary_id for summary_id in summary_ids if summary_id not in features]
+    if missing:
+        result = await db.execute(
+            select(
+                Summary.id,
+                Document.service_name,
+                Document.document_type,
+                Summary.clarity_score,
+                Summary.red_flags,
+                Summary.rules,
+                Summary.concessions,
+            )
+            .join(Document, Document.id == Summary.document_id)
+            .where(Summary.id.in_(missing))
+        )
+        loaded = [summary_features(*row) for row in result]
+        await cache_features(redis, loaded)
+        features.update((feature.summary_id, feature) for feature in loaded)
+    return features
+
+
+def _scatter(shape: tuple, index: dict[str, int], per_summary: list[dict]) -> np.ndarray:
+    """Place sparse ``{category: value}`` maps into a dense (summary, category, ...) array."""
+    rows, cols, values = [], [], []
+    for row, counts in enumerate(per_summary):
+        for category, value in counts.items():
+            rows.append(row)
+            cols.append(index[category])
+            values.append(value)
+    dense = np.zeros(shape, dtype=np.int64)
+    if rows:
+        dense[np.array(rows), np.array(cols)] = np.array(values, dtype=np.int64)
+    return dense
+
+
+def compare_features(features: list[SummaryFeatures]) -> dict:
+    """
+    Align summaries by category and compute severity matrices and score deltas.
+    
+    Category scores weight red flags by severity (critical=3, warning=2,
+    info=1). Deltas are relative to the lowest score among the compared
+    services, so 0 marks the best service in each category.
+    """
+    categories = sorted(
+        set().union(*(f.red_flags.keys() | f.rules.keys() | f.concessions.keys() for f in features))
+    )
+    index = {category: i for i, category in enumerate(categories)}
+    n, c = len(features), len(categories)
+    
+    severity = _scatter((n, c, len(SEVERITIES)), index, [f.red_flags for f in features])
+    rule_counts = _scatter((n, c), index, [f.rules for f in features])
+    concessions = _scatter((n, c, 2), index, [f.concessions for f in features])
+    
+    category_scores = severity @ SEVERITY_WEIGHTS
+    category_deltas = category_scores - category_scores.min(axis=0, keepdims=True)
+    risk_scores = category_scores.sum(axis=1)
+    risk_deltas = risk_scores[:, None] - risk_scores[None, :]
+    # Rank 1 is the lowest risk; ties share a rank.
+    risk_ranks = np.searchsorted(np.sort(risk_scores), risk_scores) + 1
+    
+    return {
+        "summary_ids": [f.summary_id for f in features],
+        "services": [
+            {
+                "summary_id": f.summary_id,
+                "service_name": f.service_name,
+                "document_type": f.document_type,
+                "clarity_score": f.clarity_score,
+                "risk_score": int(risk_scores[i]),
+                "risk_rank": int(risk_ranks[i]),
+            }
+            for i, f in enumerate(features)
+        ],
+        "categories": categories,
+        "severities": list(SEVERITIES),
+        "red_flag_severity": severity.tolist(),
+        "category_scores": category_scores.tolist(),
+        "category_deltas": category_deltas.tolist(),
+        "rule_counts": rule_counts.tolist(),
+        "concession_counts": concessions[..., 0].tolist(),
+        "opt_out_counts": concessions[..., 1].tolist(),
+        "risk_score_deltas": risk_deltas.tolist(),
+    }
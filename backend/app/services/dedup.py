@@ -0,0 +1,58 @@
+"""Deduplication of analysis work by URL and document content hash."""
+import hashlib
+from uuid import UUID
+from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.database import Document, Summary
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest stored in ``Document.content_hash``."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _url_digest(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def extraction_cache_key(url: str) -> str:
+    """Redis key holding the content hash of the latest extraction of ``url``."""
+    return f"extraction:{_url_digest(url)}"
+
+
+async def get_cached_extraction(redis: Redis, url: str) -> str | None:
+    """Return the content hash of a fresh extraction of ``url``, if any."""
+    return await redis.get(extraction_cache_key(url))
+
+
+async def cache_extraction(redis: Redis, url: str, digest: str) -> None:
+    """Remember the content hash of ``url`` for ``settings.extraction_cache_ttl_seconds``."""
+    await redis.setex(extraction_cache_key(url), settings.extraction_cache_ttl_seconds, digest)
+
+
+async def find_summary_by_content_hash(db: AsyncSession, digest: str) -> UUID | None:
+    """Return the newest summary of any document with the given content hash."""
+    return await db.scalar(
+        select(Summary.id)
+        .join(Document, Document.id == Summary.document_id)
+        .where(Document.content_hash == digest)
+        .order_by(Summary.generated_at.desc(), Summary.version.desc())
+        .limit(1)
+    )
+
+
+def analysis_lock(redis: Redis, url: str) -> Lock:
+    """
+    Per-URL lock held while a job extracts and analyzes ``url``.
+    
+    A second job for the same URL waits on the lock and then finds the first
+    job's result through the extraction cache instead of redoing the work.
+    """
+    return redis.lock(
+        f"lock:analyze:{_url_digest(url)}",
+        timeout=settings.job_visibility_timeout_seconds,
+        blocking_timeout=settings.job_visibility_timeout_seconds,
+    )
@@ -0,0 +1,105 @@
+"""Document extraction service."""
+import logging
+import re
+from urllib.parse import urlsplit
+import httpx
+from pydantic import BaseModel
+from app.api.dependencies import get_http_client
+from app.config import settings
+from app.services import browser
+from app.services.dedup import content_hash
+from app.services.fetcher import FetchedPage, fetch_page
+from app.services.parsing import parse_document
+from app.utils.readability import word_count
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionError(Exception):
+    """The fetched resource cannot be turned into document text."""
+
+
+class ExtractedDocument(BaseModel):
+    """Normalized text extracted from a ToS/Privacy Policy page."""
+    url: str
+    service_name: str
+    document_type: str
+    text: str
+    content_hash: str
+
+
+# Checked in order against the URL path and page title
+_DOCUMENT_TYPES = (
+    ("privacy", re.compile(r"privacy|datenschutz", re.I)),
+    ("community_guidelines", re.compile(r"community|guidelines|acceptable.use", re.I)),
+    ("tos", re.compile(r"terms|tos\b|conditions|legal|agreement", re.I)),
+)
+# Registrable-domain labels that are never the service name
+_HOST_PREFIXES = frozenset({"www", "m", "legal", "policies", "policy", "help", "about"})
+
+
+def service_name_from_url(url: str) -> str:
+    """Guess the service name from the host, e.g. ``https://www.example.com`` -> ``Example``."""
+    labels = [label for label in (urlsplit(url).hostname or "").split(".") if label]
+    while len(labels) > 2 and labels[0] in _HOST_PREFIXES:
+        labels = labels[1:]
+    name = labels[-2] if len(labels) >= 2 else (labels[0] if labels else url)
+    return name.capitalize()
+
+
+def classify_document(url: str, title: str = "") -> str:
+    """Document type from the URL path, falling back to the page title."""
+    path = urlsplit(url).path
+    for candidates in (path, title):
+        for document_type, pattern in _DOCUMENT_TYPES:
+            if pattern.search(candidates):
+                return document_type
+    return "other"
+
+
+async def extract_document(url: str, client: httpx.AsyncClient | None = None) -> ExtractedDocument:
+    """
+    Fetch ``url`` and extract its normalized document text.
+    
+    Pages are fetched statically over the shared pooled client; see
+    ``extract_page`` for the parsing.
+    """
+    return await extract_page(url, await fetch_page(client or get_http_client(), url))
+
+
+async def extract_page(url: str, page: FetchedPage) -> ExtractedDocument:
+    """
+    Extract the normalized document text of ``page``, fetched from ``url``.
+    
+    Bodies are parsed off the event loop (see ``parse_document``). Only HTML
+    pages yielding fewer than ``settings.extraction_min_words`` words
+    (typically SPAs) are rendered in a headless browser; if no browser is
+    installed or the render fails, the static text is kept.
+    """
+    if page.content_type in ("text/html", "application/xhtml+xml", ""):
+        title, text = await parse_document(page.content, "html", page.encoding)
+        if word_count(text) < settings.extraction_min_words:
+            try:
+                rendered = await browser.render_page(page.url)
+            except Exception as exc:
+                # Short static pages are valid documents; an empty one still fails below.
+                logger.warning("Browser render of %s failed, keeping static text: %r", page.url, exc)
+            else:
+                title, text = await parse_document(rendered.encode("utf-8"), "html", "utf-8")
+    elif page.content_type == "application/pdf":
+        title, text = await parse_document(page.content, "pdf")
+    elif page.content_type == "text/plain":
+        title, text = "", page.text.strip()
+    else:
+        raise ExtractionError(f"Unsupported content type {page.content_type!r} at {url}")
+    
+    if not text:
+        raise ExtractionError(f"No text extracted from {url}")
+    
+    return ExtractedDocument(
+        url=url,
+        service_name=service_name_from_url(page.url),
+        document_type=classify_document(page.url, title),
+        text=text,
+        content_hash=content_hash(text),
+    )
@@ -0,0 +1,71 @@
+"""Static document fetching over the shared pooled HTTP client."""
+import httpx
+from pydantic import BaseModel
+from app.config import settings
+
+
+class ResponseTooLargeError(Exception):
+    """The response body exceeds ``settings.fetch_max_bytes``."""
+
+
+class FetchedPage(BaseModel):
+    """A (decompressed) response body."""
+    url: str  # After redirects
+    status_code: int
+    content_type: str
+    encoding: str | None  # Charset declared in the Content-Type header
+    content: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    max_bytes: int | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+) -> FetchedPage:
+    """
+    GET ``url`` and return its body.
+    
+    The body is streamed and decompressed chunk by chunk, and the transfer is
+    abandoned as soon as it exceeds ``max_bytes``, whatever Content-Length
+    claims. A 304 answer to conditional ``headers`` is returned with an empty
+    body. Raises ``httpx.HTTPStatusError`` on error responses.
+    """
+    max_bytes = settings.fetch_max_bytes if max_bytes is None else max_bytes
+    async with client.stream(
+        "GET",
+        url,
+        headers=headers,
+        timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+    ) as response:
+        page = FetchedPage(
+            url=str(response.url),
+            status_code=response.status_code,
+            content_type=response.headers.get("Content-Type", "").split(";")[0].strip().lower(),
+            encoding=response.charset_encoding,
+            content=b"",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        if response.status_code == 304:
+            return page
+        response.raise_for_status()
+        declared = response.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > max_bytes:
+            raise ResponseTooLargeError(f"{url} declares {declared} bytes")
+        
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > max_bytes:
+                raise ResponseTooLargeError(f"{url} exceeds {max_bytes} bytes")
+        
+        page.content = bytes(body)
+        return page
@@ -0,0 +1,142 @@
+"""Clause-level diffs and merging for incremental re-analysis."""
+import hashlib
+import re
+from dataclasses import dataclass, field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.database import Document, Summary
+from app.services.extraction import ExtractedDocument
+from app.services.sections import SECTIONS
+from app.services.version_chain import load_document_text
+from app.utils.readability import word_count
+
+_CLAUSE_BREAK = re.compile(r"\n\s*\n")
+
+
+def split_clauses(text: str) -> list[str]:
+    """Split a document into clauses at blank lines."""
+    return [clause.strip() for clause in _CLAUSE_BREAK.split(text) if clause.strip()]
+
+
+def clause_hash(clause: str) -> str:
+    """Whitespace-insensitive identity of a clause."""
+    return hashlib.sha256(" ".join(clause.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def attribute_items(items: list[dict], clauses: dict[str, str], default: list[str]) -> list[list[str]]:
+    """
+    Clause hashes each item was drawn from.
+    
+    Items are attributed to the clauses containing their ``source_quote``;
+    items without a quote found in ``clauses`` get ``default``.
+    """
+    provenance = []
+    for item in items:
+        quote = " ".join(item.get("source_quote", "").split())
+        matches = [h for h, clause in clauses.items() if quote and quote in " ".join(clause.split())]
+        provenance.append(matches or list(default))
+    return provenance
+
+
+def sections_provenance(text: str, sections: dict[str, list[dict]]) -> dict[str, list[list[str]]]:
+    """Provenance of a full analysis of ``text``."""
+    clauses = {clause_hash(clause): clause for clause in split_clauses(text)}
+    return {section: attribute_items(sections.get(section, []), clauses, []) for section in SECTIONS}
+
+
+@dataclass
+class IncrementalPlan:
+    """
+    Re-analysis of the clauses that changed since the previous summary.
+    
+    ``merge`` combines the items found in the changed clauses with the
+    previous items that are still backed by unchanged clauses. Plans are
+    only made when every previous item is attributed to its clauses (or no
+    clause changed), so no stale item can be carried over.
+    """
+    document: ExtractedDocument
+    previous: Summary
+    changed_clauses: dict[str, str]
+    unchanged: set[str]
+    provenance: dict[str, list[list[str]]] = field(default_factory=dict)
+    
+    @property
+    def partial_document(self) -> ExtractedDocument:
+        """The document reduced to its changed clauses."""
+        return self.document.model_copy(update={"text": "\n\n".join(self.changed_clauses.values())})
+    
+    def merge(self, section: str, items: list[dict]) -> list[dict]:
+        """Merge re-analyzed ``items`` of ``section`` with the carried-over previous items."""
+        new_provenance = attribute_items(items, self.changed_clauses, list(self.changed_clauses))
+        
+        previous_items = getattr(self.previous, section) or []
+        previous_provenance = (self.previous.provenance or {}).get(section) or [[]] * len(previous_items)
+        
+        merged, provenance = [], []
+        for item, hashes in zip(previous_items, previous_provenance):
+            # Keep only while every source clause is unchanged
+            if all(h in self.unchanged for h in hashes):
+                merged.append(item)
+                provenance.append(hashes)
+        
+        for item, hashes in zip(items, new_provenance):
+            if item not in merged:
+                merged.append(item)
+                provenance.append(hashes)
+        self.provenance[section] = provenance
+        return merged
+
+
+def _has_unattributed_items(summary: Summary) -> bool:
+    provenance = summary.provenance or {}
+    for section in SECTIONS:
+        items = getattr(summary, section) or []
+        hashes = provenance.get(section) or []
+        if len(hashes) != len(items) or not all(hashes):
+            return True
+    return False
+
+
+async def plan_incremental(db: AsyncSession, document: ExtractedDocument) -> IncrementalPlan | None:
+    """
+    Plan an incremental re-analysis of ``document`` against the previous
+    summary of the same URL and document type.
+    
+    Returns ``None`` when a full analysis is needed: there is no previous
+    summary, incremental analysis is disabled, more than
+    ``settings.incremental_max_changed_ratio`` of the words changed, or a
+    clause changed while some previous item cannot be traced to its clauses
+    (it might come from the changed one).
+    """
+    if not settings.incremental_analysis_enabled:
+        return None
+    
+    previous = await db.scalar(
+        select(Summary)
+        .join(Document, Document.id == Summary.document_id)
+        .where(Document.url == document.url, Document.document_type == document.document_type)
+        .order_by(Summary.version.desc())
+        .limit(1)
+    )
+    if previous is None:
+        return None
+    
+    previous_text = await load_document_text(await previous.awaitable_attrs.document)
+    previous_hashes = {clause_hash(clause) for clause in split_clauses(previous_text)}
+    clauses = {clause_hash(clause): clause for clause in split_clauses(document.text)}
+    changed = {h: clause for h, clause in clauses.items() if h not in previous_hashes}
+    
+    total_words = word_count(document.text)
+    changed_words = sum(word_count(clause) for clause in changed.values())
+    if total_words and changed_words / total_words > settings.incremental_max_changed_ratio:
+        return None
+    if changed and _has_unattributed_items(previous):
+        return None
+    
+    return IncrementalPlan(
+        document=document,
+        previous=previous,
+        changed_clauses=changed,
+        unchanged=clauses.keys() - changed.keys(),
+    )
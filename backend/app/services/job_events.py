@@ -0,0 +1,112 @@
+"""Push-based job status updates driven by Redis keyspace notifications.
+
+Every status change is a write to ``job:{id}``, which Redis announces on
+``__keyspace@<db>__:job:{id}`` when ``notify-keyspace-events`` is enabled.
+Waiters subscribe to that channel and only read the job after a notification,
+instead of polling.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator
+from uuid import UUID
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from app.config import settings
+from app.models.schemas import JobStatusResponse
+from app.services.job_queue import TERMINAL_STATUSES, job_status_key, load_job
+from app.services.sections import JobSection, job_sections_key, read_sections
+from app.services.single_flight import coalesced_count
+
+logger = logging.getLogger(__name__)
+
+
+async def enable_keyspace_events(redis: Redis) -> None:
+    """Turn on the keyspace notifications job waiters rely on."""
+    if not settings.redis_keyspace_events:
+        return
+    try:
+        await redis.config_set("notify-keyspace-events", settings.redis_keyspace_events)
+    except ResponseError as exc:
+        # Managed Redis often forbids CONFIG; the setting must then be applied there.
+        logger.warning("Could not enable keyspace notifications: %s", exc)
+
+
+def keyspace_channel(redis: Redis, key: str) -> str:
+    """Keyspace notification channel for ``key`` on the client's database."""
+    db = redis.connection_pool.connection_kwargs.get("db", 0)
+    return f"__keyspace@{db}__:{key}"
+
+
+async def read_job_state(redis: Redis, job_id: UUID | str) -> JobStatusResponse | None:
+    """Current status of a job, or ``None`` if it is unknown or expired."""
+    status = await redis.get(job_status_key(job_id))
+    if status is None:
+        return None
+    job = await load_job(redis, job_id)
+    return JobStatusResponse(
+        job_id=job_id,
+        status=status,
+        summary_id=job.summary_id if job else None,
+        attempts=job.attempts if job else 0,
+        error=job.last_error if job else None,
+        coalesced_callers=await coalesced_count(redis, job_id),
+    )
+
+
+async def watch_job(
+    redis: Redis,
+    job_id: UUID | str,
+    timeout_seconds: float,
+    include_sections: bool = False,
+) -> AsyncIterator[JobStatusResponse | JobSection]:
+    """
+    Yield the current job state, then each status change, until the job
+    finishes, disappears, or ``timeout_seconds`` elapse.
+    
+    With ``include_sections`` completed summary sections are interleaved as
+    ``JobSection`` items; sections stored before the call are replayed first,
+    so a reconnecting client resumes where it left off.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    sent_sections: set[str] = set()
+    
+    async def unsent_sections() -> list[JobSection]:
+        if not include_sections:
+            return []
+        fresh = [s for s in await read_sections(redis, job_id) if s.section not in sent_sections]
+        sent_sections.update(s.section for s in fresh)
+        return fresh
+    
+    channels = [keyspace_channel(redis, job_status_key(job_id))]
+    if include_sections:
+        channels.append(keyspace_channel(redis, job_sections_key(job_id)))
+    pubsub = redis.pubsub()
+    try:
+        # Subscribe before the first read so no change can slip in between.
+        await pubsub.subscribe(*channels)
+        state = await read_job_state(redis, job_id)
+        if state is None:
+            return
+        yield state
+        for section in await unsent_sections():
+            yield section
+        while state.status not in TERMINAL_STATUSES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=remaining
+            )
+            if message is None:
+                continue
+            for section in await unsent_sections():
+                yield section
+            current = await read_job_state(redis, job_id)
+            if current is None:
+                return
+            if current.status != state.status:
+                state = current
+                yield state
+    finally:
+        await pubsub.reset()
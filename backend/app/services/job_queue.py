@@ -0,0 +1,232 @@
+"""Redis-backed analysis job queue with visibility timeouts, retries and dead-lettering.
+
+Layout (all keys share the ``queue:analyze`` prefix):
+
+- ``queue:analyze`` list of job ids ready to run (LPUSH in, BLMOVE out)
+- ``queue:analyze:processing`` list of job ids reserved by a worker
+- ``queue:analyze:deadlines`` zset of reserved job id -> visibility deadline
+- ``queue:analyze:delayed`` zset of job id -> time it becomes ready again
+- ``queue:analyze:dead`` list of job ids that exhausted their attempts
+
+Job status lives in ``job:{id}`` and the payload in ``job:{id}:data``.
+"""
+import random
+import time
+from typing import Literal, Optional
+from uuid import UUID, uuid4
+from pydantic import BaseModel, Field
+from redis.asyncio import Redis
+from app.config import settings
+from app.services import single_flight
+
+QUEUE_KEY = "queue:analyze"
+PROCESSING_KEY = f"{QUEUE_KEY}:processing"
+DEADLINES_KEY = f"{QUEUE_KEY}:deadlines"
+DELAYED_KEY = f"{QUEUE_KEY}:delayed"
+DEAD_LETTER_KEY = f"{QUEUE_KEY}:dead"
+
+# Status progression stored in ``job:{id}``:
+# processing -> fetched -> extracted -> analyzing -> completed | failed
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+class AnalysisJob(BaseModel):
+    """Payload of a queued analysis job."""
+    job_id: UUID
+    url: str
+    options: dict = Field(default_factory=dict)
+    attempts: int = 0
+    last_error: Optional[str] = None
+    summary_id: Optional[UUID] = None
+    single_flight_key: Optional[str] = None
+    # Model call lane: user submissions are served before background re-scans
+    priority: Literal["interactive", "background"] = "interactive"
+
+
+def job_status_key(job_id: UUID | str) -> str:
+    """Redis key holding the status string of a job."""
+    return f"job:{job_id}"
+
+
+def job_data_key(job_id: UUID | str) -> str:
+    """Redis key holding the serialized ``AnalysisJob`` payload."""
+    return f"job:{job_id}:data"
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff with full jitter for the given number of failed attempts."""
+    ceiling = min(
+        settings.job_retry_backoff_max_seconds,
+        settings.job_retry_backoff_seconds * (2 ** max(attempts - 1, 0)),
+    )
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def handler_timeout_seconds() -> float:
+    """
+    How long a worker may run a reserved job.
+    
+    Shorter than the visibility timeout by ``settings.job_handler_margin_seconds``,
+    so a job is failed (or acked) by its worker before ``requeue_expired_jobs``
+    could reclaim it and count the attempt a second time.
+    """
+    return settings.job_visibility_timeout_seconds - settings.job_handler_margin_seconds
+
+
+async def _save_job(redis: Redis, job: AnalysisJob, status: str | None = None) -> None:
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.setex(job_data_key(job.job_id), settings.job_ttl_seconds, job.model_dump_json())
+        if status is not None:
+            pipe.setex(job_status_key(job.job_id), settings.job_ttl_seconds, status)
+        await pipe.execute()
+
+
+async def set_job_status(redis: Redis, job_id: UUID | str, status: str) -> None:
+    """Record a progress step; subscribers are notified via keyspace events."""
+    await redis.setex(job_status_key(job_id), settings.job_ttl_seconds, status)
+
+
+async def load_job(redis: Redis, job_id: UUID | str) -> AnalysisJob | None:
+    """Load a job payload, or ``None`` if it expired."""
+    data = await redis.get(job_data_key(job_id))
+    return AnalysisJob.model_validate_json(data) if data is not None else None
+
+
+async def enqueue_job(redis: Redis, job: AnalysisJob) -> None:
+    """Store the job payload, mark it processing and push it onto the ready queue."""
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.setex(job_data_key(job.job_id), settings.job_ttl_seconds, job.model_dump_json())
+        pipe.setex(job_status_key(job.job_id), settings.job_ttl_seconds, "processing")
+        pipe.lpush(QUEUE_KEY, str(job.job_id))
+        await pipe.execute()
+
+
+async def submit_job(
+    redis: Redis,
+    url: str,
+    options: dict | None = None,
+    priority: Literal["interactive", "background"] = "interactive",
+) -> tuple[UUID, bool]:
+    """
+    Queue an analysis of ``url`` unless an identical one is already in flight.
+    
+    Returns the job id and whether the submission joined an existing job.
+    """
+    options = options or {}
+    key = single_flight.single_flight_key(url, options)
+    job = AnalysisJob(job_id=uuid4(), url=url, options=options, single_flight_key=key, priority=priority)
+    
+    existing_job_id = await single_flight.claim_or_join(redis, key, job.job_id)
+    if existing_job_id is not None:
+        return existing_job_id, True
+    
+    await enqueue_job(redis, job)
+    return job.job_id, False
+
+
+async def reserve_job(redis: Redis, timeout_seconds: float = 1.0) -> AnalysisJob | None:
+    """
+    Block until a job is ready and reserve it for ``job_visibility_timeout_seconds``.
+    
+    The id is moved atomically onto the processing list, so a worker crash
+    between the move and the deadline write is recovered by ``requeue_expired``.
+    """
+    job_id = await redis.blmove(QUEUE_KEY, PROCESSING_KEY, timeout_seconds, "RIGHT", "LEFT")
+    if job_id is None:
+        return None
+    await redis.zadd(
+        DEADLINES_KEY, {job_id: time.time() + settings.job_visibility_timeout_seconds}
+    )
+    job = await load_job(redis, job_id)
+    if job is None:
+        # Payload expired while queued; nothing left to run.
+        await _release(redis, job_id)
+    return job
+
+
+async def _release(redis: Redis, job_id: UUID | str) -> None:
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.lrem(PROCESSING_KEY, 1, str(job_id))
+        pipe.zrem(DEADLINES_KEY, str(job_id))
+        await pipe.execute()
+
+
+async def _release_single_flight(redis: Redis, job: AnalysisJob) -> None:
+    # Later identical submissions start a fresh job once this one is final.
+    if job.single_flight_key is not None:
+        await single_flight.release(redis, job.single_flight_key, job.job_id)
+
+
+async def ack_job(redis: Redis, job: AnalysisJob, status: str = "completed") -> None:
+    """Mark a reserved job as finished and remove it from the processing set."""
+    await _release(redis, job.job_id)
+    await _save_job(redis, job, status=status)
+    await _release_single_flight(redis, job)
+
+
+async def fail_job(redis: Redis, job: AnalysisJob, error: str) -> bool:
+    """
+    Record a failed attempt and either schedule a retry or dead-letter the job.
+    
+    Returns ``True`` if the job will be retried.
+    """
+    job.attempts += 1
+    job.last_error = error
+    await _release(redis, job.job_id)
+    if job.attempts >= settings.job_max_attempts:
+        await _save_job(redis, job, status="failed")
+        await redis.lpush(DEAD_LETTER_KEY, str(job.job_id))
+        await _release_single_flight(redis, job)
+        return False
+    await _save_job(redis, job)
+    await redis.zadd(DELAYED_KEY, {str(job.job_id): time.time() + retry_delay_seconds(job.attempts)})
+    return True
+
+
+async def promote_delayed_jobs(redis: Redis, now: float | None = None) -> int:
+    """Move retries whose backoff has elapsed back onto the ready queue."""
+    now = time.time() if now is None else now
+    promoted = 0
+    for job_id in await redis.zrangebyscore(DELAYED_KEY, "-inf", now):
+        # ZREM acts as the claim, so concurrent maintenance loops never double-push.
+        if await redis.zrem(DELAYED_KEY, job_id):
+            await redis.lpush(QUEUE_KEY, job_id)
+            promoted += 1
+    return promoted
+
+
+async def requeue_expired_jobs(redis: Redis, now: float | None = None) -> int:
+    """
+    Treat reservations past their visibility deadline as failed attempts.
+    
+    Processing entries without a deadline (the reserving worker died right
+    after BLMOVE) are given one, so they expire on a later pass.
+    """
+    now = time.time() if now is None else now
+    for job_id in await redis.lrange(PROCESSING_KEY, 0, -1):
+        await redis.zadd(
+            DEADLINES_KEY, {job_id: now + settings.job_visibility_timeout_seconds}, nx=True
+        )
+    
+    requeued = 0
+    for job_id in await redis.zrangebyscore(DEADLINES_KEY, "-inf", now):
+        if not await redis.zrem(DEADLINES_KEY, job_id):
+            continue
+        job = await load_job(redis, job_id)
+        if job is None:
+            await redis.lrem(PROCESSING_KEY, 1, job_id)
+            continue
+        if await fail_job(redis, job, "visibility timeout expired"):
+            requeued += 1
+    return requeued
+
+
+async def queue_depth(redis: Redis) -> dict:
+    """Sizes of each queue structure, e.g. for autoscaling the worker fleet."""
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.llen(QUEUE_KEY)
+        pipe.llen(PROCESSING_KEY)
+        pipe.zcard(DELAYED_KEY)
+        pipe.llen(DEAD_LETTER_KEY)
+        ready, processing, delayed, dead = await pipe.execute()
+    return {"ready": ready, "processing": processing, "delayed": delayed, "dead": dead}
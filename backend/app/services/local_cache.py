@@ -0,0 +1,89 @@
+"""Bounded in-process LRU/TTL cache used as the first tier in front of Redis."""
+import time
+from collections import OrderedDict
+from app.config import settings
+
+
+class LocalLRUCache:
+    """
+    Per-worker LRU cache with entry-count, byte-size and TTL limits.
+    
+    Not thread-safe; it is meant to be used from a single event loop.
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[str, int, float]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+    
+    def get(self, key: str) -> str | None:
+        """Return a cached value and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, _, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: str, value: str) -> None:
+        """Insert a value, evicting least recently used entries to stay in bounds."""
+        size = len(value.encode("utf-8"))
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size, time.monotonic() + self.ttl_seconds)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry if present."""
+        if key in self._entries:
+            self._remove(key)
+    
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters."""
+        self._entries.clear()
+        self._bytes = 0
+    
+    def stats(self) -> dict:
+        """Return counters and current occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+    
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+summary_local_cache = LocalLRUCache(
+    max_entries=settings.local_cache_max_entries,
+    max_bytes=settings.local_cache_max_bytes,
+    ttl_seconds=settings.local_cache_ttl_seconds,
+)
@@ -0,0 +1,291 @@
+"""
+Rate-aware client for the Anthropic Messages API.
+
+Every call passes three gates:
+
+- an adaptive concurrency limit per process, which halves on a 429 and grows
+  by about one slot per window of successful calls (AIMD);
+- a request bucket and a token bucket shared by all workers through Redis,
+  sized to the account's per-minute limits;
+- priority lanes: interactive (user-submitted) calls are admitted before
+  background (re-scan) calls, and background calls leave a share of each
+  shared bucket untouched for interactive ones.
+
+A slot is only held for the HTTP request itself: calls waiting on the
+buckets or backing off before a retry hold none.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from contextvars import ContextVar
+from typing import Literal
+import httpx
+from redis.asyncio import Redis
+from app.api.dependencies import get_redis
+from app.config import settings
+from app.services.chunking import estimate_tokens
+
+Priority = Literal["interactive", "background"]
+PRIORITIES: tuple[Priority, ...] = ("interactive", "background")
+
+# Lane of model calls made by the current task; the analysis pipeline sets it
+# from the job so nested calls need not pass it along.
+current_priority: ContextVar[Priority] = ContextVar("model_priority", default="interactive")
+
+REQUEST_BUCKET_KEY = "ratelimit:model:requests"
+TOKEN_BUCKET_KEY = "ratelimit:model:tokens"
+
+# Refill the bucket for the time since its last update, then take ``amount``
+# if at least ``reserve`` stays behind. Returns the seconds to wait before
+# retrying (0 when taken). ``force`` takes unconditionally and may leave the
+# bucket negative, to charge usage only known after the call. Numbers are
+# returned as strings because Lua numbers are truncated to integers.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local force = ARGV[6] == '1'
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if force or tokens - amount >= reserve then
+    tokens = tokens - amount
+else
+    wait = (amount + reserve - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class ModelAPIError(Exception):
+    """The model API failed or kept rejecting a call."""
+
+
+class RedisTokenBucket:
+    """
+    Token bucket shared across processes through a Redis hash.
+    
+    Holds up to ``capacity`` tokens and refills at ``refill_per_second``.
+    Callers compute the current time, so worker clocks should be roughly
+    in sync.
+    """
+    
+    def __init__(self, redis: Redis, key: str, capacity: float, refill_per_second: float):
+        self.redis = redis
+        self.key = key
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+    
+    async def _take(self, amount: float, reserve: float = 0.0, force: bool = False) -> float:
+        wait = await self.redis.eval(
+            _TAKE_SCRIPT,
+            1,
+            self.key,
+            self.capacity,
+            self.refill_per_second,
+            amount,
+            reserve,
+            time.time(),
+            "1" if force else "0",
+        )
+        return float(wait)
+    
+    async def try_acquire(self, amount: float, reserve: float = 0.0) -> float:
+        """Take ``amount`` if available; returns 0, or the seconds until it should be."""
+        return await self._take(min(amount, self.capacity - reserve), reserve)
+    
+    async def acquire(self, amount: float, reserve: float = 0.0) -> None:
+        """Wait until ``amount`` tokens could be taken while keeping ``reserve`` in the bucket."""
+        while (wait := await self.try_acquire(amount, reserve)) > 0:
+            # Jitter so waiting workers do not all retry at the same instant.
+            await asyncio.sleep(wait * random.uniform(1.0, 1.2))
+    
+    async def charge(self, amount: float) -> None:
+        """Take ``amount`` unconditionally (a negative amount refunds)."""
+        await self._take(amount, force=True)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to rate limiting, with priority lanes.
+    
+    The limit grows by ``1 / limit`` per success (about one slot per window
+    of calls) and is multiplied by ``backoff_factor`` on a rate-limited call.
+    Waiters are admitted in lane order, first come first served within a
+    lane. Not thread-safe; use it from a single event loop.
+    """
+    
+    def __init__(self, initial: float, minimum: float, maximum: float, backoff_factor: float = 0.5):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.backoff_factor = backoff_factor
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+    
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(1, int(self.limit))
+    
+    def _wake(self) -> None:
+        while self._waiters and self._has_capacity():
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+    
+    async def acquire(self, priority: Priority = "interactive") -> None:
+        """Wait for a slot in the lane of ``priority``."""
+        if not self._waiters and self._has_capacity():
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES.index(priority), next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Cancelled after being granted a slot: hand it on.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+    
+    def release(self) -> None:
+        """Free a slot taken by ``acquire``."""
+        self.in_flight -= 1
+        self._wake()
+    
+    def on_success(self) -> None:
+        """Additive increase after a successful call."""
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        self._wake()
+    
+    def on_rate_limited(self) -> None:
+        """Multiplicative decrease after a rate-limited call."""
+        self.limit = max(self.minimum, self.limit * self.backoff_factor)
+
+
+def _retry_delay_seconds(response: httpx.Response | None, attempt: int) -> float:
+    # Honor the server's Retry-After; otherwise exponential backoff with jitter.
+    header = response.headers.get("retry-after") if response is not None else None
+    if header is not None:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    ceiling = min(settings.model_retry_backoff_max_seconds, settings.model_retry_backoff_seconds * 2 ** attempt)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class ModelClient:
+    """Messages API client shared by all analysis tasks of a process."""
+    
+    def __init__(self, redis: Redis, http_client: httpx.AsyncClient | None = None):
+        self.model = settings.anthropic_model
+        self._http = http_client or httpx.AsyncClient(
+            base_url=settings.anthropic_base_url,
+            timeout=settings.model_timeout_seconds,
+        )
+        self.limiter = AdaptiveLimiter(
+            settings.model_concurrency_initial,
+            settings.model_concurrency_min,
+            settings.model_concurrency_max,
+        )
+        self.requests = RedisTokenBucket(
+            redis,
+            REQUEST_BUCKET_KEY,
+            settings.model_requests_per_minute,
+            settings.model_requests_per_minute / 60,
+        )
+        self.tokens = RedisTokenBucket(
+            redis,
+            TOKEN_BUCKET_KEY,
+            settings.model_tokens_per_minute,
+            settings.model_tokens_per_minute / 60,
+        )
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._http.aclose()
+    
+    async def _admit(self, estimated_tokens: int, priority: Priority) -> None:
+        reserve = settings.model_background_reserve_ratio if priority == "background" else 0.0
+        await self.requests.acquire(1, reserve * self.requests.capacity)
+        await self.tokens.acquire(estimated_tokens, reserve * self.tokens.capacity)
+    
+    async def complete(self, prompt: str, max_tokens: int | None = None, priority: Priority | None = None) -> str:
+        """
+        Send ``prompt`` as a single user message and return the reply text.
+        
+        ``priority`` defaults to the lane in ``current_priority``. Raises
+        ``ModelAPIError`` on a client error or once
+        ``settings.model_max_attempts`` attempts were rate limited or failed.
+        """
+        priority = priority or current_priority.get()
+        max_tokens = max_tokens or settings.model_max_output_tokens
+        # Output is charged at its cap up front and refunded from the usage report.
+        estimated_tokens = estimate_tokens(prompt) + max_tokens
+        body = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        headers = {
+            "x-api-key": settings.anthropic_api_key or "",
+            "anthropic-version": settings.anthropic_api_version,
+        }
+        
+        for attempt in range(settings.model_max_attempts):
+            # Wait on the shared buckets before taking a slot, so a call held
+            # back by them never keeps a slot from another lane.
+            await self._admit(estimated_tokens, priority)
+            await self.limiter.acquire(priority)
+            try:
+                response = await self._http.post("/v1/messages", json=body, headers=headers)
+            except httpx.TransportError:
+                response = None
+            finally:
+                self.limiter.release()
+            
+            if response is not None and response.status_code == 200:
+                self.limiter.on_success()
+                data = response.json()
+                usage = data.get("usage", {})
+                used = usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+                if used:
+                    await self.tokens.charge(used - estimated_tokens)
+                return "".join(block.get("text", "") for block in data.get("content", []))
+            if response is not None and response.status_code == 429:
+                self.limiter.on_rate_limited()
+            elif response is not None and response.status_code < 500:
+                raise ModelAPIError(f"Model API returned {response.status_code}: {response.text[:200]}")
+            # Rate limited, overloaded (529), server or connection error: back off and retry.
+            await asyncio.sleep(_retry_delay_seconds(response, attempt))
+        
+        raise ModelAPIError(f"Model API call failed after {settings.model_max_attempts} attempts")
+
+
+_client: ModelClient | None = None
+
+
+async def get_model_client() -> ModelClient:
+    """The model client of this process."""
+    global _client
+    if _client is None:
+        _client = ModelClient(await get_redis())
+    return _client
+
+
+async def close_model_client() -> None:
+    """Close the process's model client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
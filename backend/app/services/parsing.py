@@ -0,0 +1,197 @@
+"""Process pool for CPU-bound document parsing.
+
+HTML and PDF bodies are parsed in separate processes so a slow document
+never stalls the worker's event loop. Bodies are handed over through shared
+memory rather than pickled, each parse runs under a timeout and an address
+space limit, and at most ``settings.parse_max_pending`` documents wait for
+the pool before callers are made to wait themselves. A parse stuck past its
+timeout takes the pool down with it; the other parses it interrupted are
+retried once on the replacement pool.
+"""
+import asyncio
+import multiprocessing
+import os
+import signal
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from app.config import settings
+from app.utils.html_text import FEED_CHUNK_CHARS, HTMLTextExtractor, normalize_text
+
+# Extra time the parent allows over the in-process timeout before killing the pool
+_KILL_GRACE_SECONDS = 5.0
+
+
+class ParseError(Exception):
+    """A document could not be parsed."""
+
+
+class ParseTimeoutError(ParseError):
+    """A document took longer than ``settings.parse_timeout_seconds`` to parse."""
+
+
+def parse_html_bytes(data, encoding: str | None = None) -> tuple[str, str]:
+    """``(title, text)`` of an HTML body, fed to the streaming extractor in chunks."""
+    extractor = HTMLTextExtractor(encoding)
+    blocks = []
+    for start in range(0, len(data), FEED_CHUNK_CHARS):
+        blocks.extend(extractor.feed(bytes(data[start:start + FEED_CHUNK_CHARS])))
+    blocks.extend(extractor.close())
+    return extractor.title, "\n\n".join(blocks)
+
+
+def parse_pdf_bytes(data, encoding: str | None = None) -> tuple[str, str]:
+    """``(title, text)`` of a PDF, one block per text block of each page."""
+    # Optional dependency: only needed where PDFs are parsed.
+    import fitz
+    
+    with fitz.open(stream=bytes(data), filetype="pdf") as pdf:
+        blocks = []
+        for page in pdf:
+            for block in page.get_text("blocks", sort=True):
+                text = normalize_text(block[4])
+                if text:
+                    blocks.append(text)
+        return normalize_text(pdf.metadata.get("title") or ""), "\n\n".join(blocks)
+
+
+PARSERS = {
+    "html": parse_html_bytes,
+    "pdf": parse_pdf_bytes,
+}
+
+
+def _init_child(memory_limit_bytes: int) -> None:
+    # A runaway document fails with MemoryError instead of exhausting the host.
+    import resource
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeoutError("parse timed out")
+
+
+def _parse_in_child(shm_name: str, size: int, kind: str, encoding: str | None, timeout: float) -> tuple[str, str]:
+    # Spawned children share the parent's resource tracker, which already
+    # tracks the segment; the parent alone unlinks it.
+    shm = SharedMemory(name=shm_name)
+    signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with shm.buf[:size] as data:
+            return PARSERS[kind](data, encoding)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        shm.close()
+
+
+class ParserPool:
+    """Parser processes shared by the extractions of one worker process."""
+    
+    def __init__(
+        self,
+        processes: int | None = None,
+        max_pending: int | None = None,
+        timeout_seconds: float | None = None,
+        memory_limit_bytes: int | None = None,
+    ):
+        self.processes = processes or settings.parse_processes or os.cpu_count() or 1
+        self.timeout_seconds = timeout_seconds or settings.parse_timeout_seconds
+        self.memory_limit_bytes = memory_limit_bytes or settings.parse_memory_limit_bytes
+        # Waiting room, then one slot per process so a submitted parse starts at once
+        self._pending = asyncio.Semaphore(max_pending or settings.parse_max_pending)
+        self._running = asyncio.Semaphore(self.processes)
+        self._executor: ProcessPoolExecutor | None = None
+        # Pools killed because one of their parses timed out
+        self._recycled: weakref.WeakSet[ProcessPoolExecutor] = weakref.WeakSet()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_child,
+                initargs=(self.memory_limit_bytes,),
+            )
+        return self._executor
+    
+    def _kill(self, executor: ProcessPoolExecutor) -> None:
+        # ProcessPoolExecutor cannot cancel a running call; stop its processes
+        # and start a fresh pool on the next parse. Calls still in flight fail
+        # with BrokenProcessPool rather than being cancelled.
+        if self._executor is executor:
+            self._executor = None
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.kill()
+        executor.shutdown(wait=False)
+    
+    async def parse(self, data: bytes, kind: str, encoding: str | None = None) -> tuple[str, str]:
+        """Parse a ``kind`` (``"html"`` or ``"pdf"``) body into ``(title, text)``."""
+        if kind not in PARSERS:
+            raise ParseError(f"No parser for {kind!r}")
+        
+        async with self._pending, self._running:
+            shm = SharedMemory(create=True, size=max(len(data), 1))
+            try:
+                shm.buf[:len(data)] = data
+                for attempt in range(2):
+                    executor = self._get_executor()
+                    future = asyncio.get_running_loop().run_in_executor(
+                        executor, _parse_in_child, shm.name, len(data), kind, encoding, self.timeout_seconds
+                    )
+                    try:
+                        return await asyncio.wait_for(future, self.timeout_seconds + _KILL_GRACE_SECONDS)
+                    except asyncio.TimeoutError:
+                        # Stuck outside Python code, where the in-process alarm cannot fire.
+                        self._recycled.add(executor)
+                        self._kill(executor)
+                        raise ParseTimeoutError(f"{kind} parse exceeded {self.timeout_seconds}s") from None
+                    except BrokenProcessPool as exc:
+                        if attempt == 0 and executor in self._recycled:
+                            # Killed for another parse's timeout: run again on the fresh pool.
+                            continue
+                        self._kill(executor)
+                        raise ParseError(f"{kind} parser process died") from exc
+                    except MemoryError as exc:
+                        raise ParseError(f"{kind} parse exceeded the memory limit") from exc
+            finally:
+                shm.close()
+                shm.unlink()
+    
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_pool: ParserPool | None = None
+
+
+def get_parser_pool() -> ParserPool:
+    """The parser pool of this process."""
+    global _pool
+    if _pool is None:
+        _pool = ParserPool()
+    return _pool
+
+
+def close_parser_pool() -> None:
+    """Shut the process's parser pool down, if one was started."""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+async def parse_document(data: bytes, kind: str, encoding: str | None = None) -> tuple[str, str]:
+    """
+    Parse a document body into ``(title, text)``.
+    
+    HTML up to ``settings.parse_inline_max_bytes`` is parsed in-process,
+    where the IPC round trip would cost more than the parse; everything else
+    goes to the process pool.
+    """
+    if kind == "html" and len(data) <= settings.parse_inline_max_bytes:
+        return parse_html_bytes(data, encoding)
+    return await get_parser_pool().parse(data, kind, encoding)
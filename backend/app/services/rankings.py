@@ -0,0 +1,109 @@
+"""Precomputed per-category service rankings."""
+from sqlalchemy import ColumnElement, Row, Select, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.database import Document, ServiceCategoryScore, Summary
+from app.services.comparison import SEVERITIES, SEVERITY_WEIGHTS, summary_features
+
+
+def latest_summary_select(
+    service_name: str | ColumnElement[str],
+    document_type: str | ColumnElement[str],
+) -> Select:
+    """
+    Id of the most recently generated summary of a service and document type.
+    
+    Versions are numbered per document URL, so they only break ties. Pass
+    columns of an outer query to use this as a correlated subquery; it
+    selects from its own aliases and never correlates to ``Summary`` itself.
+    """
+    latest, document = aliased(Summary), aliased(Document)
+    return (
+        select(latest.id)
+        .join(document, document.id == latest.document_id)
+        .where(document.service_name == service_name, document.document_type == document_type)
+        .order_by(latest.generated_at.desc(), latest.version.desc())
+        .limit(1)
+    )
+
+
+async def refresh_service_rankings(db: AsyncSession, summary: Summary, document: Document) -> None:
+    """
+    Replace the ranking rows of the summary's service and document type.
+    
+    Runs inside the caller's transaction, so rankings commit atomically with
+    the summary. A summary only replaces the rows if it is the most recently
+    generated one of the service and document type, whichever of the
+    service's URLs it belongs to (versions are numbered per URL).
+    """
+    latest_id = await db.scalar(latest_summary_select(document.service_name, document.document_type))
+    if latest_id is not None and latest_id != summary.id:
+        return
+    
+    features = summary_features(
+        summary.id,
+        document.service_name,
+        document.document_type,
+        summary.clarity_score,
+        summary.red_flags,
+        summary.rules,
+        summary.concessions,
+    )
+    categories = features.red_flags.keys() | features.rules.keys() | features.concessions.keys()
+    
+    await db.execute(
+        delete(ServiceCategoryScore).where(
+            ServiceCategoryScore.service_name == document.service_name,
+            ServiceCategoryScore.document_type == document.document_type,
+        )
+    )
+    for category in sorted(categories):
+        counts = features.red_flags.get(category, [0] * len(SEVERITIES))
+        db.add(ServiceCategoryScore(
+            service_name=document.service_name,
+            document_type=document.document_type,
+            category=category,
+            summary_id=summary.id,
+            critical_count=counts[0],
+            warning_count=counts[1],
+            info_count=counts[2],
+            severity_score=int(SEVERITY_WEIGHTS @ counts),
+            clarity_score=summary.clarity_score,
+        ))
+
+
+def category_ranking_select(category: str, document_type: str, limit: int) -> Select:
+    """
+    Select the ranking of ``category`` using only the columns of the ranking index.
+    
+    The key and ``INCLUDE`` columns of ``ix_service_category_scores_ranking``
+    cover every selected column, so Postgres answers with an index-only scan.
+    Keep this list within that index when adding columns.
+    """
+    return (
+        select(
+            ServiceCategoryScore.service_name,
+            ServiceCategoryScore.summary_id,
+            ServiceCategoryScore.severity_score,
+            ServiceCategoryScore.critical_count,
+            ServiceCategoryScore.warning_count,
+            ServiceCategoryScore.info_count,
+            ServiceCategoryScore.clarity_score,
+        )
+        .where(
+            ServiceCategoryScore.category == category,
+            ServiceCategoryScore.document_type == document_type,
+        )
+        .order_by(
+            ServiceCategoryScore.severity_score,
+            ServiceCategoryScore.clarity_score.desc(),
+            ServiceCategoryScore.service_name,
+        )
+        .limit(limit)
+    )
+
+
+async def get_category_ranking(db: AsyncSession, category: str, document_type: str, limit: int) -> list[Row]:
+    """Services ranked by severity in ``category``; served from the ranking index."""
+    result = await db.execute(category_ranking_select(category, document_type, limit))
+    return list(result)
@@ -0,0 +1,173 @@
+"""Periodic re-scans of tracked URLs with conditional requests."""
+import asyncio
+import logging
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+import httpx
+from redis.asyncio import Redis
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import AsyncSessionLocal
+from app.config import settings
+from app.models.database import Document, RescanTarget
+from app.services.dedup import extraction_cache_key
+from app.services.extraction import ExtractionError, extract_page
+from app.services.fetcher import ResponseTooLargeError, fetch_page
+from app.services.job_queue import submit_job
+from app.services.parsing import ParseError
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of checking one target
+NOT_MODIFIED = "not_modified"
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+RATE_LIMITED = "rate_limited"
+ERROR = "error"
+
+
+def domain_of(url: str) -> str:
+    """Host a URL is fetched from, used for per-domain rate limits."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def domain_slot_key(domain: str) -> str:
+    """Redis key held while a domain is cooling down between fetches."""
+    return f"rescan:domain:{domain}"
+
+
+def next_check_at(now: datetime, interval_seconds: float | None = None) -> datetime:
+    """Next check time, jittered so URLs added together do not stay in lockstep."""
+    interval = settings.rescan_interval_seconds if interval_seconds is None else interval_seconds
+    jitter = random.uniform(-settings.rescan_jitter_ratio, settings.rescan_jitter_ratio)
+    return now + timedelta(seconds=interval * (1 + jitter))
+
+
+async def acquire_domain_slot(redis: Redis, domain: str) -> bool:
+    """Claim the next fetch of ``domain``; False if it was fetched too recently."""
+    return bool(await redis.set(
+        domain_slot_key(domain),
+        "1",
+        nx=True,
+        px=int(settings.rescan_domain_min_interval_seconds * 1000),
+    ))
+
+
+async def sync_targets(db: AsyncSession, now: datetime) -> int:
+    """
+    Start tracking every analyzed URL that is not tracked yet.
+    
+    URLs another scheduler started tracking concurrently are skipped.
+    """
+    result = await db.execute(
+        select(Document.url, func.max(Document.extracted_at))
+        .where(Document.url.not_in(select(RescanTarget.url)))
+        .group_by(Document.url)
+    )
+    rows = []
+    for url, extracted_at in result:
+        if extracted_at is not None and extracted_at.tzinfo is None:
+            extracted_at = extracted_at.replace(tzinfo=timezone.utc)
+        rows.append({"url": url, "domain": domain_of(url), "next_check_at": next_check_at(extracted_at or now)})
+    if not rows:
+        return 0
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    await db.execute(insert(RescanTarget).values(rows).on_conflict_do_nothing(index_elements=["url"]))
+    return len(rows)
+
+
+async def check_target(redis: Redis, client: httpx.AsyncClient, target: RescanTarget, now: datetime) -> str:
+    """
+    Conditionally re-fetch one target and queue an analysis if it changed.
+    
+    Sends the stored ETag/Last-Modified validators; a 304, or a body whose
+    extracted text hashes like last time, ends the check without queueing
+    an analysis. Hashing the extracted text rather than the body ignores
+    markup-only churn such as nonces and timestamps. Updates ``target``
+    in place.
+    """
+    if not await acquire_domain_slot(redis, target.domain):
+        target.next_check_at = now + timedelta(
+            seconds=settings.rescan_domain_min_interval_seconds * (1 + random.random())
+        )
+        return RATE_LIMITED
+    
+    headers = {}
+    if target.etag:
+        headers["If-None-Match"] = target.etag
+    if target.last_modified:
+        headers["If-Modified-Since"] = target.last_modified
+    
+    target.last_checked_at = now
+    target.next_check_at = next_check_at(now)
+    try:
+        page = await fetch_page(client, target.url, headers=headers, timeout=settings.rescan_timeout_seconds)
+        target.last_status = page.status_code
+        if page.status_code == 304:
+            return NOT_MODIFIED
+        document = await extract_page(target.url, page)
+    except httpx.HTTPStatusError as exc:
+        target.last_status = exc.response.status_code
+        return ERROR
+    except (httpx.HTTPError, ResponseTooLargeError, ExtractionError, ParseError) as exc:
+        logger.warning("Re-scan of %s failed: %r", target.url, exc)
+        return ERROR
+    
+    target.etag = page.etag
+    target.last_modified = page.last_modified
+    if document.content_hash == target.body_hash:
+        return UNCHANGED
+    
+    target.body_hash = document.content_hash
+    # The URL's cached extraction is stale now; make the worker fetch it again.
+    await redis.delete(extraction_cache_key(target.url))
+    await submit_job(redis, target.url, priority="background")
+    return CHANGED
+
+
+async def _claim_due_targets(now: datetime) -> list[RescanTarget]:
+    # Pushing next_check_at forward is the claim: once committed, other
+    # schedulers skip these targets without a lock held during the fetches.
+    async with AsyncSessionLocal() as db:
+        await sync_targets(db, now)
+        await db.flush()
+        due = (await db.scalars(
+            select(RescanTarget)
+            .where(RescanTarget.next_check_at <= now)
+            .order_by(RescanTarget.next_check_at)
+            .limit(settings.rescan_batch_size)
+            .with_for_update(skip_locked=True)
+        )).all()
+        for target in due:
+            target.next_check_at = next_check_at(now)
+        await db.commit()
+    return list(due)
+
+
+async def run_rescan_batch(redis: Redis, client: httpx.AsyncClient, now: datetime | None = None) -> Counter:
+    """
+    Check up to ``settings.rescan_batch_size`` due targets; returns outcome counts.
+    
+    Targets are claimed and their results written in two short transactions;
+    no database connection is held while the pages are fetched.
+    """
+    now = now or datetime.now(timezone.utc)
+    due = await _claim_due_targets(now)
+    if not due:
+        return Counter()
+    
+    semaphore = asyncio.Semaphore(settings.rescan_concurrency)
+    
+    async def check(target: RescanTarget) -> str:
+        async with semaphore:
+            return await check_target(redis, client, target, now)
+    
+    outcomes = Counter(await asyncio.gather(*(check(target) for target in due)))
+    async with AsyncSessionLocal() as db:
+        for target in due:
+            await db.merge(target)
+        await db.commit()
+    return outcomes
@@ -0,0 +1,188 @@
+"""
+Persistent cache of model responses.
+
+Each entry is the parsed output of one section prompt over one chunk of
+document text, keyed by (model version, prompt template hash, chunk hash).
+Unchanged chunks, retried jobs and reruns with unchanged prompts are then
+answered without calling the model. Entries are evicted least recently used
+first beyond ``settings.model_cache_max_entries``; hit and miss counters
+live in Redis so they aggregate across worker processes.
+
+Lookups never write to the database: hits are collected in process and
+written in one batch, together with eviction, by
+``maintain_response_cache``, which the worker maintenance loop runs every
+``settings.model_cache_maintenance_interval_seconds``. ``hit_count`` and
+``last_used_at`` therefore lag by up to one interval; hits of a failed
+write are kept for the next one.
+"""
+from datetime import datetime, timezone
+from redis.asyncio import Redis
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.database import ModelResponse
+from app.prompts.sections import SECTION_PROMPTS, prompt_hash
+from app.services.dedup import content_hash
+
+STATS_KEY = "model_cache:stats"
+
+# Hits not yet written back: primary key -> (hit count, last hit time)
+pending_touches: dict[tuple[str, str, str], tuple[int, datetime]] = {}
+
+
+def response_key(section: str, text: str) -> tuple[str, str, str]:
+    """Primary key of the cached response of ``section`` over ``text``."""
+    return settings.anthropic_model, prompt_hash(section), content_hash(text)
+
+
+async def _count(redis: Redis, section: str, outcome: str) -> None:
+    await redis.hincrby(STATS_KEY, f"{section}:{outcome}", 1)
+
+
+async def get_cached_response(db: AsyncSession, redis: Redis, section: str, text: str) -> list[dict] | None:
+    """Cached items of ``section`` for ``text``, recording the hit for the next flush; ``None`` on a miss."""
+    key = response_key(section, text)
+    items = await db.scalar(
+        select(ModelResponse.items).where(
+            ModelResponse.model_version == key[0],
+            ModelResponse.prompt_hash == key[1],
+            ModelResponse.chunk_hash == key[2],
+        )
+    )
+    if items is None:
+        await _count(redis, section, "misses")
+        return None
+    hits, _ = pending_touches.get(key, (0, None))
+    pending_touches[key] = (hits + 1, datetime.now(timezone.utc))
+    await _count(redis, section, "hits")
+    return items
+
+
+async def store_response(db: AsyncSession, section: str, text: str, items: list[dict]) -> None:
+    """Cache the items of ``section`` for ``text``."""
+    model_version, digest, chunk_digest = response_key(section, text)
+    now = datetime.now(timezone.utc)
+    db.add(ModelResponse(
+        model_version=model_version,
+        prompt_hash=digest,
+        chunk_hash=chunk_digest,
+        section=section,
+        items=items,
+        hit_count=0,
+        created_at=now,
+        last_used_at=now,
+    ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another job cached the same chunk concurrently; keep its entry.
+        await db.rollback()
+
+
+async def evict_lru(db: AsyncSession, max_entries: int | None = None) -> int:
+    """Delete the least recently used entries beyond ``max_entries``; returns how many."""
+    max_entries = settings.model_cache_max_entries if max_entries is None else max_entries
+    cutoff = await db.scalar(
+        select(ModelResponse.last_used_at)
+        .order_by(ModelResponse.last_used_at.desc())
+        .offset(max_entries)
+        .limit(1)
+    )
+    if cutoff is None:
+        return 0
+    result = await db.execute(
+        delete(ModelResponse)
+        .where(ModelResponse.last_used_at <= cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def flush_touches(db: AsyncSession) -> int:
+    """Write the hits recorded since the last flush in one batch; returns the entries touched."""
+    if not pending_touches:
+        return 0
+    touches = list(pending_touches.items())
+    pending_touches.clear()
+    table = ModelResponse.__table__
+    try:
+        await db.execute(
+            update(table)
+            .where(
+                table.c.model_version == bindparam("key_model_version"),
+                table.c.prompt_hash == bindparam("key_prompt_hash"),
+                table.c.chunk_hash == bindparam("key_chunk_hash"),
+            )
+            .values(hit_count=table.c.hit_count + bindparam("hits"), last_used_at=bindparam("used_at")),
+            [
+                {
+                    "key_model_version": model_version,
+                    "key_prompt_hash": digest,
+                    "key_chunk_hash": chunk_digest,
+                    "hits": hits,
+                    "used_at": used_at,
+                }
+                for (model_version, digest, chunk_digest), (hits, used_at) in touches
+            ],
+        )
+        await db.commit()
+    except BaseException:
+        # Keep the hits for the next flush, merged with any recorded meanwhile.
+        for key, (hits, used_at) in touches:
+            later_hits, later_used_at = pending_touches.get(key, (0, used_at))
+            pending_touches[key] = (hits + later_hits, max(used_at, later_used_at))
+        await db.rollback()
+        raise
+    return len(touches)
+
+
+async def maintain_response_cache(db: AsyncSession) -> int:
+    """Flush recorded hits, then evict beyond the size limit; returns the entries evicted."""
+    await flush_touches(db)
+    return await evict_lru(db)
+
+
+async def purge_prompt_version(db: AsyncSession, digest: str) -> int:
+    """Delete every entry produced by the prompt template with hash ``digest``."""
+    result = await db.execute(delete(ModelResponse).where(ModelResponse.prompt_hash == digest))
+    await db.commit()
+    return result.rowcount
+
+
+async def purge_stale_prompts(db: AsyncSession) -> int:
+    """Delete entries of prompt templates that are no longer current."""
+    current = [prompt_hash(section) for section in SECTION_PROMPTS]
+    result = await db.execute(delete(ModelResponse).where(ModelResponse.prompt_hash.not_in(current)))
+    await db.commit()
+    return result.rowcount
+
+
+async def cache_stats(db: AsyncSession, redis: Redis) -> dict:
+    """
+    Hit and miss counts per section, and stored entries per prompt version.
+    
+    ``hit_rate`` is ``None`` until a section has been looked up.
+    """
+    counters = {field: int(value) for field, value in (await redis.hgetall(STATS_KEY)).items()}
+    sections = {}
+    for section in SECTION_PROMPTS:
+        hits = counters.get(f"{section}:hits", 0)
+        misses = counters.get(f"{section}:misses", 0)
+        sections[section] = {
+            "prompt_hash": prompt_hash(section),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else None,
+        }
+    rows = await db.execute(
+        select(ModelResponse.section, ModelResponse.prompt_hash, func.count())
+        .group_by(ModelResponse.section, ModelResponse.prompt_hash)
+        .order_by(ModelResponse.section, ModelResponse.prompt_hash)
+    )
+    entries = [
+        {"section": section, "prompt_hash": digest, "entries": count}
+        for section, digest, count in rows
+    ]
+    return {"sections": sections, "entries": entries}
@@ -0,0 +1,43 @@
+"""Partial analysis results published while a job is still running.
+
+Each finished section is stored in the ``job:{id}:sections`` hash, so clients
+can render it immediately and reconnecting clients can replay what they missed.
+"""
+import json
+from uuid import UUID
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from app.config import settings
+
+# Red flags first: they are what users most want to see early.
+SECTIONS = ("red_flags", "rules", "concessions")
+
+
+class JobSection(BaseModel):
+    """One completed summary section of a running job."""
+    section: str
+    items: list[dict]
+
+
+def job_sections_key(job_id: UUID | str) -> str:
+    """Redis hash holding the completed sections of a job."""
+    return f"job:{job_id}:sections"
+
+
+async def publish_section(redis: Redis, job_id: UUID | str, section: str, items: list[dict]) -> None:
+    """Store a completed section; stream subscribers are woken by the keyspace event."""
+    key = job_sections_key(job_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(key, section, json.dumps(items))
+        pipe.expire(key, settings.job_ttl_seconds)
+        await pipe.execute()
+
+
+async def read_sections(redis: Redis, job_id: UUID | str) -> list[JobSection]:
+    """Completed sections of a job in ``SECTIONS`` order."""
+    stored = await redis.hgetall(job_sections_key(job_id))
+    return [
+        JobSection(section=section, items=json.loads(stored[section]))
+        for section in SECTIONS
+        if section in stored
+    ]
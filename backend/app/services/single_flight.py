@@ -0,0 +1,84 @@
+"""Single-flight coalescing of identical analyze submissions.
+
+The first caller for a normalized (URL, options) pair claims an in-flight key
+and enqueues the job; callers arriving while that job is pending get the same
+job id back. The key is released when the job reaches a final state.
+"""
+import hashlib
+import json
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from uuid import UUID
+from redis.asyncio import Redis
+from app.config import settings
+
+COALESCED_TOTAL_KEY = "stats:analyze:coalesced"
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Delete the in-flight key only if it still points at the finishing job.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a document URL for coalescing.
+    
+    Lowercases scheme and host, drops default ports, fragments and trailing
+    slashes, and sorts query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def single_flight_key(url: str, options: dict | None) -> str:
+    """Redis key identifying in-flight work for a URL and option set."""
+    identity = json.dumps([normalize_url(url), options or {}], sort_keys=True)
+    return f"inflight:analyze:{hashlib.sha256(identity.encode('utf-8')).hexdigest()}"
+
+
+def coalesced_count_key(job_id: UUID | str) -> str:
+    """Redis key counting callers coalesced onto a job."""
+    return f"job:{job_id}:coalesced"
+
+
+async def claim_or_join(redis: Redis, key: str, job_id: UUID) -> UUID | None:
+    """
+    Claim ``key`` for ``job_id`` or join the job already holding it.
+    
+    Returns ``None`` if the caller owns the key and must enqueue the job,
+    otherwise the id of the in-flight job it was coalesced onto.
+    """
+    while True:
+        if await redis.set(key, str(job_id), nx=True, ex=settings.job_ttl_seconds):
+            return None
+        existing = await redis.get(key)
+        if existing is None:
+            # Released between SET and GET; try to claim again.
+            continue
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.incr(coalesced_count_key(existing))
+            pipe.expire(coalesced_count_key(existing), settings.job_ttl_seconds)
+            pipe.incr(COALESCED_TOTAL_KEY)
+            await pipe.execute()
+        return UUID(existing)
+
+
+async def coalesced_count(redis: Redis, job_id: UUID | str) -> int:
+    """Number of extra callers that were handed ``job_id``."""
+    return int(await redis.get(coalesced_count_key(job_id)) or 0)
+
+
+async def release(redis: Redis, key: str, job_id: UUID | str) -> None:
+    """Release ``key`` if it is still held by ``job_id``."""
+    await redis.eval(_RELEASE_SCRIPT, 1, key, str(job_id))
@@ -0,0 +1,209 @@
+"""Summary persistence and read helpers."""
+from redis.asyncio import Redis
+from sqlalchemy import ColumnElement, Row, Select, exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.database import Document, Summary
+from app.config import settings
+from app.models.schemas import ConcessionSchema, RedFlagSchema, RuleSchema, SummaryResponse
+from app.services.analytics import write_section_rows
+from app.services.comparison import cache_features, summary_features
+from app.services.extraction import ExtractedDocument
+from app.services.incremental import sections_provenance
+from app.services.rankings import latest_summary_select, refresh_service_rankings
+from app.services.summary_cache import invalidate_summary
+from app.services.version_chain import store_document_text
+from app.utils.readability import clarity_score, reading_level, word_count
+
+
+def summary_response_select() -> Select:
+    """
+    Select exactly the columns a ``SummaryResponse`` needs in one joined query.
+    
+    Only ``service_name`` and ``document_type`` are read from ``documents``, so
+    large columns such as ``raw_content`` are never transferred.
+    """
+    return select(
+        Summary.id,
+        Document.service_name,
+        Document.document_type,
+        Summary.generated_at,
+        Summary.clarity_score,
+        Summary.red_flags,
+        Summary.rules,
+        Summary.concessions,
+        Summary.original_word_count,
+        Summary.summary_word_count,
+        Summary.reading_level,
+        Summary.model_version,
+    ).join(Document, Document.id == Summary.document_id)
+
+
+def serialize_summary_row(row: Row) -> str:
+    """Build and serialize a ``SummaryResponse`` from a ``summary_response_select`` row."""
+    return SummaryResponse(
+        id=row.id,
+        service_name=row.service_name,
+        document_type=row.document_type,
+        analyzed_at=row.generated_at,
+        clarity_score=row.clarity_score,
+        red_flags=[RedFlagSchema(**flag) for flag in row.red_flags],
+        rules=[RuleSchema(**rule) for rule in row.rules],
+        concessions=[ConcessionSchema(**concession) for concession in row.concessions],
+        metadata={
+            "original_word_count": row.original_word_count,
+            "summary_word_count": row.summary_word_count,
+            "reading_level": row.reading_level,
+            "model_version": row.model_version,
+        },
+    ).model_dump_json()
+
+
+def red_flag_filter(dialect_name: str, category: str, severity: str | None = None) -> ColumnElement[bool]:
+    """
+    Match summaries carrying a red flag of ``category`` (and ``severity``).
+    
+    On Postgres this is a ``@>`` containment served by the GIN index on
+    ``red_flags``; other dialects fall back to ``json_each``.
+    """
+    pattern = {"category": category}
+    if severity is not None:
+        pattern["severity"] = severity
+    
+    if dialect_name == "postgresql":
+        return type_coerce(Summary.red_flags, JSONB).contains([pattern])
+    
+    flag = func.json_each(Summary.red_flags).table_valued("value").alias("flag")
+    return exists(select(1).select_from(flag).where(*(
+        func.json_extract(flag.c.value, f"$.{key}") == value for key, value in pattern.items()
+    )))
+
+
+async def find_flagged_summaries(
+    db: AsyncSession,
+    category: str,
+    severity: str | None = None,
+    document_type: str | None = None,
+    limit: int = 100,
+) -> list[Row]:
+    """Latest summary per service and document type with a matching red flag."""
+    flagged = aliased(Document)
+    latest_id = latest_summary_select(flagged.service_name, flagged.document_type).scalar_subquery()
+    query = (
+        select(
+            Summary.id.label("summary_id"),
+            flagged.service_name,
+            flagged.document_type,
+            flagged.url,
+            Summary.version,
+            Summary.clarity_score,
+        )
+        .join(flagged, flagged.id == Summary.document_id)
+        .where(red_flag_filter(db.get_bind().dialect.name, category, severity))
+        .where(Summary.id == latest_id)
+        .order_by(flagged.service_name, flagged.document_type)
+        .limit(limit)
+    )
+    if document_type is not None:
+        query = query.where(flagged.document_type == document_type)
+    
+    result = await db.execute(query)
+    return list(result)
+
+
+async def save_summary(db: AsyncSession, redis: Redis, summary: Summary) -> Summary:
+    """
+    Persist a summary version together with its ranking and normalized section
+    rows, then invalidate any cached response for it and precompute its
+    comparison features.
+    
+    All writers of ``Summary`` rows should go through this helper so that the
+    read caches never serve a response older than the committed row.
+    """
+    db.add(summary)
+    await db.flush()
+    document = await summary.awaitable_attrs.document
+    await refresh_service_rankings(db, summary, document)
+    if settings.normalized_sections_enabled:
+        await write_section_rows(db, summary)
+    await db.commit()
+    await db.refresh(summary)
+    await invalidate_summary(redis, summary.id)
+    
+    await cache_features(redis, [summary_features(
+        summary.id,
+        document.service_name,
+        document.document_type,
+        summary.clarity_score,
+        summary.red_flags,
+        summary.rules,
+        summary.concessions,
+    )])
+    return summary
+
+
+def _sections_word_count(sections: dict[str, list[dict]]) -> int:
+    return sum(
+        word_count(value)
+        for items in sections.values()
+        for item in items
+        for value in item.values()
+        if isinstance(value, str)
+    )
+
+
+async def store_analysis(
+    db: AsyncSession,
+    redis: Redis,
+    extracted: ExtractedDocument,
+    sections: dict[str, list[dict]],
+    provenance: dict[str, list[list[str]]] | None = None,
+) -> Summary:
+    """
+    Persist an extracted document and its analyzed sections as a new summary version.
+    
+    ``provenance`` maps items to their source clauses; it is derived from the
+    text when not given.
+    
+    The version continues the sequence of earlier summaries for the same URL
+    and document type. The text goes to the blob store (as a snapshot or a
+    diff against the previous version) before the row is written, so a
+    committed document always has its blob.
+    """
+    previous_version = await db.scalar(
+        select(func.max(Summary.version))
+        .join(Document, Document.id == Summary.document_id)
+        .where(Document.url == extracted.url, Document.document_type == extracted.document_type)
+    )
+    # Identical texts share one compressed blob; the row only references it.
+    base_content_hash, chain_depth = await store_document_text(
+        db,
+        extracted.url,
+        extracted.service_name,
+        extracted.document_type,
+        extracted.content_hash,
+        extracted.text,
+    )
+    document = Document(
+        url=extracted.url,
+        service_name=extracted.service_name,
+        document_type=extracted.document_type,
+        content_hash=extracted.content_hash,
+        base_content_hash=base_content_hash,
+        chain_depth=chain_depth,
+    )
+    summary = Summary(
+        document=document,
+        version=(previous_version or 0) + 1,
+        red_flags=sections.get("red_flags", []),
+        rules=sections.get("rules", []),
+        concessions=sections.get("concessions", []),
+        provenance=provenance if provenance is not None else sections_provenance(extracted.text, sections),
+        clarity_score=clarity_score(extracted.text),
+        reading_level=reading_level(extracted.text),
+        original_word_count=word_count(extracted.text),
+        summary_word_count=_sections_word_count(sections),
+        model_version=settings.anthropic_model,
+    )
+    return await save_summary(db, redis, summary)
@@ -0,0 +1,115 @@
+"""Two-tier read-through cache for serialized summary responses.
+
+Reads check the per-worker ``summary_local_cache`` first, then Redis. Writes
+invalidate both tiers and publish the summary id on
+``settings.cache_invalidation_channel`` so other workers drop their local copy.
+"""
+import asyncio
+import logging
+from uuid import UUID
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from app.config import settings
+from app.services.local_cache import summary_local_cache
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_PREFIX = "summary"
+
+
+def summary_cache_key(summary_id: UUID | str) -> str:
+    """Build the Redis key holding the serialized response for a summary."""
+    return f"{SUMMARY_CACHE_PREFIX}:{summary_id}"
+
+
+async def get_cached_summary(redis: Redis, summary_id: UUID | str) -> str | None:
+    """Return the cached ``SummaryResponse`` JSON for a summary, if present."""
+    key = summary_cache_key(summary_id)
+    payload = summary_local_cache.get(key)
+    if payload is not None:
+        return payload
+    payload = await redis.get(key)
+    if payload is not None:
+        summary_local_cache.set(key, payload)
+    return payload
+
+
+async def get_cached_summaries(redis: Redis, summary_ids: list[UUID]) -> dict[UUID, str | None]:
+    """
+    Batch lookup through both tiers.
+    
+    Local hits are resolved in-process; everything else is fetched with a
+    single MGET, and Redis hits warm the local tier.
+    """
+    found: dict[UUID, str | None] = {}
+    remote_ids = []
+    for summary_id in summary_ids:
+        payload = summary_local_cache.get(summary_cache_key(summary_id))
+        found[summary_id] = payload
+        if payload is None:
+            remote_ids.append(summary_id)
+    
+    if remote_ids:
+        keys = [summary_cache_key(summary_id) for summary_id in remote_ids]
+        for summary_id, key, payload in zip(remote_ids, keys, await redis.mget(keys)):
+            if payload is not None:
+                summary_local_cache.set(key, payload)
+                found[summary_id] = payload
+    return found
+
+
+async def cache_summary(redis: Redis, summary_id: UUID | str, payload: str) -> None:
+    """Store a serialized ``SummaryResponse`` in both cache tiers."""
+    key = summary_cache_key(summary_id)
+    await redis.setex(key, settings.redis_ttl_seconds, payload)
+    summary_local_cache.set(key, payload)
+
+
+async def cache_summaries(redis: Redis, payloads: dict[UUID, str]) -> None:
+    """Store several serialized responses in both tiers with one pipelined round trip."""
+    if not payloads:
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        for summary_id, payload in payloads.items():
+            pipe.setex(summary_cache_key(summary_id), settings.redis_ttl_seconds, payload)
+        await pipe.execute()
+    for summary_id, payload in payloads.items():
+        summary_local_cache.set(summary_cache_key(summary_id), payload)
+
+
+async def invalidate_summary(redis: Redis, summary_id: UUID | str) -> None:
+    """Drop the cached response for a summary in every tier and every worker."""
+    key = summary_cache_key(summary_id)
+    summary_local_cache.invalidate(key)
+    await redis.delete(key)
+    await redis.publish(settings.cache_invalidation_channel, key)
+
+
+def apply_invalidation_message(message: dict) -> None:
+    """Evict the local entry named by a pub/sub invalidation message."""
+    if message.get("type") == "message":
+        summary_local_cache.invalidate(message["data"])
+
+
+async def listen_for_invalidations(redis: Redis, retry_delay_seconds: float = 1.0) -> None:
+    """
+    Subscribe to the invalidation channel until cancelled.
+    
+    The local tier is cleared whenever the subscription is (re)established,
+    since messages published while disconnected are lost. Entries that slip
+    through are still bounded by ``settings.local_cache_ttl_seconds``.
+    """
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(settings.cache_invalidation_channel)
+            summary_local_cache.clear()
+            async for message in pubsub.listen():
+                apply_invalidation_message(message)
+        except asyncio.CancelledError:
+            raise
+        except RedisError as exc:
+            logger.warning("Cache invalidation subscription lost: %s", exc)
+            await asyncio.sleep(retry_delay_seconds)
+        finally:
+            await pubsub.reset()
@@ -0,0 +1,122 @@
+"""Version chains of document texts: periodic snapshots with line diffs in between."""
+import asyncio
+import difflib
+import json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.database import Document, Summary
+from app.services.blob_store import BlobNotFoundError, get_blob_store
+from app.services.local_cache import LocalLRUCache
+
+# Texts are immutable per hash, so the TTL only bounds memory residency.
+version_text_cache = LocalLRUCache(
+    max_entries=settings.version_cache_max_entries,
+    max_bytes=settings.version_cache_max_bytes,
+    ttl_seconds=3600,
+)
+
+
+def diff_ops(base: str, text: str) -> list:
+    """
+    Line diff turning ``base`` into ``text``.
+    
+    Ops are ``[start, end]`` (copy base lines ``start:end``) or a string
+    (insert it verbatim).
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    ops: list = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(lines[j1:j2]))
+    return ops
+
+
+def apply_ops(base: str, ops: list) -> str:
+    """Inverse of ``diff_ops``."""
+    base_lines = base.splitlines(keepends=True)
+    return "".join(
+        "".join(base_lines[op[0]:op[1]]) if isinstance(op, list) else op
+        for op in ops
+    )
+
+
+async def load_text(content_hash: str) -> str:
+    """Reconstruct a stored text by applying its diffs to the nearest snapshot."""
+    store = get_blob_store()
+    deltas = []
+    key = content_hash
+    while (text := version_text_cache.get(key)) is None:
+        try:
+            text = await store.get_text(key)
+            break
+        except BlobNotFoundError:
+            key, ops = await store.get_delta(key)
+            deltas.append(ops)
+    
+    for ops in reversed(deltas):
+        text = apply_ops(text, ops)
+    version_text_cache.set(content_hash, text)
+    return text
+
+
+async def load_document_text(document: Document) -> str:
+    """Full text of a document, from its version chain or a legacy inline column."""
+    raw_content = await document.awaitable_attrs.raw_content
+    if raw_content is not None:
+        return raw_content
+    return await load_text(document.content_hash)
+
+
+async def store_document_text(
+    db: AsyncSession,
+    url: str,
+    service_name: str,
+    document_type: str,
+    content_hash: str,
+    text: str,
+) -> tuple[str | None, int]:
+    """
+    Write a new version of a document to the blob store.
+    
+    The text is stored as a diff against the previous version of the same
+    (service, document type, URL) chain, or as a full snapshot every
+    ``settings.version_snapshot_interval`` versions and whenever the diff
+    would not be compact. Returns ``(base_content_hash, chain_depth)`` for
+    the new ``Document`` row.
+    """
+    store = get_blob_store()
+    if await store.exists(content_hash):
+        existing = await db.scalar(
+            select(Document).where(Document.content_hash == content_hash, Document.raw_content.is_(None)).limit(1)
+        )
+        if existing is not None:
+            return existing.base_content_hash, existing.chain_depth
+    
+    previous = await db.scalar(
+        select(Document)
+        .join(Summary, Summary.document_id == Document.id)
+        .where(
+            Document.url == url,
+            Document.service_name == service_name,
+            Document.document_type == document_type,
+            Document.raw_content.is_(None),
+        )
+        .order_by(Summary.version.desc())
+        .limit(1)
+    )
+    if previous is not None and previous.chain_depth + 1 < settings.version_snapshot_interval:
+        base = await load_text(previous.content_hash)
+        ops = await asyncio.to_thread(diff_ops, base, text)
+        if len(json.dumps(ops)) <= len(text) * settings.version_delta_max_ratio:
+            await store.put_delta(content_hash, previous.content_hash, ops)
+            version_text_cache.set(content_hash, text)
+            return previous.content_hash, previous.chain_depth + 1
+    
+    await store.put_text(content_hash, text)
+    version_text_cache.set(content_hash, text)
+    return None, 0
@@ -0,0 +1,210 @@
+"""Streaming HTML-to-text extraction with boilerplate removal.
+
+The parser is event driven (lxml's target interface), so no document tree is
+ever built: memory is bounded by the text kept, not by the size of the page.
+Output is one block per paragraph, separated by blank lines; headings become
+``#``-prefixed blocks and list items ``-``-prefixed ones. Text is normalized
+deterministically, so cosmetic markup changes do not change the text (and
+with it ``content_hash``).
+"""
+import re
+import unicodedata
+from typing import Iterable, Iterator
+from lxml import etree
+
+# Elements whose content is never document text
+SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "footer", "aside", "form", "button", "select", "dialog", "head",
+})
+# Elements that end a block
+BLOCK_TAGS = frozenset({
+    "p", "div", "section", "article", "main", "header", "ul", "ol", "li", "table",
+    "tr", "br", "hr", "blockquote", "pre", "dd", "dt", "dl", "figcaption", "address",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+})
+HEADING_LEVELS = {f"h{level}": level for level in range(1, 7)}
+SKIP_ROLES = frozenset({"navigation", "banner", "contentinfo", "dialog", "alertdialog", "search"})
+# Content containers: their id/class often names the topic ("cookies",
+# "gdpr-rights", "social-media-data"), so it is never read as boilerplate.
+CONTENT_TAGS = frozenset({"main", "article", "section"})
+# id/class words marking boilerplate containers. A name only marks boilerplate
+# when all of its words are boilerplate or decoration words, so "social-links"
+# is skipped but "social-media-data" is not.
+BOILERPLATE_TOKENS = frozenset({
+    "nav", "navbar", "navigation", "menu", "breadcrumb", "breadcrumbs", "sidebar",
+    "footer", "share", "social", "newsletter", "popup", "modal", "skip",
+})
+DECORATION_TOKENS = frozenset({
+    "site", "main", "global", "primary", "secondary", "top", "bottom", "mobile", "desktop",
+    "wrapper", "wrap", "container", "inner", "bar", "links", "link", "buttons", "button",
+    "icons", "widget", "list", "area", "box", "to", "content", "js",
+})
+# Consent banners: a consent word together with an overlay word in one name
+# (e.g. "cookie-banner", "onetrust-banner-sdk"), or a known consent manager.
+CONSENT_TOKENS = frozenset({"cookie", "cookies", "consent", "gdpr", "onetrust", "cmp"})
+OVERLAY_TOKENS = frozenset({
+    "banner", "bar", "notice", "notification", "popup", "modal", "overlay", "dialog",
+    "prompt", "sdk", "wall", "window",
+})
+CONSENT_MANAGER_NAMES = frozenset({"cybotcookiebotdialog", "cc-window", "qc-cmp2-container"})
+_FIXED_POSITION = re.compile(r"position\s*:\s*(fixed|sticky)", re.I)
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+_PUNCTUATION = str.maketrans({
+    "‘": "'", "’": "'", "‚": "'", "‛": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "―": "-",
+    "­": None, "​": None, "‌": None, "‍": None, "﻿": None,
+})
+
+FEED_CHUNK_CHARS = 64 * 1024
+
+
+def normalize_text(text: str) -> str:
+    """Deterministic normalization: NFKC, plain quotes and dashes, single spaces."""
+    text = unicodedata.normalize("NFKC", text).translate(_PUNCTUATION)
+    return " ".join(text.split())
+
+
+def is_boilerplate(tag: str, attrib) -> bool:
+    """Whether an element (and everything inside it) is page chrome rather than document text."""
+    if tag in SKIP_TAGS:
+        return True
+    if "hidden" in attrib or attrib.get("aria-hidden") == "true":
+        return True
+    if attrib.get("role", "").lower() in SKIP_ROLES or attrib.get("aria-modal") == "true":
+        return True
+    if tag in CONTENT_TAGS:
+        return False
+    names = f"{attrib.get('id', '')} {attrib.get('class', '')}".lower().split()
+    fixed = bool(_FIXED_POSITION.search(attrib.get("style", "")))
+    for name in names:
+        if name in CONSENT_MANAGER_NAMES:
+            return True
+        words = set(_TOKEN_SPLIT.split(name)) - {""}
+        if words & CONSENT_TOKENS and (words & OVERLAY_TOKENS or fixed):
+            return True
+        if words & BOILERPLATE_TOKENS and words <= BOILERPLATE_TOKENS | DECORATION_TOKENS:
+            return True
+    return False
+
+
+class _Target:
+    """lxml parser target collecting text blocks."""
+    
+    def __init__(self):
+        self.blocks: list[str] = []
+        self.title_parts: list[str] = []
+        self._last_block = ""
+        self._current: list[str] = []
+        self._prefix = ""
+        self._skipping: list[bool] = []  # per open element: inside boilerplate?
+        self._in_title = False
+    
+    def _end_block(self) -> None:
+        text = normalize_text("".join(self._current))
+        if text:
+            block = f"{self._prefix}{text}"
+            # Repeated adjacent blocks (e.g. duplicated mobile/desktop markup) are kept once.
+            if block != self._last_block:
+                self.blocks.append(block)
+                self._last_block = block
+        self._current = []
+        self._prefix = ""
+    
+    def start(self, tag, attrib):
+        if not isinstance(tag, str):
+            return
+        if tag == "title":
+            self._in_title = True
+        inherited = bool(self._skipping and self._skipping[-1])
+        skipping = inherited or (tag not in ("html", "body") and is_boilerplate(tag, attrib))
+        self._skipping.append(skipping)
+        if skipping:
+            return
+        if tag in BLOCK_TAGS:
+            self._end_block()
+            if tag in HEADING_LEVELS:
+                self._prefix = "#" * HEADING_LEVELS[tag] + " "
+            elif tag == "li":
+                self._prefix = "- "
+        elif tag in ("td", "th"):
+            self._current.append(" ")
+    
+    def end(self, tag):
+        if not isinstance(tag, str):
+            return
+        if tag == "title":
+            self._in_title = False
+        skipping = self._skipping.pop() if self._skipping else False
+        if not skipping and tag in BLOCK_TAGS:
+            self._end_block()
+    
+    def data(self, data):
+        if self._in_title:
+            self.title_parts.append(data)
+        elif not (self._skipping and self._skipping[-1]):
+            self._current.append(data)
+    
+    def close(self):
+        self._end_block()
+
+
+class HTMLTextExtractor:
+    """
+    Incremental HTML-to-text extractor.
+    
+    ``feed`` chunks of markup as they arrive; it returns the blocks completed
+    so far, which the caller may consume and drop. Byte chunks are decoded
+    as ``encoding``, or as declared by the document when it is ``None``.
+    """
+    
+    def __init__(self, encoding: str | None = None):
+        self._target = _Target()
+        self._parser = etree.HTMLParser(
+            target=self._target,
+            encoding=encoding,
+            recover=True,
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True,
+        )
+        self._closed = False
+    
+    def feed(self, chunk: str | bytes) -> list[str]:
+        self._parser.feed(chunk)
+        return self._take()
+    
+    def close(self) -> list[str]:
+        if not self._closed:
+            self._closed = True
+            self._parser.close()
+        return self._take()
+    
+    @property
+    def title(self) -> str:
+        return normalize_text("".join(self._target.title_parts))
+    
+    def _take(self) -> list[str]:
+        blocks = self._target.blocks
+        self._target.blocks = []
+        return blocks
+
+
+def iter_text_blocks(chunks: Iterable[str | bytes]) -> Iterator[str]:
+    """Text blocks of an HTML document given as a stream of chunks."""
+    extractor = HTMLTextExtractor()
+    for chunk in chunks:
+        yield from extractor.feed(chunk)
+    yield from extractor.close()
+
+
+def parse_html(html: str) -> tuple[str, str]:
+    """Extract ``(title, text)`` from an HTML document."""
+    extractor = HTMLTextExtractor()
+    blocks = []
+    for start in range(0, len(html), FEED_CHUNK_CHARS):
+        blocks.extend(extractor.feed(html[start:start + FEED_CHUNK_CHARS]))
+    blocks.extend(extractor.close())
+    return extractor.title, "\n\n".join(blocks)
@@ -0,0 +1,51 @@
+"""Readability metrics for extracted documents."""
+import re
+
+_WORD_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?")
+_SENTENCE_RE = re.compile(r"[.!?]+(?:\s|$)")
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+
+
+def word_count(text: str) -> int:
+    """Number of whitespace-separated words."""
+    return len(text.split())
+
+
+def _syllables(word: str) -> int:
+    word = word.lower()
+    count = len(_VOWEL_GROUP_RE.findall(word))
+    if word.endswith("e") and not word.endswith("le") and count > 1:
+        count -= 1
+    return max(count, 1)
+
+
+def flesch_scores(text: str) -> tuple[float, float]:
+    """Return (Flesch reading ease, Flesch-Kincaid grade level) for ``text``."""
+    words = _WORD_RE.findall(text)
+    if not words:
+        return 100.0, 0.0
+    sentences = max(len(_SENTENCE_RE.findall(text)), 1)
+    syllables = sum(_syllables(word) for word in words)
+    words_per_sentence = len(words) / sentences
+    syllables_per_word = syllables / len(words)
+    ease = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+    grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+    return ease, grade
+
+
+def clarity_score(text: str) -> int:
+    """Flesch reading ease clamped to the 0-100 range used by ``Summary.clarity_score``."""
+    ease, _ = flesch_scores(text)
+    return int(min(max(round(ease), 0), 100))
+
+
+def reading_level(text: str) -> str:
+    """Coarse education level needed to read ``text``, as stored in ``Summary.reading_level``."""
+    _, grade = flesch_scores(text)
+    if grade <= 8:
+        return "Middle School"
+    if grade <= 12:
+        return "High School"
+    if grade <= 16:
+        return "College"
+    return "Graduate"
@@ -0,0 +1,149 @@
+"""Analysis job worker.
+
+Workers run as separate processes from the API and can be scaled on their own:
+
+    poetry run python -m app.worker --processes 2 --concurrency 8
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+from typing import Awaitable, Callable
+from redis.asyncio import Redis
+from app.api.dependencies import AsyncSessionLocal, get_redis
+from app.config import settings
+from app.services.analysis import run_analysis
+from app.services.browser import close_browser_pool
+from app.services.model_client import close_model_client
+from app.services.parsing import close_parser_pool
+from app.services.response_cache import maintain_response_cache
+from app.services.job_queue import (
+    AnalysisJob,
+    ack_job,
+    fail_job,
+    handler_timeout_seconds,
+    promote_delayed_jobs,
+    requeue_expired_jobs,
+    reserve_job,
+)
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AnalysisJob, Redis], Awaitable[None]]
+
+
+async def _consume(redis: Redis, handler: JobHandler, stop: asyncio.Event) -> None:
+    """Reserve and run jobs one at a time until ``stop`` is set."""
+    while not stop.is_set():
+        job = await reserve_job(redis)
+        if job is None:
+            # Yield even if the broker answered immediately, so other consumers get a turn.
+            await asyncio.sleep(0)
+            continue
+        try:
+            # Give up before the visibility deadline, so the job is never redelivered while running.
+            await asyncio.wait_for(handler(job, redis), handler_timeout_seconds())
+        except Exception as exc:
+            logger.exception("Job %s failed (attempt %d)", job.job_id, job.attempts + 1)
+            await fail_job(redis, job, repr(exc))
+        else:
+            await ack_job(redis, job)
+
+
+async def _maintain_response_cache() -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            evicted = await maintain_response_cache(db)
+    except Exception:
+        logger.exception("Model response cache maintenance failed")
+        return
+    if evicted:
+        logger.info("Evicted %d model responses", evicted)
+
+
+async def _maintain(redis: Redis, stop: asyncio.Event, interval_seconds: float) -> None:
+    """
+    Periodically promote due retries and reclaim expired reservations, and
+    flush cache hits and evict model responses every
+    ``settings.model_cache_maintenance_interval_seconds``.
+    """
+    loop = asyncio.get_running_loop()
+    cache_maintained_at = loop.time()
+    while not stop.is_set():
+        await promote_delayed_jobs(redis)
+        await requeue_expired_jobs(redis)
+        if loop.time() - cache_maintained_at >= settings.model_cache_maintenance_interval_seconds:
+            await _maintain_response_cache()
+            cache_maintained_at = loop.time()
+        try:
+            await asyncio.wait_for(stop.wait(), interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_worker(
+    redis: Redis,
+    handler: JobHandler = run_analysis,
+    concurrency: int | None = None,
+    stop: asyncio.Event | None = None,
+    maintenance_interval_seconds: float = 1.0,
+) -> None:
+    """Run ``concurrency`` consumers plus the maintenance loop until ``stop`` is set."""
+    stop = stop or asyncio.Event()
+    concurrency = concurrency or settings.worker_concurrency
+    await asyncio.gather(
+        _maintain(redis, stop, maintenance_interval_seconds),
+        *(_consume(redis, handler, stop) for _ in range(concurrency)),
+    )
+
+
+async def _serve(concurrency: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    redis = await get_redis()
+    logger.info("Worker started with concurrency %d", concurrency)
+    try:
+        await run_worker(redis, concurrency=concurrency, stop=stop)
+    finally:
+        await _maintain_response_cache()  # Write back the last cache hits
+        await close_browser_pool()
+        await close_model_client()
+        close_parser_pool()
+
+
+def _run_process(concurrency: int) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve(concurrency))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run analysis job workers.")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.worker_concurrency,
+        help="concurrent jobs per process",
+    )
+    args = parser.parse_args(argv)
+    
+    if args.processes == 1:
+        _run_process(args.concurrency)
+        return
+    
+    processes = [
+        multiprocessing.Process(target=_run_process, args=(args.concurrency,))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,88 @@
 """Pytest configuration and fixtures."""
+import hashlib
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fakeredis.aioredis import FakeRedis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 from redis.asyncio import Redis
 from app.main import app
-from app.models.database import Base
+from app.models.database import Base, Document, Summary
 from app.api.dependencies import get_db, get_redis
 from app.config import settings
+from app.services.blob_store import get_blob_store
+from app.services.local_cache import summary_local_cache
+from app.services.response_cache import pending_touches
+from app.services.version_chain import version_text_cache
 
-# Test database URL (in-memory SQLite for tests)
-TEST_DATABASE_URL = "sqlite:///:memory:"
+# Test database URL (in-memory SQLite for tests, via the aiosqlite driver)
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 # Create test engine
-test_engine = create_engine(
+test_engine = create_async_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+TestingSessionLocal = async_sessionmaker(
+    bind=test_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
 @pytest.fixture
-def db_session():
+async def db_session():
     """Create a test database session."""
-    Base.metadata.create_all(bind=test_engine)
-    db = TestingSessionLocal()
-    try:
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
-    Base.metadata.drop_all(bind=test_engine)
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Start every test with empty in-process cache tiers."""
+    summary_local_cache.clear()
+    version_text_cache.clear()
+    pending_touches.clear()
+    yield
+    summary_local_cache.clear()
+    version_text_cache.clear()
+    pending_touches.clear()
+
+
+@pytest.fixture(autouse=True)
+def blob_store(tmp_path, monkeypatch):
+    """Keep document blobs in a per-test directory."""
+    monkeypatch.setattr(settings, "blob_store_backend", "local")
+    monkeypatch.setattr(settings, "blob_store_path", str(tmp_path / "blobs"))
+    get_blob_store.cache_clear()
+    yield get_blob_store()
+    get_blob_store.cache_clear()
 
 
 @pytest.fixture
-def client(db_session):
-    """Create a test client with database override."""
-    def override_get_db():
+def mock_redis():
+    """In-memory Redis (fakeredis) client shared by the app and the test."""
+    redis_client = FakeRedis(decode_responses=True)
+    
+    async def override_get_redis():
+        return redis_client
+    
+    app.dependency_overrides[get_redis] = override_get_redis
+    yield redis_client
+    app.dependency_overrides.pop(get_redis, None)
+
+
+@pytest.fixture
+def client(db_session, mock_redis):
+    """Create a test client with database and Redis overrides."""
+    async def override_get_db():
         try:
             yield db_session
         finally:
@@ -49,27 +93,63 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
-@pytest.fixture
-async def mock_redis():
-    """Mock Redis client for testing."""
-    # In a real test, you might use fakeredis or a test Redis instance
-    # For now, we'll just override the dependency
-    class MockRedis:
-        async def ping(self):
-            return True
-        
-        async def setex(self, key, ttl, value):
-            return True
-        
-        async def get(self, key):
-            return None
-        
-        async def delete(self, key):
-            return True
-    
-    async def override_get_redis():
-        return MockRedis()
-    
-    app.dependency_overrides[get_redis] = override_get_redis
-    yield MockRedis()
-    app.dependency_overrides.clear()
+def make_flag(category: str, severity: str) -> dict:
+    """A red flag item of ``category`` and ``severity``."""
+    return {
+        "severity": severity,
+        "category": category,
+        "title": "Flag",
+        "explanation": "Explanation",
+        "source_quote": "Quote",
+    }
+
+
+def make_rule(category: str) -> dict:
+    """A rule item of ``category``."""
+    return {"category": category, "title": "Rule", "description": "Description"}
+
+
+def make_concession(category: str, can_opt_out: bool) -> dict:
+    """A concession item of ``category``."""
+    return {
+        "category": category,
+        "title": "Concession",
+        "what_you_give": "Data",
+        "why_they_want_it": "Ads",
+        "can_opt_out": can_opt_out,
+    }
+
+
+def make_document(service_name: str, url: str | None = None) -> Document:
+    """An unsaved terms of service document of ``service_name``."""
+    content = f"{service_name} terms"
+    return Document(
+        url=url or f"https://{service_name.lower()}.com/tos",
+        service_name=service_name,
+        document_type="tos",
+        raw_content=content,
+        content_hash=hashlib.sha256(content.encode()).hexdigest(),
+    )
+
+
+def make_summary(
+    document: Document,
+    version: int = 1,
+    red_flags=(),
+    rules=(),
+    concessions=(),
+    clarity_score: int = 60,
+) -> Summary:
+    """An unsaved summary of ``document`` with the given items."""
+    return Summary(
+        document=document,
+        version=version,
+        red_flags=list(red_flags),
+        rules=list(rules),
+        concessions=list(concessions),
+        clarity_score=clarity_score,
+        reading_level="College",
+        original_word_count=1000,
+        summary_word_count=200,
+        model_version="claude-3-5-sonnet-20241022",
+    )
@@ -0,0 +1,337 @@
+"""Tests for the analysis pipeline."""
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+from uuid import uuid4
+from sqlalchemy import select
+from app.config import settings
+from app.models.database import Summary
+from app.services import analysis
+from app.services.dedup import content_hash
+from app.services.extraction import ExtractedDocument
+from app.services.fetcher import FetchedPage
+from app.services.job_queue import AnalysisJob
+from app.services.sections import read_sections
+from app.utils.readability import clarity_score, reading_level
+from tests.conftest import TestingSessionLocal
+
+URL = "https://example.com/tos"
+RED_FLAG = {
+    "severity": "critical",
+    "category": "arbitration",
+    "title": "Mandatory Arbitration",
+    "explanation": "You waive your right to a jury trial",
+    "source_quote": "All disputes must be resolved through arbitration",
+}
+
+
+@pytest.fixture
+def pipeline(monkeypatch, db_session):
+    """Run the pipeline against the test database with fake extraction and model calls."""
+    monkeypatch.setattr(analysis, "AsyncSessionLocal", TestingSessionLocal)
+    document_text = {"text": "You agree to these terms. We may change them at any time.", "analyzed": []}
+    
+    async def fetch(client, url):
+        return FetchedPage(url=url, status_code=200, content_type="text/html", encoding=None, content=b"")
+    
+    async def extract(url, page):
+        text = document_text["text"]
+        return ExtractedDocument(
+            url=url,
+            service_name="Example",
+            document_type="tos",
+            text=text,
+            content_hash=content_hash(text),
+        )
+    
+    async def analyze_section(document, section):
+        document_text["analyzed"].append(document.text)
+        # Red flags finish first, concessions last.
+        await asyncio.sleep({"red_flags": 0, "rules": 0.05, "concessions": 0.1}[section])
+        return [RED_FLAG] if section == "red_flags" else []
+    
+    monkeypatch.setattr(analysis, "fetch_page", fetch)
+    monkeypatch.setattr(analysis, "extract_page", extract)
+    monkeypatch.setattr(analysis, "analyze_section", analyze_section)
+    return document_text
+
+
+async def test_run_analysis_stores_summary(pipeline, mock_redis, db_session):
+    """Test that a full run stores a summary and publishes every section."""
+    job = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(job, mock_redis)
+    
+    summary = await db_session.scalar(select(Summary).where(Summary.id == job.summary_id))
+    assert summary.version == 1
+    assert summary.red_flags == [RED_FLAG]
+    assert summary.original_word_count == 12
+    assert summary.summary_word_count > 0
+    
+    sections = await read_sections(mock_redis, job.job_id)
+    assert [s.section for s in sections] == ["red_flags", "rules", "concessions"]
+
+
+async def test_progress_reported_per_step(pipeline, mock_redis, monkeypatch):
+    """Test that the job status moves through fetched, extracted and analyzing."""
+    statuses = []
+    original = analysis.set_job_status
+    
+    async def record(redis, job_id, status):
+        statuses.append(status)
+        await original(redis, job_id, status)
+    
+    monkeypatch.setattr(analysis, "set_job_status", record)
+    await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    
+    assert statuses == ["fetched", "extracted", "analyzing"]
+
+
+async def test_sections_published_as_they_finish(pipeline, mock_redis, monkeypatch):
+    """Test that sections are published in completion order, not all at the end."""
+    published = []
+    original = analysis.publish_section
+    
+    async def record(redis, job_id, section, items):
+        published.append(section)
+        await original(redis, job_id, section, items)
+    
+    monkeypatch.setattr(analysis, "publish_section", record)
+    await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    
+    assert published == ["red_flags", "rules", "concessions"]
+
+
+async def test_changed_content_creates_next_version(pipeline, mock_redis, db_session):
+    """Test that re-analyzing changed content continues the version sequence."""
+    first = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(first, mock_redis)
+    
+    pipeline["text"] = "You agree to these new terms."
+    await mock_redis.flushdb()
+    second = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(second, mock_redis)
+    
+    summary = await db_session.scalar(select(Summary).where(Summary.id == second.summary_id))
+    assert second.summary_id != first.summary_id
+    assert summary.version == 2
+
+
+async def test_no_session_held_across_fetch_and_model_calls(pipeline, mock_redis, monkeypatch):
+    """Test that database sessions are only open for the lookups and the final write."""
+    monkeypatch.setattr(settings, "model_cache_enabled", False)
+    open_sessions, seen = [], []
+    
+    @asynccontextmanager
+    async def session():
+        async with TestingSessionLocal() as db:
+            open_sessions.append(db)
+            try:
+                yield db
+            finally:
+                open_sessions.remove(db)
+    
+    fetch, analyze_section = analysis.fetch_page, analysis.analyze_section
+    
+    async def tracked_fetch(client, url):
+        seen.append(len(open_sessions))
+        return await fetch(client, url)
+    
+    async def tracked_analyze_section(document, section):
+        seen.append(len(open_sessions))
+        return await analyze_section(document, section)
+    
+    monkeypatch.setattr(analysis, "AsyncSessionLocal", session)
+    monkeypatch.setattr(analysis, "fetch_page", tracked_fetch)
+    monkeypatch.setattr(analysis, "analyze_section", tracked_analyze_section)
+    
+    await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    pipeline["text"] += "\n\nWe may also end your account."
+    await mock_redis.flushdb()
+    second = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(second, mock_redis)
+    
+    assert second.summary_id is not None
+    assert len(seen) == 8
+    assert not any(seen)
+    assert not open_sessions
+
+
+async def test_small_edit_reanalyzes_changed_clauses_only(pipeline, mock_redis, db_session):
+    """Test that a re-scan only sends changed clauses to the model and carries the rest over."""
+    clauses = [f"Clause {i}. We may use your content for purpose {i}." for i in range(10)]
+    pipeline["text"] = "\n\n".join(clauses + [RED_FLAG["source_quote"] + "."])
+    first = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(first, mock_redis)
+    
+    clauses[4] = "Clause 4. We may sell your content."
+    pipeline["text"] = "\n\n".join(clauses + [RED_FLAG["source_quote"] + "."])
+    pipeline["analyzed"].clear()
+    await mock_redis.flushdb()
+    second = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(second, mock_redis)
+    
+    assert pipeline["analyzed"] == ["Clause 4. We may sell your content."] * 3
+    first_summary = await db_session.scalar(select(Summary).where(Summary.id == first.summary_id))
+    summary = await db_session.scalar(select(Summary).where(Summary.id == second.summary_id))
+    assert summary.version == 2
+    # The arbitration flag quotes an unchanged clause, so it is carried over
+    # once rather than duplicated by the re-analysis.
+    assert summary.red_flags == [RED_FLAG]
+    assert summary.provenance == first_summary.provenance
+    
+    sections = await read_sections(mock_redis, second.job_id)
+    assert [s.items for s in sections if s.section == "red_flags"] == [[RED_FLAG]]
+
+
+async def test_replaced_clause_drops_its_rule(pipeline, mock_redis, db_session, monkeypatch):
+    """Test that a rule from a replaced clause is not carried into the next version."""
+    clauses = [f"Clause {i}. We may use your content for purpose {i}." for i in range(10)]
+    arbitration, small_claims = "Disputes go to binding arbitration.", "Disputes go to small claims court."
+    rules = {
+        quote: {"category": "disputes", "title": title, "description": "d", "source_quote": quote}
+        for quote, title in ((arbitration, "Binding arbitration"), (small_claims, "Small claims"))
+    }
+    
+    async def analyze_section(document, section):
+        pipeline["analyzed"].append(document.text)
+        return [rule for quote, rule in rules.items() if quote in document.text] if section == "rules" else []
+    
+    monkeypatch.setattr(analysis, "analyze_section", analyze_section)
+    pipeline["text"] = "\n\n".join(clauses + [arbitration])
+    await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    
+    pipeline["text"] = "\n\n".join(clauses + [small_claims])
+    pipeline["analyzed"].clear()
+    await mock_redis.flushdb()
+    job = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(job, mock_redis)
+    
+    assert pipeline["analyzed"] == [small_claims] * 3
+    summary = await db_session.scalar(select(Summary).where(Summary.id == job.summary_id))
+    assert summary.rules == [rules[small_claims]]
+
+
+async def test_unattributed_items_force_full_reanalysis(pipeline, mock_redis, monkeypatch):
+    """Test that items without a traceable quote make a changed document fully re-analyzed."""
+    clauses = [f"Clause {i}. We may use your content for purpose {i}." for i in range(10)]
+    
+    async def analyze_section(document, section):
+        pipeline["analyzed"].append(document.text)
+        return [{"category": "content", "title": "Content", "description": "d"}] if section == "rules" else []
+    
+    monkeypatch.setattr(analysis, "analyze_section", analyze_section)
+    pipeline["text"] = "\n\n".join(clauses)
+    await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    
+    clauses[4] = "Clause 4. We may sell your content."
+    pipeline["text"] = "\n\n".join(clauses)
+    pipeline["analyzed"].clear()
+    await mock_redis.flushdb()
+    await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    
+    assert pipeline["analyzed"] == [pipeline["text"]] * 3
+
+
+async def test_long_document_analyzed_in_concurrent_chunks(pipeline, mock_redis, db_session, monkeypatch):
+    """Test map-reduce over chunks analyzed concurrently."""
+    monkeypatch.setattr(settings, "analysis_chunk_max_tokens", 50)
+    pipeline["text"] = "\n\n".join(
+        f"# Part {i}\n\nClause {i}. {RED_FLAG['source_quote']}." for i in range(6)
+    )
+    calls = {"active": 0, "peak": 0, "chunks": []}
+    
+    async def analyze_section(document, section):
+        calls["active"] += 1
+        calls["peak"] = max(calls["peak"], calls["active"])
+        calls["chunks"].append(document.text)
+        await asyncio.sleep(0.01)
+        calls["active"] -= 1
+        if section != "red_flags":
+            return []
+        # Every chunk reports the same quote; the merge keeps one.
+        return [RED_FLAG, dict(RED_FLAG, category="jury_waiver")]
+    
+    monkeypatch.setattr(analysis, "analyze_section", analyze_section)
+    job = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(job, mock_redis)
+    
+    assert calls["peak"] > 1
+    assert len(set(calls["chunks"])) > 1
+    summary = await db_session.scalar(select(Summary).where(Summary.id == job.summary_id))
+    assert summary.red_flags == [RED_FLAG, dict(RED_FLAG, category="jury_waiver")]
+
+
+async def test_failed_section_cancels_other_model_calls(pipeline, mock_redis, monkeypatch):
+    """Test that no model call of a failed job keeps running after it has failed."""
+    monkeypatch.setattr(settings, "analysis_chunk_max_tokens", 50)
+    pipeline["text"] = "\n\n".join(f"# Part {i}\n\nClause {i}. {RED_FLAG['source_quote']}." for i in range(4))
+    started, cancelled = [], []
+    
+    async def analyze_section(document, section):
+        started.append(section)
+        if section == "rules":
+            raise RuntimeError("model timeout")
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(section)
+            raise
+    
+    monkeypatch.setattr(analysis, "analyze_section", analyze_section)
+    with pytest.raises(RuntimeError, match="model timeout"):
+        await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    
+    assert "rules" in started
+    assert sorted(cancelled) == sorted(section for section in started if section != "rules")
+    assert {task for task in asyncio.all_tasks() if task is not asyncio.current_task()} == set()
+
+
+async def test_retry_reuses_cached_model_responses(pipeline, mock_redis, db_session, monkeypatch):
+    """Test that a retried job only calls the model for sections that failed."""
+    calls, stored = [], []
+    others_cached = asyncio.Event()
+    failures = ["concessions"]
+    original_store = analysis.store_response
+    
+    async def store_response(db, section, text, items):
+        await original_store(db, section, text, items)
+        stored.append(section)
+        if len(stored) == 2:
+            others_cached.set()
+    
+    async def analyze_section(document, section):
+        calls.append(section)
+        if section in failures:
+            failures.remove(section)
+            # Fail only once the other sections' responses are cached.
+            await others_cached.wait()
+            raise RuntimeError("model timeout")
+        return [RED_FLAG] if section == "red_flags" else []
+    
+    monkeypatch.setattr(analysis, "store_response", store_response)
+    monkeypatch.setattr(analysis, "analyze_section", analyze_section)
+    with pytest.raises(RuntimeError):
+        await analysis.run_analysis(AnalysisJob(job_id=uuid4(), url=URL), mock_redis)
+    assert sorted(stored) == ["red_flags", "rules"]
+    calls.clear()
+    
+    job = AnalysisJob(job_id=uuid4(), url=URL)
+    await analysis.run_analysis(job, mock_redis)
+    
+    assert calls == ["concessions"]
+    summary = await db_session.scalar(select(Summary).where(Summary.id == job.summary_id))
+    assert summary.red_flags == [RED_FLAG]
+
+
+def test_readability_metrics():
+    """Test that simple text scores as clearer than dense legalese."""
+    simple = "We keep your data safe. You can ask us to delete it."
+    dense = (
+        "Notwithstanding the foregoing, the indemnification obligations hereunder "
+        "shall survive termination, expiration or cancellation of this agreement "
+        "irrespective of the circumstances precipitating such termination."
+    )
+    assert clarity_score(simple) > clarity_score(dense)
+    assert 0 <= clarity_score(dense) <= 100
+    assert reading_level(simple) == "Middle School"
+    assert reading_level(dense) == "Graduate"
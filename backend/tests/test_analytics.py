@@ -0,0 +1,95 @@
+"""Tests for normalized section rows and aggregate analytics."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.database import SummaryConcession, SummaryRedFlag, SummaryRule
+from app.services.summaries import save_summary
+from tests.conftest import make_concession, make_document, make_flag, make_rule, make_summary
+
+
+@pytest.mark.asyncio
+async def test_save_summary_writes_section_rows(db_session: AsyncSession, mock_redis):
+    """Test that sections are mirrored into the child tables on save."""
+    summary = await save_summary(db_session, mock_redis, make_summary(
+        make_document("Chirp"),
+        1,
+        red_flags=[make_flag("arbitration", "critical"), make_flag("tracking", "info")],
+        rules=[make_rule("class_action_waiver")],
+        concessions=[make_concession("data_sharing", True)],
+    ))
+    
+    flags = (await db_session.scalars(
+        select(SummaryRedFlag).where(SummaryRedFlag.summary_id == summary.id).order_by(SummaryRedFlag.position)
+    )).all()
+    rules = (await db_session.scalars(select(SummaryRule))).all()
+    concessions = (await db_session.scalars(select(SummaryConcession))).all()
+    
+    assert [(f.position, f.category, f.severity) for f in flags] == [
+        (0, "arbitration", "critical"),
+        (1, "tracking", "info"),
+    ]
+    assert [r.category for r in rules] == ["class_action_waiver"]
+    assert [(c.category, c.can_opt_out) for c in concessions] == [("data_sharing", True)]
+
+
+@pytest.mark.asyncio
+async def test_section_rows_can_be_disabled(db_session: AsyncSession, mock_redis, monkeypatch):
+    """Test that the normalized store is optional."""
+    monkeypatch.setattr(settings, "normalized_sections_enabled", False)
+    
+    await save_summary(db_session, mock_redis, make_summary(
+        make_document("Chirp"), 1, red_flags=[make_flag("arbitration", "critical")]
+    ))
+    
+    assert (await db_session.scalars(select(SummaryRedFlag))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_analytics_counts_latest_summaries(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that aggregates count each service's latest summary only."""
+    old = await save_summary(db_session, mock_redis, make_summary(
+        make_document("Chirp"), 1, rules=[make_rule("class_action_waiver")]
+    ))
+    await save_summary(db_session, mock_redis, make_summary(
+        await old.awaitable_attrs.document, 2, rules=[make_rule("content")]
+    ))
+    await save_summary(db_session, mock_redis, make_summary(
+        make_document("Pixel"),
+        1,
+        red_flags=[make_flag("arbitration", "critical"), make_flag("arbitration", "critical")],
+        rules=[make_rule("class_action_waiver")],
+    ))
+    await save_summary(db_session, mock_redis, make_summary(
+        make_document("Forum"), 1, red_flags=[make_flag("arbitration", "warning")]
+    ))
+    
+    rules = client.get("/api/analytics/rules").json()
+    flags = client.get("/api/analytics/red_flags?document_type=tos").json()
+    
+    assert rules["total_services"] == 3
+    assert [(b["category"], b["services"], b["occurrences"]) for b in rules["buckets"]] == [
+        ("class_action_waiver", 1, 1),
+        ("content", 1, 1),
+    ]
+    assert [(b["category"], b["severity"], b["services"], b["occurrences"]) for b in flags["buckets"]] == [
+        ("arbitration", "critical", 1, 2),
+        ("arbitration", "warning", 1, 1),
+    ]
+    assert client.get("/api/analytics/unknown").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_analytics_counts_services_without_items(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that a service whose latest summary has no items still counts as a service."""
+    await save_summary(db_session, mock_redis, make_summary(make_document("Chirp"), 1, rules=[make_rule("content")]))
+    old = await save_summary(db_session, mock_redis, make_summary(
+        make_document("Quiet"), 1, rules=[make_rule("content")]
+    ))
+    await save_summary(db_session, mock_redis, make_summary(await old.awaitable_attrs.document, 2))
+    
+    rules = client.get("/api/analytics/rules").json()
+    
+    assert rules["total_services"] == 2
+    assert [(b["category"], b["services"], b["occurrences"]) for b in rules["buckets"]] == [("content", 1, 1)]
@@ -1,6 +1,7 @@
 """Tests for analyze API endpoint."""
 import pytest
 from fastapi.testclient import TestClient
+from app.services.job_queue import QUEUE_KEY, load_job
 
 
 def test_analyze_endpoint(client: TestClient):
@@ -44,3 +45,16 @@ def test_analyze_endpoint_missing_url(client: TestClient):
     )
     
     assert response.status_code == 422  # Validation error
+
+
+async def test_analyze_endpoint_enqueues_job(client: TestClient, mock_redis):
+    """Test that analyze only enqueues a job for the workers."""
+    response = client.post(
+        "/api/analyze",
+        json={"url": "https://www.youtube.com/static?template=terms", "options": {}},
+    )
+    job_id = response.json()["job_id"]
+    
+    assert await mock_redis.lrange(QUEUE_KEY, 0, -1) == [job_id]
+    job = await load_job(mock_redis, job_id)
+    assert job.url == "https://www.youtube.com/static?template=terms"
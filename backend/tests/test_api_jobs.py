@@ -0,0 +1,130 @@
+"""Tests for job status, long-poll and SSE endpoints."""
+import asyncio
+import json
+import time
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from app.services.job_events import enable_keyspace_events, watch_job
+from app.services.job_queue import AnalysisJob, ack_job, enqueue_job, reserve_job, set_job_status
+from app.services.sections import JobSection, publish_section
+
+URL = "https://example.com/tos"
+
+
+@pytest.fixture
+async def job(mock_redis):
+    """A queued job with keyspace notifications enabled."""
+    await enable_keyspace_events(mock_redis)
+    job = AnalysisJob(job_id=uuid4(), url=URL)
+    await enqueue_job(mock_redis, job)
+    return job
+
+
+def test_get_job_not_found(client: TestClient):
+    """Test that unknown jobs return 404."""
+    response = client.get(f"/api/jobs/{uuid4()}")
+    assert response.status_code == 404
+    
+    response = client.get(f"/api/jobs/{uuid4()}/events")
+    assert response.status_code == 404
+
+
+async def test_get_job_status(client: TestClient, job):
+    """Test that a job's current status is returned immediately without wait."""
+    response = client.get(f"/api/jobs/{job.job_id}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["job_id"] == str(job.job_id)
+    assert data["status"] == "processing"
+    assert data["summary_id"] is None
+    assert data["coalesced_callers"] == 0
+
+
+async def test_long_poll_returns_on_change(client: TestClient, job, mock_redis):
+    """Test that a long-poll wakes up when the job status changes."""
+    request = asyncio.create_task(
+        asyncio.to_thread(client.get, f"/api/jobs/{job.job_id}", params={"wait": 5})
+    )
+    await asyncio.sleep(0.2)
+    started = time.monotonic()
+    await set_job_status(mock_redis, job.job_id, "extracted")
+    response = await request
+    
+    assert response.json()["status"] == "extracted"
+    assert time.monotonic() - started < 2
+
+
+async def test_long_poll_times_out_without_change(client: TestClient, job):
+    """Test that a long-poll returns the unchanged status after the wait."""
+    started = time.monotonic()
+    response = client.get(f"/api/jobs/{job.job_id}", params={"wait": 0.3})
+    
+    assert response.json()["status"] == "processing"
+    assert time.monotonic() - started >= 0.3
+
+
+async def test_long_poll_since_stale_status(client: TestClient, job, mock_redis):
+    """Test that a client holding an older status gets the new one right away."""
+    await set_job_status(mock_redis, job.job_id, "analyzing")
+    
+    started = time.monotonic()
+    response = client.get(f"/api/jobs/{job.job_id}", params={"wait": 5, "since": "processing"})
+    
+    assert response.json()["status"] == "analyzing"
+    assert time.monotonic() - started < 2
+
+
+async def test_watch_job_yields_each_change(job, mock_redis):
+    """Test that watchers see every progress step through to completion."""
+    async def collect():
+        return [state.status async for state in watch_job(mock_redis, job.job_id, 5)]
+    
+    watcher = asyncio.create_task(collect())
+    await asyncio.sleep(0.1)
+    reserved = await reserve_job(mock_redis, timeout_seconds=0.1)
+    for status in ("extracted", "analyzing"):
+        await set_job_status(mock_redis, job.job_id, status)
+        await asyncio.sleep(0.05)
+    await ack_job(mock_redis, reserved)
+    
+    assert await asyncio.wait_for(watcher, 5) == ["processing", "extracted", "analyzing", "completed"]
+
+
+async def test_event_stream_closes_on_final_status(client: TestClient, job, mock_redis):
+    """Test that the SSE stream reports the final status and ends."""
+    reserved = await reserve_job(mock_redis, timeout_seconds=0.1)
+    await ack_job(mock_redis, reserved)
+    
+    response = client.get(f"/api/jobs/{job.job_id}/events")
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block for block in response.text.split("\n\n") if block]
+    assert len(events) == 1
+    assert events[0].startswith("event: status\ndata: ")
+    assert json.loads(events[0].split("data: ", 1)[1])["status"] == "completed"
+
+
+async def test_watch_job_streams_and_replays_sections(job, mock_redis):
+    """Test that stored sections are replayed and new ones streamed as they land."""
+    await publish_section(mock_redis, job.job_id, "red_flags", [{"title": "Arbitration"}])
+    
+    async def collect():
+        events = []
+        async for event in watch_job(mock_redis, job.job_id, 5, include_sections=True):
+            events.append(event.section if isinstance(event, JobSection) else event.status)
+        return events
+    
+    watcher = asyncio.create_task(collect())
+    await asyncio.sleep(0.1)
+    await publish_section(mock_redis, job.job_id, "rules", [])
+    await asyncio.sleep(0.05)
+    reserved = await reserve_job(mock_redis, timeout_seconds=0.1)
+    await publish_section(mock_redis, job.job_id, "concessions", [])
+    await ack_job(mock_redis, reserved)
+    
+    events = await asyncio.wait_for(watcher, 5)
+    assert events[:3] == ["processing", "red_flags", "rules"]
+    assert events[-1] == "completed"
+    assert "concessions" in events
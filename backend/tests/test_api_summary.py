@@ -1,9 +1,16 @@
 """Tests for summary API endpoint."""
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.models.database import Document, Summary
+from app.services.summaries import red_flag_filter, save_summary
+from app.services.summary_cache import summary_cache_key
+from tests.conftest import make_document, make_flag, make_summary
 import hashlib
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 
@@ -16,7 +23,7 @@ def test_get_summary_not_found(client: TestClient):
     assert "not found" in response.json()["detail"].lower()
 
 
-def test_get_summary_success(client: TestClient, db_session: Session):
+async def test_get_summary_success(client: TestClient, db_session: AsyncSession):
     """Test getting an existing summary."""
     # Create document
     content = "This is test content"
@@ -31,8 +38,8 @@ def test_get_summary_success(client: TestClient, db_session: Session):
     )
     
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     # Create summary
     summary = Summary(
@@ -73,8 +80,8 @@ def test_get_summary_success(client: TestClient, db_session: Session):
     )
     
     db_session.add(summary)
-    db_session.commit()
-    db_session.refresh(summary)
+    await db_session.commit()
+    await db_session.refresh(summary)
     
     # Get summary via API
     response = client.get(f"/api/summary/{summary.id}")
@@ -89,3 +96,161 @@ def test_get_summary_success(client: TestClient, db_session: Session):
     assert len(data["rules"]) == 1
     assert len(data["concessions"]) == 1
     assert "metadata" in data
+
+
+async def _create_summary(db_session: AsyncSession, clarity_score: int = 75) -> Summary:
+    """Insert a document with a single summary and return the summary."""
+    content = "This is test content"
+    document = Document(
+        url="https://example.com/tos",
+        service_name="Example Service",
+        document_type="tos",
+        raw_content=content,
+        content_hash=hashlib.sha256(content.encode()).hexdigest(),
+    )
+    db_session.add(document)
+    await db_session.commit()
+    
+    summary = Summary(
+        document_id=document.id,
+        version=1,
+        red_flags=[],
+        rules=[],
+        concessions=[],
+        clarity_score=clarity_score,
+        reading_level="High School",
+        original_word_count=1000,
+        summary_word_count=200,
+        model_version="claude-3-5-sonnet-20241022",
+    )
+    db_session.add(summary)
+    await db_session.commit()
+    await db_session.refresh(summary)
+    return summary
+
+
+async def test_get_summary_populates_cache(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that a summary read stores the serialized response in Redis."""
+    summary = await _create_summary(db_session)
+    
+    response = client.get(f"/api/summary/{summary.id}")
+    assert response.status_code == 200
+    
+    key = summary_cache_key(summary.id)
+    assert await mock_redis.get(key) == response.text
+    assert 0 < await mock_redis.ttl(key) <= settings.redis_ttl_seconds
+
+
+async def test_get_summary_served_from_cache(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that a cache hit is returned without touching the database."""
+    summary = await _create_summary(db_session)
+    first = client.get(f"/api/summary/{summary.id}")
+    
+    await db_session.delete(summary)
+    await db_session.commit()
+    
+    second = client.get(f"/api/summary/{summary.id}")
+    assert second.status_code == 200
+    assert second.content == first.content
+
+
+async def test_save_summary_invalidates_cache(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that writing a summary drops its cached response."""
+    summary = await _create_summary(db_session)
+    client.get(f"/api/summary/{summary.id}")
+    
+    summary.clarity_score = 90
+    await save_summary(db_session, mock_redis, summary)
+    
+    assert await mock_redis.get(summary_cache_key(summary.id)) is None
+    response = client.get(f"/api/summary/{summary.id}")
+    assert response.json()["clarity_score"] == 90
+
+
+async def test_batch_summaries(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test batch retrieval mixing cache hits, database hits and unknown ids."""
+    cached = await _create_summary(db_session, clarity_score=60)
+    uncached = await _create_summary(db_session, clarity_score=70)
+    unknown = uuid4()
+    client.get(f"/api/summary/{cached.id}")
+    
+    response = client.post(
+        "/api/summaries:batch",
+        json={"ids": [str(cached.id), str(uncached.id), str(unknown), str(cached.id)]},
+    )
+    
+    assert response.status_code == 200
+    summaries = response.json()["summaries"]
+    assert list(summaries) == [str(cached.id), str(uncached.id), str(unknown)]
+    assert summaries[str(cached.id)]["clarity_score"] == 60
+    assert summaries[str(uncached.id)]["clarity_score"] == 70
+    assert summaries[str(unknown)] is None
+    assert await mock_redis.get(summary_cache_key(uncached.id)) is not None
+
+
+async def test_batch_summaries_served_from_cache(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that a repeated batch is answered from the cache tiers."""
+    summary = await _create_summary(db_session)
+    first = client.post("/api/summaries:batch", json={"ids": [str(summary.id)]})
+    
+    await db_session.delete(summary)
+    await db_session.commit()
+    
+    second = client.post("/api/summaries:batch", json={"ids": [str(summary.id)]})
+    assert second.json() == first.json()
+
+
+def test_batch_summaries_limits(client: TestClient):
+    """Test that empty and oversized batches are rejected."""
+    assert client.post("/api/summaries:batch", json={"ids": []}).status_code == 422
+    
+    too_many = [str(uuid4()) for _ in range(settings.summary_batch_max_ids + 1)]
+    assert client.post("/api/summaries:batch", json={"ids": too_many}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_summaries_by_flag(client: TestClient, db_session: AsyncSession):
+    """Test that flag search matches category and severity on the latest versions only."""
+    chirp, pixel, forum = make_document("Chirp"), make_document("Pixel"), make_document("Forum")
+    month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    pixel_terms = make_summary(pixel, 1, [make_flag("arbitration", "warning")])
+    pixel_terms.generated_at = month_ago
+    db_session.add_all([
+        make_summary(chirp, 1, [make_flag("arbitration", "critical")]),
+        pixel_terms,
+        # Forum's newest version no longer has the flag
+        make_summary(forum, 1, [make_flag("arbitration", "critical")]),
+        make_summary(forum, 2, [make_flag("data_sharing", "critical")]),
+    ])
+    await db_session.commit()
+    
+    response = client.get("/api/summaries?flag_category=arbitration&flag_severity=critical")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["category"] == "arbitration"
+    assert data["severity"] == "critical"
+    assert [(r["service_name"], r["version"]) for r in data["results"]] == [("Chirp", 1)]
+    
+    any_severity = client.get("/api/summaries?flag_category=arbitration").json()
+    assert [r["service_name"] for r in any_severity["results"]] == ["Chirp", "Pixel"]
+    
+    # Pixel moved its terms: the new URL's first version supersedes the old URL's later ones
+    moved = make_document("Pixel", url="https://pixel.com/legal/terms")
+    earlier = make_summary(pixel, 3, [make_flag("arbitration", "critical")])
+    earlier.generated_at = month_ago
+    db_session.add_all([earlier, make_summary(moved, 1, [make_flag("data_sharing", "warning")])])
+    await db_session.commit()
+    
+    after_move = client.get("/api/summaries?flag_category=arbitration").json()
+    assert [r["service_name"] for r in after_move["results"]] == ["Chirp"]
+    
+    assert client.get("/api/summaries?flag_category=arbitration&flag_severity=bad").status_code == 422
+
+
+def test_red_flag_filter_uses_jsonb_containment():
+    """Test that Postgres gets an indexable containment query."""
+    query = select(Summary.id).where(red_flag_filter("postgresql", "arbitration", "critical"))
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    
+    assert "red_flags @>" in sql
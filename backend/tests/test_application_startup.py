@@ -8,6 +8,12 @@ from app.models.database import Base
 from tests.conftest import test_engine
 
 
+async def _inspect(fn):
+    """Run a sync inspector callable against the async test engine."""
+    async with test_engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: fn(inspect(sync_conn)))
+
+
 def test_app_creation():
     """Test that the FastAPI app is created correctly."""
     assert app is not None
@@ -108,39 +114,36 @@ def test_openapi_schema_available(client: TestClient):
     assert schema["info"]["version"] == "v1"
 
 
-def test_database_connection_pool(db_session):
+async def test_database_connection_pool(db_session):
     """Test that database connection pool is configured."""
     # Test that we can get a connection from the test engine
     assert test_engine is not None
     
     # Test that we can get a connection
-    with test_engine.connect() as conn:
-        result = conn.execute(text("SELECT 1"))
+    async with test_engine.connect() as conn:
+        result = await conn.execute(text("SELECT 1"))
         assert result.scalar() == 1
 
 
-def test_database_tables_created(db_session):
+async def test_database_tables_created(db_session):
     """Test that database tables are created."""
-    inspector = inspect(test_engine)
-    tables = inspector.get_table_names()
+    tables = await _inspect(lambda inspector: inspector.get_table_names())
     
     # Should have documents and summaries tables
     assert "documents" in tables
     assert "summaries" in tables
 
 
-def test_database_table_structure(db_session):
+async def test_database_table_structure(db_session):
     """Test that database tables have correct structure."""
-    inspector = inspect(test_engine)
-    
     # Check documents table columns
-    doc_columns = {col["name"] for col in inspector.get_columns("documents")}
+    doc_columns = {col["name"] for col in await _inspect(lambda i: i.get_columns("documents"))}
     expected_doc_columns = {"id", "url", "service_name", "document_type", 
                             "raw_content", "content_hash", "extracted_at"}
     assert expected_doc_columns.issubset(doc_columns)
     
     # Check summaries table columns
-    summary_columns = {col["name"] for col in inspector.get_columns("summaries")}
+    summary_columns = {col["name"] for col in await _inspect(lambda i: i.get_columns("summaries"))}
     expected_summary_columns = {"id", "document_id", "version", "red_flags", 
                                "rules", "concessions", "clarity_score", 
                                "reading_level", "original_word_count", 
@@ -148,10 +151,9 @@ def test_database_table_structure(db_session):
     assert expected_summary_columns.issubset(summary_columns)
 
 
-def test_database_foreign_key_constraint(db_session):
+async def test_database_foreign_key_constraint(db_session):
     """Test that foreign key constraint exists between summaries and documents."""
-    inspector = inspect(test_engine)
-    foreign_keys = inspector.get_foreign_keys("summaries")
+    foreign_keys = await _inspect(lambda i: i.get_foreign_keys("summaries"))
     
     # Should have foreign key to documents table
     fk_to_documents = [
@@ -163,16 +165,14 @@ def test_database_foreign_key_constraint(db_session):
     assert "document_id" in fk_to_documents[0]["constrained_columns"]
 
 
-def test_database_indexes_created(db_session):
+async def test_database_indexes_created(db_session):
     """Test that database indexes are created."""
-    inspector = inspect(test_engine)
-    
     # Check documents table indexes
-    doc_indexes = {idx["name"] for idx in inspector.get_indexes("documents")}
+    doc_indexes = {idx["name"] for idx in await _inspect(lambda i: i.get_indexes("documents"))}
     # Should have indexes on url, service_name, and content_hash
     assert len(doc_indexes) > 0
     
     # Check summaries table indexes
-    summary_indexes = {idx["name"] for idx in inspector.get_indexes("summaries")}
+    summary_indexes = {idx["name"] for idx in await _inspect(lambda i: i.get_indexes("summaries"))}
     # Should have index on document_id
     assert len(summary_indexes) > 0
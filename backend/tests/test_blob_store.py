@@ -0,0 +1,134 @@
+"""Tests for the content-addressed document blob store."""
+import io
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.database import Document
+from app.services.blob_store import (
+    BlobNotFoundError,
+    BlobStore,
+    LocalBlobStore,
+    S3BlobStore,
+    compress_text,
+    decompress_text,
+)
+from app.services.dedup import content_hash
+from app.services.extraction import ExtractedDocument
+from app.services.summaries import store_analysis
+from app.services.version_chain import load_document_text
+
+TEXT = "You agree to these terms. " * 200
+
+
+def test_compression_round_trip():
+    """Test that texts survive compression and repetitive texts shrink."""
+    data = compress_text(TEXT)
+    
+    assert decompress_text(data) == TEXT
+    assert len(data) < len(TEXT) // 10
+
+
+def test_backend_must_implement_primitives():
+    """Test that a backend missing a storage primitive cannot be instantiated."""
+    class ReadOnlyStore(BlobStore):
+        def _exists(self, name):
+            return False
+        
+        def _read(self, name):
+            raise BlobNotFoundError(name)
+    
+    with pytest.raises(TypeError, match="_write"):
+        ReadOnlyStore()
+
+
+async def test_local_store_writes_each_hash_once(tmp_path):
+    """Test that identical texts are stored once under their hash."""
+    store = LocalBlobStore(tmp_path)
+    key = content_hash(TEXT)
+    
+    assert await store.put_text(key, TEXT) is True
+    assert await store.put_text(key, TEXT) is False
+    assert await store.get_text(key) == TEXT
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [f"{key}.zst"]
+
+
+async def test_local_store_missing_and_invalid_keys(tmp_path):
+    """Test missing blobs and keys that are not content hashes."""
+    store = LocalBlobStore(tmp_path)
+    
+    with pytest.raises(BlobNotFoundError):
+        await store.get_text(content_hash("missing"))
+    with pytest.raises(ValueError):
+        await store.get_text("../../etc/passwd")
+
+
+class FakeS3Client:
+    """Local stand-in for the boto3 S3 client calls the store makes."""
+    
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+    
+    def __init__(self):
+        self.objects = {}
+    
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys):
+        keys = [key for (bucket, key) in self.objects if bucket == Bucket and key.startswith(Prefix)]
+        return {"KeyCount": min(len(keys), MaxKeys)}
+    
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+    
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[(Bucket, Key)] = Body
+
+
+async def test_s3_store_round_trip():
+    """Test the S3 backend against a local stand-in client."""
+    client = FakeS3Client()
+    store = S3BlobStore("tos", "documents/", client=client)
+    key = content_hash(TEXT)
+    
+    assert await store.put_text(key, TEXT) is True
+    assert await store.put_text(key, TEXT) is False
+    assert list(client.objects) == [("tos", f"documents/{key}.zst")]
+    assert await store.get_text(key) == TEXT
+    with pytest.raises(BlobNotFoundError):
+        await store.get_text(content_hash("missing"))
+
+
+async def test_store_analysis_references_blob(db_session: AsyncSession, mock_redis, blob_store):
+    """Test that documents reference a shared blob instead of inlining text."""
+    extracted = ExtractedDocument(
+        url="https://example.com/tos",
+        service_name="Example",
+        document_type="tos",
+        text=TEXT,
+        content_hash=content_hash(TEXT),
+    )
+    await store_analysis(db_session, mock_redis, extracted, {})
+    await store_analysis(db_session, mock_redis, extracted, {})
+    
+    documents = (await db_session.scalars(select(Document))).all()
+    assert len(documents) == 2
+    for document in documents:
+        assert await document.awaitable_attrs.raw_content is None
+        assert await load_document_text(document) == TEXT
+    assert len([p for p in blob_store.root.rglob("*.zst")]) == 1
+
+
+async def test_load_document_text_reads_legacy_rows(db_session: AsyncSession):
+    """Test that rows written before the blob store still load."""
+    document = Document(
+        url="https://example.com/tos",
+        service_name="Example",
+        document_type="tos",
+        raw_content="Inline text",
+        content_hash=content_hash("Inline text"),
+    )
+    db_session.add(document)
+    await db_session.commit()
+    
+    assert await load_document_text(document) == "Inline text"
@@ -0,0 +1,168 @@
+"""Tests for the headless browser pool."""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.services.browser import BrowserPool
+
+
+class FakeRoute:
+    def __init__(self, resource_type):
+        self.request = SimpleNamespace(resource_type=resource_type)
+        self.outcome = None
+    
+    async def abort(self):
+        self.outcome = "aborted"
+    
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.timeout = None
+    
+    def set_default_navigation_timeout(self, timeout):
+        self.timeout = timeout
+    
+    async def goto(self, url, wait_until):
+        self.url = url
+        # Let concurrent renders overlap
+        await asyncio.sleep(0.01)
+        routes = [FakeRoute(kind) for kind in ("document", "script", "image", "font", "media")]
+        for route in routes:
+            await self.context.handler(route)
+        self.context.browser.route_outcomes.append({r.request.resource_type: r.outcome for r in routes})
+    
+    async def content(self):
+        return f"<html><body>{self.url}</body></html>"
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.handler = None
+    
+    async def route(self, pattern, handler):
+        self.handler = handler
+    
+    async def new_page(self):
+        return FakePage(self)
+    
+    async def close(self):
+        self.browser.open_contexts -= 1
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.open_contexts = 0
+        self.peak_contexts = 0
+        self.closed = False
+        self.route_outcomes = []
+    
+    def is_connected(self):
+        return not self.closed
+    
+    async def new_context(self, **kwargs):
+        self.open_contexts += 1
+        self.peak_contexts = max(self.peak_contexts, self.open_contexts)
+        return FakeContext(self)
+    
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def launched():
+    return []
+
+
+@pytest.fixture
+def pool(launched):
+    async def launch():
+        browser = FakeBrowser()
+        launched.append(browser)
+        return browser
+    
+    return BrowserPool(launch=launch, size=2, contexts_per_browser=2, max_pages_per_browser=3)
+
+
+async def test_render_blocks_heavy_resources(pool, launched):
+    """Test that images, fonts and media are aborted and the rest continues."""
+    html = await pool.render("https://example.com/app")
+    
+    assert "https://example.com/app" in html
+    assert launched[0].route_outcomes == [{
+        "document": "continued",
+        "script": "continued",
+        "image": "aborted",
+        "font": "aborted",
+        "media": "aborted",
+    }]
+    assert launched[0].open_contexts == 0
+
+
+async def test_concurrency_bounded_and_browsers_reused(pool, launched):
+    """Test that renders share warm browsers within the concurrency ceiling."""
+    await asyncio.gather(*(pool.render(f"https://example.com/{i}") for i in range(4)))
+    
+    assert len(launched) == 2
+    assert all(browser.peak_contexts <= 2 for browser in launched)
+
+
+async def test_browsers_recycled_after_max_pages(pool, launched):
+    """Test that a browser is closed and replaced after N pages."""
+    for i in range(4):
+        await pool.render(f"https://example.com/{i}")
+    
+    assert len(launched) == 2
+    assert launched[0].closed and not launched[1].closed
+    
+    await pool.close()
+    assert launched[1].closed
+
+
+async def test_disconnected_browser_replaced(pool, launched):
+    """Test that a crashed browser is not handed out again."""
+    await pool.render("https://example.com/a")
+    launched[0].closed = True
+    await pool.render("https://example.com/b")
+    
+    assert len(launched) == 2
+
+
+async def test_retiring_browser_counts_toward_size(launched):
+    """Test that no replacement is launched while a retired browser still renders."""
+    live = []
+    
+    async def launch():
+        live.append(sum(not browser.closed for browser in launched) + 1)
+        browser = FakeBrowser()
+        launched.append(browser)
+        return browser
+    
+    pool = BrowserPool(launch=launch, size=1, contexts_per_browser=2, max_pages_per_browser=1)
+    await asyncio.gather(*(pool.render(f"https://example.com/{i}") for i in range(3)))
+    
+    assert len(launched) == 3
+    assert live == [1, 1, 1]
+
+
+async def test_browsers_launched_concurrently(launched):
+    """Test that a slow launch does not hold up other launches."""
+    launching, peak = 0, 0
+    
+    async def launch():
+        nonlocal launching, peak
+        launching += 1
+        peak = max(peak, launching)
+        await asyncio.sleep(0.02)
+        launching -= 1
+        browser = FakeBrowser()
+        launched.append(browser)
+        return browser
+    
+    pool = BrowserPool(launch=launch, size=2, contexts_per_browser=1, max_pages_per_browser=10)
+    await asyncio.gather(*(pool.render(f"https://example.com/{i}") for i in range(2)))
+    
+    assert peak == 2
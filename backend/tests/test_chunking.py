@@ -0,0 +1,50 @@
+"""Tests for token-aware chunking and merging of chunk results."""
+from app.services.chunking import chunk_text, estimate_tokens, merge_items
+
+SECTION_A = "# Data\n\n" + "\n\n".join(f"We collect data item {i} for analytics." for i in range(20))
+SECTION_B = "# Arbitration\n\nAll disputes go to arbitration."
+
+
+def test_small_document_is_one_chunk():
+    """Test that a document within budget is not split."""
+    text = f"{SECTION_A}\n\n{SECTION_B}"
+    
+    assert chunk_text(text, 10_000) == [text]
+
+
+def test_chunks_respect_budget_and_section_boundaries():
+    """Test that sections are kept whole where possible and budgets hold."""
+    text = f"{SECTION_A}\n\n{SECTION_B}"
+    budget = estimate_tokens(SECTION_A) // 2
+    
+    chunks = chunk_text(text, budget)
+    
+    assert len(chunks) > 2
+    assert all(estimate_tokens(chunk) <= budget for chunk in chunks)
+    assert chunks[0].startswith("# Data\n\n")
+    # A section that fits is never split across chunks.
+    assert chunks[-1].endswith(SECTION_B)
+    assert "\n\n".join(chunks) == text
+
+
+def test_oversized_paragraph_split_between_sentences():
+    """Test that a single huge paragraph is split at sentence ends."""
+    paragraph = " ".join(f"Sentence number {i} ends here." for i in range(200))
+    
+    chunks = chunk_text(paragraph, 100)
+    
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert all(chunk.endswith("here.") for chunk in chunks)
+    assert " ".join(chunks) == paragraph
+
+
+def test_merge_dedups_by_category_and_quote():
+    """Test that repeated findings across chunks are merged once."""
+    flag = {"category": "arbitration", "title": "Arbitration", "source_quote": "All disputes go to arbitration."}
+    same_quote = dict(flag, title="Forced arbitration", source_quote="All  disputes go to ARBITRATION.")
+    other_category = dict(flag, category="class_action")
+    rule = {"category": "content", "title": "No spam"}
+    
+    merged = merge_items([[flag, rule], [same_quote, other_category, dict(rule)]])
+    
+    assert merged == [flag, rule, other_category]
@@ -0,0 +1,79 @@
+"""Tests for the comparison engine and compare endpoint."""
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.database import Summary
+from app.services.comparison import compare_features, features_key, summary_features
+from app.services.summaries import save_summary
+from tests.conftest import make_concession, make_document, make_flag, make_summary
+
+
+RED_FLAGS_A = [make_flag("arbitration", "critical"), make_flag("data_sharing", "warning")]
+RED_FLAGS_B = [make_flag("data_sharing", "critical"), make_flag("data_sharing", "info")]
+
+
+def test_compare_features_aligns_categories():
+    """Test severity matrices, scores and deltas on a shared category axis."""
+    a = summary_features(uuid4(), "A", "tos", 70, RED_FLAGS_A, [{"category": "content"}], [])
+    b = summary_features(
+        uuid4(), "B", "tos", 50, RED_FLAGS_B, [], [make_concession("data_sharing", True)]
+    )
+    
+    result = compare_features([a, b])
+    
+    assert result["categories"] == ["arbitration", "content", "data_sharing"]
+    assert result["red_flag_severity"] == [
+        [[1, 0, 0], [0, 0, 0], [0, 1, 0]],
+        [[0, 0, 0], [0, 0, 0], [1, 0, 1]],
+    ]
+    assert result["category_scores"] == [[3, 0, 2], [0, 0, 4]]
+    assert result["category_deltas"] == [[3, 0, 0], [0, 0, 2]]
+    assert result["rule_counts"] == [[0, 1, 0], [0, 0, 0]]
+    assert result["concession_counts"] == [[0, 0, 0], [0, 0, 1]]
+    assert result["opt_out_counts"] == [[0, 0, 0], [0, 0, 1]]
+    assert result["risk_score_deltas"] == [[0, 1], [-1, 0]]
+    assert [s["risk_rank"] for s in result["services"]] == [2, 1]
+
+
+async def _save(db_session: AsyncSession, mock_redis, service_name: str, red_flags: list) -> Summary:
+    return await save_summary(db_session, mock_redis, make_summary(make_document(service_name), 1, red_flags))
+
+
+async def test_compare_endpoint(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test comparing summaries whose features were cached on write."""
+    a = await _save(db_session, mock_redis, "YouTube", RED_FLAGS_A)
+    b = await _save(db_session, mock_redis, "OpenAI", RED_FLAGS_B)
+    assert await mock_redis.get(features_key(a.id)) is not None
+    
+    response = client.post("/api/compare", json=[str(a.id), str(b.id)])
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [s["service_name"] for s in data["services"]] == ["YouTube", "OpenAI"]
+    assert data["categories"] == ["arbitration", "data_sharing"]
+    assert data["category_scores"] == [[3, 2], [0, 4]]
+
+
+async def test_compare_endpoint_loads_uncached_features(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that features missing from Redis are rebuilt from the database and cached."""
+    a = await _save(db_session, mock_redis, "YouTube", RED_FLAGS_A)
+    b = await _save(db_session, mock_redis, "OpenAI", RED_FLAGS_B)
+    await mock_redis.delete(features_key(a.id))
+    
+    response = client.post("/api/compare", json=[str(a.id), str(b.id)])
+    
+    assert response.status_code == 200
+    assert await mock_redis.get(features_key(a.id)) is not None
+
+
+async def test_compare_endpoint_errors(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test validation of the id list and unknown ids."""
+    a = await _save(db_session, mock_redis, "YouTube", RED_FLAGS_A)
+    
+    assert client.post("/api/compare", json=[str(a.id)]).status_code == 422
+    
+    unknown = uuid4()
+    response = client.post("/api/compare", json=[str(a.id), str(unknown)])
+    assert response.status_code == 404
+    assert str(unknown) in response.json()["detail"]
@@ -16,3 +16,14 @@ def test_cors_origins():
     """Test CORS origins configuration."""
     assert isinstance(settings.cors_origins, list)
     assert len(settings.cors_origins) > 0
+
+
+def test_async_database_url():
+    """Test that the application engine URL uses the asyncpg driver."""
+    assert settings.database_url.startswith("postgresql://")
+    assert settings.async_database_url.startswith("postgresql+asyncpg://")
+
+
+def test_keyspace_events_cover_job_writes():
+    """Test that status (string) and section (hash) writes are announced on keyspace channels."""
+    assert {"K", "$", "h"} <= set(settings.redis_keyspace_events)
@@ -1,13 +1,15 @@
 """Comprehensive tests for database operations."""
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import undefer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.models.database import Document, Summary
 import hashlib
 from datetime import datetime, timezone
 
 
-def test_document_creation_with_all_fields(db_session: Session):
+async def test_document_creation_with_all_fields(db_session: AsyncSession):
     """Test creating a document with all required fields."""
     content = "Test Terms of Service content"
     content_hash = hashlib.sha256(content.encode()).hexdigest()
@@ -21,20 +23,21 @@ def test_document_creation_with_all_fields(db_session: Session):
     )
     
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     assert document.id is not None
     assert document.url == "https://example.com/terms"
     assert document.service_name == "Example Service"
     assert document.document_type == "tos"
-    assert document.raw_content == content
+    # raw_content is deferred, so it has to be loaded explicitly
+    assert await document.awaitable_attrs.raw_content == content
     assert document.content_hash == content_hash
     assert document.extracted_at is not None
     assert isinstance(document.extracted_at, datetime)
 
 
-def test_document_unique_content_hash(db_session: Session):
+async def test_document_unique_content_hash(db_session: AsyncSession):
     """Test that documents can have the same content hash (different URLs)."""
     content = "Same content"
     content_hash = hashlib.sha256(content.encode()).hexdigest()
@@ -56,14 +59,14 @@ def test_document_unique_content_hash(db_session: Session):
     )
     
     db_session.add_all([doc1, doc2])
-    db_session.commit()
+    await db_session.commit()
     
     # Both should be saved successfully
     assert doc1.id != doc2.id
     assert doc1.content_hash == doc2.content_hash
 
 
-def test_document_different_types(db_session: Session):
+async def test_document_different_types(db_session: AsyncSession):
     """Test creating documents with different document types."""
     content = "Test content"
     content_hash = hashlib.sha256(content.encode()).hexdigest()
@@ -82,14 +85,14 @@ def test_document_different_types(db_session: Session):
         documents.append(doc)
     
     db_session.add_all(documents)
-    db_session.commit()
+    await db_session.commit()
     
     assert len(documents) == 4
     for doc in documents:
         assert doc.id is not None
 
 
-def test_summary_creation_with_json_fields(db_session: Session):
+async def test_summary_creation_with_json_fields(db_session: AsyncSession):
     """Test creating a summary with JSON fields properly populated."""
     # Create document first
     content = "Test content"
@@ -103,8 +106,8 @@ def test_summary_creation_with_json_fields(db_session: Session):
         content_hash=content_hash,
     )
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     # Create summary with complex JSON data
     red_flags = [
@@ -151,8 +154,8 @@ def test_summary_creation_with_json_fields(db_session: Session):
     )
     
     db_session.add(summary)
-    db_session.commit()
-    db_session.refresh(summary)
+    await db_session.commit()
+    await db_session.refresh(summary)
     
     assert summary.id is not None
     assert len(summary.red_flags) == 1
@@ -162,7 +165,7 @@ def test_summary_creation_with_json_fields(db_session: Session):
     assert summary.concessions[0]["can_opt_out"] is True
 
 
-def test_summary_versioning(db_session: Session):
+async def test_summary_versioning(db_session: AsyncSession):
     """Test that multiple summaries can exist for the same document."""
     # Create document
     content = "Test content"
@@ -176,8 +179,8 @@ def test_summary_versioning(db_session: Session):
         content_hash=content_hash,
     )
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     # Create multiple summaries with different versions
     summaries = []
@@ -197,15 +200,16 @@ def test_summary_versioning(db_session: Session):
         summaries.append(summary)
     
     db_session.add_all(summaries)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
-    assert len(document.summaries) == 3
-    versions = {s.version for s in document.summaries}
+    document_summaries = await document.awaitable_attrs.summaries
+    assert len(document_summaries) == 3
+    versions = {s.version for s in document_summaries}
     assert versions == {1, 2, 3}
 
 
-def test_document_cascade_delete(db_session: Session):
+async def test_document_cascade_delete(db_session: AsyncSession):
     """Test that deleting a document cascades to delete its summaries."""
     # Create document
     content = "Test content"
@@ -219,8 +223,8 @@ def test_document_cascade_delete(db_session: Session):
         content_hash=content_hash,
     )
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     # Create summaries
     summary1 = Summary(
@@ -250,23 +254,23 @@ def test_document_cascade_delete(db_session: Session):
     )
     
     db_session.add_all([summary1, summary2])
-    db_session.commit()
+    await db_session.commit()
     
     summary_ids = [summary1.id, summary2.id]
     
     # Delete document
-    db_session.delete(document)
-    db_session.commit()
+    await db_session.delete(document)
+    await db_session.commit()
     
     # Verify summaries are also deleted
-    remaining_summaries = db_session.query(Summary).filter(
-        Summary.id.in_(summary_ids)
-    ).all()
+    remaining_summaries = (await db_session.scalars(
+        select(Summary).where(Summary.id.in_(summary_ids))
+    )).all()
     
     assert len(remaining_summaries) == 0
 
 
-def test_summary_requires_document(db_session: Session):
+async def test_summary_requires_document(db_session: AsyncSession):
     """Test that a summary cannot be created without a valid document_id."""
     fake_document_id = "550e8400-e29b-41d4-a716-446655440000"
     
@@ -286,10 +290,10 @@ def test_summary_requires_document(db_session: Session):
     db_session.add(summary)
     
     with pytest.raises(IntegrityError):
-        db_session.commit()
+        await db_session.commit()
 
 
-def test_document_query_by_service_name(db_session: Session):
+async def test_document_query_by_service_name(db_session: AsyncSession):
     """Test querying documents by service name."""
     services = ["YouTube", "OpenAI", "YouTube", "OpenAI"]
     documents = []
@@ -308,18 +312,18 @@ def test_document_query_by_service_name(db_session: Session):
         documents.append(doc)
     
     db_session.add_all(documents)
-    db_session.commit()
+    await db_session.commit()
     
     # Query by service name
-    youtube_docs = db_session.query(Document).filter(
-        Document.service_name == "YouTube"
-    ).all()
+    youtube_docs = (await db_session.scalars(
+        select(Document).where(Document.service_name == "YouTube")
+    )).all()
     
     assert len(youtube_docs) == 2
     assert all(doc.service_name == "YouTube" for doc in youtube_docs)
 
 
-def test_document_query_by_content_hash(db_session: Session):
+async def test_document_query_by_content_hash(db_session: AsyncSession):
     """Test querying documents by content hash."""
     content = "Shared content"
     content_hash = hashlib.sha256(content.encode()).hexdigest()
@@ -341,12 +345,37 @@ def test_document_query_by_content_hash(db_session: Session):
     )
     
     db_session.add_all([doc1, doc2])
-    db_session.commit()
+    await db_session.commit()
     
     # Query by content hash
-    matching_docs = db_session.query(Document).filter(
-        Document.content_hash == content_hash
-    ).all()
+    matching_docs = (await db_session.scalars(
+        select(Document).where(Document.content_hash == content_hash)
+    )).all()
     
     assert len(matching_docs) == 2
     assert all(doc.content_hash == content_hash for doc in matching_docs)
+
+
+async def test_document_raw_content_deferred(db_session: AsyncSession):
+    """Test that raw_content is only loaded when explicitly requested."""
+    content = "Very long legal text " * 100
+    document = Document(
+        url="https://example.com/tos",
+        service_name="Example",
+        document_type="tos",
+        raw_content=content,
+        content_hash=hashlib.sha256(content.encode()).hexdigest(),
+    )
+    db_session.add(document)
+    await db_session.commit()
+    document_id = document.id
+    db_session.expunge_all()
+    
+    loaded = await db_session.scalar(select(Document).where(Document.id == document_id))
+    assert "raw_content" in inspect(loaded).unloaded
+    
+    db_session.expunge_all()
+    undeferred = await db_session.scalar(
+        select(Document).options(undefer(Document.raw_content)).where(Document.id == document_id)
+    )
+    assert undeferred.raw_content == content
@@ -0,0 +1,138 @@
+"""Tests for analysis deduplication by URL and content hash."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.database import Document, Summary
+from app.services import analysis
+from app.services.dedup import (
+    cache_extraction,
+    content_hash,
+    find_summary_by_content_hash,
+    get_cached_extraction,
+)
+from app.services.extraction import ExtractedDocument
+from app.services.fetcher import FetchedPage
+from app.services.job_queue import AnalysisJob
+from tests.conftest import TestingSessionLocal, make_document, make_summary
+
+URL = "https://www.youtube.com/static?template=terms"
+CONTENT = "YouTube Terms of Service"
+
+
+@pytest.fixture
+def test_sessions(monkeypatch, db_session):
+    """Point the analysis pipeline at the test database."""
+    monkeypatch.setattr(analysis, "AsyncSessionLocal", TestingSessionLocal)
+
+
+async def _create_summary(db_session: AsyncSession, text: str) -> Summary:
+    document = Document(
+        url=URL,
+        service_name="YouTube",
+        document_type="tos",
+        raw_content=text,
+        content_hash=content_hash(text),
+    )
+    db_session.add(document)
+    await db_session.commit()
+    summary = Summary(
+        document_id=document.id,
+        version=1,
+        red_flags=[],
+        rules=[],
+        concessions=[],
+        clarity_score=70,
+        reading_level="College",
+        original_word_count=1000,
+        summary_word_count=200,
+        model_version="claude-3-5-sonnet-20241022",
+    )
+    db_session.add(summary)
+    await db_session.commit()
+    return summary
+
+
+def _job() -> AnalysisJob:
+    return AnalysisJob(job_id=uuid4(), url=URL)
+
+
+async def _fetch(client, url) -> FetchedPage:
+    return FetchedPage(url=url, status_code=200, content_type="text/html", encoding=None, content=b"")
+
+
+async def test_cached_extraction_reuses_summary(monkeypatch, mock_redis, db_session, test_sessions):
+    """Test that a fresh cached extraction finishes the job without fetching."""
+    summary = await _create_summary(db_session, CONTENT)
+    await cache_extraction(mock_redis, URL, content_hash(CONTENT))
+    
+    async def fail_fetch(client, url):
+        raise AssertionError("fetching should be skipped")
+    
+    monkeypatch.setattr(analysis, "fetch_page", fail_fetch)
+    job = _job()
+    await analysis.run_analysis(job, mock_redis)
+    
+    assert job.summary_id == summary.id
+
+
+async def test_matching_content_hash_reuses_summary(monkeypatch, mock_redis, db_session, test_sessions):
+    """Test that content identical to an analyzed document reuses its summary."""
+    summary = await _create_summary(db_session, CONTENT)
+    
+    async def extract(url, page):
+        return ExtractedDocument(
+            url=url,
+            service_name="YouTube",
+            document_type="tos",
+            text=CONTENT,
+            content_hash=content_hash(CONTENT),
+        )
+    
+    monkeypatch.setattr(analysis, "fetch_page", _fetch)
+    monkeypatch.setattr(analysis, "extract_page", extract)
+    job = _job()
+    await analysis.run_analysis(job, mock_redis)
+    
+    assert job.summary_id == summary.id
+    assert await get_cached_extraction(mock_redis, URL) == content_hash(CONTENT)
+
+
+async def test_content_hash_match_prefers_newest_summary(db_session):
+    """Test that the most recently generated summary wins over a higher version number."""
+    now = datetime.now(timezone.utc)
+    older = make_summary(make_document("YouTube", url=URL), version=3)
+    older.generated_at = now - timedelta(days=1)
+    newer = make_summary(make_document("YouTube", url=f"{URL}&hl=en"), version=1)
+    newer.generated_at = now
+    db_session.add_all([older, newer])
+    await db_session.commit()
+    
+    assert await find_summary_by_content_hash(db_session, older.document.content_hash) == newer.id
+
+
+async def test_concurrent_jobs_for_same_url_extract_once(monkeypatch, mock_redis, db_session, test_sessions):
+    """Test that identical concurrent jobs wait on the lock instead of duplicating work."""
+    summary = await _create_summary(db_session, CONTENT)
+    calls = 0
+    
+    async def slow_extract(url, page):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.2)
+        return ExtractedDocument(
+            url=url,
+            service_name="YouTube",
+            document_type="tos",
+            text=CONTENT,
+            content_hash=content_hash(CONTENT),
+        )
+    
+    monkeypatch.setattr(analysis, "fetch_page", _fetch)
+    monkeypatch.setattr(analysis, "extract_page", slow_extract)
+    jobs = [_job() for _ in range(3)]
+    await asyncio.gather(*(analysis.run_analysis(job, mock_redis) for job in jobs))
+    
+    assert calls == 1
+    assert all(job.summary_id == summary.id for job in jobs)
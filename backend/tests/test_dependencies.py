@@ -1,18 +1,18 @@
 """Tests for API dependencies."""
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.dependencies import get_db
 
 
-def test_get_db(db_session: Session):
+async def test_get_db(db_session: AsyncSession):
     """Test database dependency."""
     db_gen = get_db()
-    db = next(db_gen)
+    db = await db_gen.__anext__()
     
-    assert isinstance(db, Session)
+    assert isinstance(db, AsyncSession)
     
     # Cleanup
     try:
-        next(db_gen)
-    except StopIteration:
+        await db_gen.__anext__()
+    except StopAsyncIteration:
         pass
@@ -0,0 +1,134 @@
+"""Tests for document fetching and extraction."""
+import gzip
+import httpx
+import pytest
+from app.api.dependencies import get_http_client
+from app.config import settings
+from app.services import browser
+from app.services.extraction import (
+    ExtractionError,
+    classify_document,
+    extract_document,
+    service_name_from_url,
+)
+from app.services.fetcher import ResponseTooLargeError, fetch_page
+from app.utils.html_text import parse_html
+
+CLAUSE = "We collect your data and may share it with partners for advertising purposes. "
+STATIC_PAGE = f"""<html><head><title>Privacy Policy</title><style>p {{ color: red }}</style></head>
+<body><nav>Home</nav><p>{CLAUSE * 20}</p><p>Second   clause.</p><script>var x = 1;</script></body></html>"""
+SPA_SHELL = "<html><head><title>App</title></head><body><div id='root'></div></body></html>"
+
+
+def _client(routes: dict) -> httpx.AsyncClient:
+    def handle(request: httpx.Request) -> httpx.Response:
+        return routes[request.url.path]()
+    return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+
+def test_parse_html_keeps_text_blocks():
+    """Test that scripts and styles are dropped and blocks become paragraphs."""
+    title, text = parse_html(STATIC_PAGE)
+    
+    assert title == "Privacy Policy"
+    assert text.split("\n\n")[-1] == "Second clause."
+    assert "var x" not in text and "color" not in text
+
+
+def test_url_heuristics():
+    """Test service name and document type guesses."""
+    assert service_name_from_url("https://www.example.com/legal/terms") == "Example"
+    assert service_name_from_url("https://policies.google.com/privacy") == "Google"
+    assert classify_document("https://example.com/legal/terms") == "tos"
+    assert classify_document("https://example.com/privacy-policy") == "privacy"
+    assert classify_document("https://example.com/p/123", "Community Guidelines") == "community_guidelines"
+    assert classify_document("https://example.com/about") == "other"
+
+
+async def test_static_page_extracted_without_browser(monkeypatch):
+    """Test that a static page is extracted from the plain fetch."""
+    async def fail(url):
+        raise AssertionError("browser should not be used")
+    
+    monkeypatch.setattr(browser, "render_page", fail)
+    async with _client({"/privacy": lambda: httpx.Response(200, html=STATIC_PAGE)}) as client:
+        document = await extract_document("https://www.example.com/privacy", client)
+    
+    assert document.service_name == "Example"
+    assert document.document_type == "privacy"
+    assert document.text.startswith("We collect your data")
+    assert len(document.content_hash) == 64
+
+
+async def test_spa_escalates_to_browser(monkeypatch):
+    """Test that too little static text triggers browser rendering."""
+    rendered = []
+    
+    async def render(url):
+        rendered.append(url)
+        return STATIC_PAGE
+    
+    monkeypatch.setattr(browser, "render_page", render)
+    async with _client({"/terms": lambda: httpx.Response(200, html=SPA_SHELL)}) as client:
+        document = await extract_document("https://app.example.com/terms", client)
+    
+    assert rendered == ["https://app.example.com/terms"]
+    assert CLAUSE.strip() in document.text
+
+
+async def test_short_page_kept_without_browser(monkeypatch):
+    """Test that a short static page survives a missing browser, but an empty one fails."""
+    async def missing(url):
+        raise ImportError("No module named 'playwright'")
+    
+    monkeypatch.setattr(browser, "render_page", missing)
+    routes = {
+        "/terms": lambda: httpx.Response(200, html=f"<html><body><p>{CLAUSE}</p></body></html>"),
+        "/empty": lambda: httpx.Response(200, html=SPA_SHELL),
+    }
+    async with _client(routes) as client:
+        document = await extract_document("https://www.example.com/terms", client)
+        with pytest.raises(ExtractionError):
+            await extract_document("https://www.example.com/empty", client)
+    
+    assert document.text == CLAUSE.strip()
+
+
+async def test_compressed_body_decoded_while_streaming():
+    """Test that gzip bodies are decompressed and the cap applies to decoded bytes."""
+    body = (CLAUSE * 200).encode()
+    compressed = gzip.compress(body)
+    
+    def respond():
+        return httpx.Response(200, content=compressed, headers={"Content-Encoding": "gzip", "Content-Type": "text/plain"})
+    
+    async with _client({"/tos": respond}) as client:
+        page = await fetch_page(client, "https://example.com/tos")
+        assert page.text == body.decode()
+        
+        assert len(compressed) < 1000 < len(body)
+        with pytest.raises(ResponseTooLargeError):
+            await fetch_page(client, "https://example.com/tos", max_bytes=1000)
+
+
+async def test_declared_oversize_rejected(monkeypatch):
+    """Test that a declared Content-Length over the cap is refused up front."""
+    monkeypatch.setattr(settings, "fetch_max_bytes", 10)
+    async with _client({"/tos": lambda: httpx.Response(200, text="x" * 100)}) as client:
+        with pytest.raises(ResponseTooLargeError):
+            await fetch_page(client, "https://example.com/tos")
+
+
+async def test_unsupported_content_type():
+    """Test that binary content is rejected."""
+    async with _client({"/tos.bin": lambda: httpx.Response(200, content=b"\x00", headers={"Content-Type": "application/octet-stream"})}) as client:
+        with pytest.raises(ExtractionError):
+            await extract_document("https://example.com/tos.bin", client)
+
+
+def test_shared_client_pools_connections():
+    """Test that the shared client is a singleton configured for pooling."""
+    client = get_http_client()
+    
+    assert get_http_client() is client
+    assert client.follow_redirects
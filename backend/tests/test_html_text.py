@@ -0,0 +1,105 @@
+"""Tests for the streaming HTML-to-text extractor."""
+from app.utils.html_text import HTMLTextExtractor, iter_text_blocks, normalize_text, parse_html
+
+PAGE = """<!DOCTYPE html><html><head><title>Terms &amp; Conditions</title>
+<script>window.analytics = {};</script></head><body>
+<div id="onetrust-consent-sdk"><p>We use cookies.</p><button>Accept all</button></div>
+<nav class="site-nav"><a href="/">Home</a></nav>
+<main>
+  <h1>Terms of Service</h1>
+  <p>By using the service you agree to “these” terms — in full.</p>
+  <h2>Arbitration</h2>
+  <ul><li>Disputes go to arbitration.</li><li>No class actions.</li></ul>
+  <div class="share-buttons">Share on social</div>
+  <p hidden>Old clause</p>
+</main>
+<footer>© Example</footer>
+</body></html>"""
+
+EXPECTED = "\n\n".join([
+    "# Terms of Service",
+    'By using the service you agree to "these" terms - in full.',
+    "## Arbitration",
+    "- Disputes go to arbitration.",
+    "- No class actions.",
+])
+
+
+def test_boilerplate_removed_and_sections_structured():
+    """Test that chrome is dropped and headings and list items are marked."""
+    title, text = parse_html(PAGE)
+    
+    assert title == "Terms & Conditions"
+    assert text == EXPECTED
+
+
+def test_cosmetic_markup_changes_keep_text():
+    """Test that restyled markup normalizes to the same text."""
+    restyled = (
+        PAGE.replace("<p>By using", '<p class="lead"  style="x">By\n   using')
+        .replace("“these”", "&ldquo;these&rdquo;")
+        .replace("in full.", "in&nbsp;full.")
+        .replace("<main>", '<main><div class="wrapper"><div>')
+        .replace("</main>", "</div></div></main>")
+    )
+    
+    assert parse_html(restyled)[1] == EXPECTED
+
+
+def test_streamed_chunks_match_whole_document():
+    """Test that chunk boundaries anywhere in the markup do not change the output."""
+    for size in (1, 7, 64):
+        chunks = [PAGE[i:i + size] for i in range(0, len(PAGE), size)]
+        assert "\n\n".join(iter_text_blocks(chunks)) == EXPECTED
+
+
+def test_blocks_emitted_incrementally():
+    """Test that completed blocks are returned while the page is still arriving."""
+    extractor = HTMLTextExtractor()
+    extractor.feed("<html><body>")
+    
+    emitted = []
+    for i in range(1000):
+        emitted.extend(extractor.feed(f"<p>Clause {i}: we may share your data.</p>"))
+    
+    # Only the tail may still be buffered inside the parser
+    assert len(emitted) >= 990
+    emitted.extend(extractor.close())
+    assert emitted[-1] == "Clause 999: we may share your data."
+    assert len(emitted) == 1000
+
+
+def test_adjacent_duplicate_blocks_collapse():
+    """Test that duplicated responsive markup yields the text once."""
+    _, text = parse_html("<body><p>Same clause.</p><div>Same   clause.</div><p>Other.</p></body>")
+    
+    assert text == "Same clause.\n\nOther."
+
+
+def test_normalize_text():
+    """Test deterministic normalization."""
+    assert normalize_text("  Café​  ‘ok’ – ﬁne… ") == "Café 'ok' - fine..."
+
+
+def test_consent_topics_kept_while_consent_banners_dropped():
+    """Test that policy sections about cookies or social data are document text."""
+    page = """<html><body>
+    <div class="cookie-banner"><p>We use cookies.</p></div>
+    <div class="consent" style="position: fixed; bottom: 0">Accept cookies?</div>
+    <div class="social-links"><a href="#">Follow us</a></div>
+    <p>This policy explains how we use your data.</p>
+    <section id="cookies"><h2>Cookies</h2><p>We set advertising cookies for 13 months.</p></section>
+    <section id="gdpr-rights"><h2>Your GDPR rights</h2><p>You may request erasure.</p></section>
+    <div class="social-media-data"><p>We import your social media contacts.</p></div>
+    </body></html>"""
+    
+    _, text = parse_html(page)
+    
+    assert text == "\n\n".join([
+        "This policy explains how we use your data.",
+        "## Cookies",
+        "We set advertising cookies for 13 months.",
+        "## Your GDPR rights",
+        "You may request erasure.",
+        "We import your social media contacts.",
+    ])
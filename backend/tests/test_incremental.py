@@ -0,0 +1,65 @@
+"""Tests for clause diffs and merging in incremental re-analysis."""
+from app.models.database import Summary
+from app.services.extraction import ExtractedDocument
+from app.services.incremental import IncrementalPlan, clause_hash, split_clauses
+
+
+def _flag(category, quote):
+    return {
+        "severity": "warning",
+        "category": category,
+        "title": category.title(),
+        "explanation": "Explanation",
+        "source_quote": quote,
+    }
+
+
+def _rule(category, quote):
+    return {"category": category, "title": category.title(), "description": "Description", "source_quote": quote}
+
+
+def test_split_clauses_and_hash():
+    """Test that clauses split at blank lines and hash independently of whitespace."""
+    text = "First clause.\n\n  \nSecond   clause\nspans lines.\n\n"
+    
+    assert split_clauses(text) == ["First clause.", "Second   clause\nspans lines."]
+    assert clause_hash("Second clause spans lines.") == clause_hash("Second   clause\nspans lines.")
+
+
+def test_merge_keeps_items_from_unchanged_clauses():
+    """Test which previous items survive a merge."""
+    kept, edited = "We share data with partners.", "We track your location."
+    new = "We track your location and contacts."
+    previous = Summary(
+        red_flags=[_flag("sharing", kept), _flag("tracking", edited)],
+        rules=[_rule("content", kept), _rule("conduct", edited)],
+        concessions=[],
+        provenance={
+            "red_flags": [[clause_hash(kept)], [clause_hash(edited)]],
+            "rules": [[clause_hash(kept)], [clause_hash(edited)]],
+            "concessions": [],
+        },
+    )
+    plan = IncrementalPlan(
+        document=ExtractedDocument(
+            url="https://example.com/tos",
+            service_name="Example",
+            document_type="tos",
+            text=f"{kept}\n\n{new}",
+            content_hash="0" * 64,
+        ),
+        previous=previous,
+        changed_clauses={clause_hash(new): new},
+        unchanged={clause_hash(kept)},
+    )
+    
+    assert plan.partial_document.text == new
+    assert plan.merge("red_flags", [_flag("tracking", "location and contacts")]) == [
+        _flag("sharing", kept),
+        _flag("tracking", "location and contacts"),
+    ]
+    assert plan.provenance["red_flags"] == [[clause_hash(kept)], [clause_hash(new)]]
+    # The rule of the edited clause is dropped, not kept next to its replacement
+    assert plan.merge("rules", [_rule("conduct", new)]) == [_rule("content", kept), _rule("conduct", new)]
+    assert plan.provenance["rules"] == [[clause_hash(kept)], [clause_hash(new)]]
+    assert plan.merge("rules", []) == [_rule("content", kept)]
@@ -0,0 +1,166 @@
+"""Tests for the Redis-backed analysis job queue and worker."""
+import asyncio
+import time
+import pytest
+from uuid import uuid4
+from app.config import settings
+from app.services.job_queue import (
+    AnalysisJob,
+    DEAD_LETTER_KEY,
+    DELAYED_KEY,
+    PROCESSING_KEY,
+    QUEUE_KEY,
+    ack_job,
+    enqueue_job,
+    fail_job,
+    job_status_key,
+    load_job,
+    promote_delayed_jobs,
+    queue_depth,
+    requeue_expired_jobs,
+    reserve_job,
+)
+from app import worker
+from app.worker import run_worker
+
+
+def _job() -> AnalysisJob:
+    return AnalysisJob(job_id=uuid4(), url="https://example.com/tos")
+
+
+async def test_enqueue_reserve_ack(mock_redis):
+    """Test the happy path through the queue."""
+    job = _job()
+    await enqueue_job(mock_redis, job)
+    assert await mock_redis.get(job_status_key(job.job_id)) == "processing"
+    
+    reserved = await reserve_job(mock_redis, timeout_seconds=0.1)
+    assert reserved.job_id == job.job_id
+    assert await mock_redis.lrange(PROCESSING_KEY, 0, -1) == [str(job.job_id)]
+    
+    await ack_job(mock_redis, reserved)
+    assert await mock_redis.get(job_status_key(job.job_id)) == "completed"
+    assert await queue_depth(mock_redis) == {"ready": 0, "processing": 0, "delayed": 0, "dead": 0}
+
+
+async def test_reserve_empty_queue(mock_redis):
+    """Test that reserving from an empty queue times out with None."""
+    assert await reserve_job(mock_redis, timeout_seconds=0.1) is None
+
+
+async def test_failed_job_is_retried_after_backoff(mock_redis):
+    """Test that a failure schedules a delayed retry that is later promoted."""
+    job = _job()
+    await enqueue_job(mock_redis, job)
+    reserved = await reserve_job(mock_redis, timeout_seconds=0.1)
+    
+    assert await fail_job(mock_redis, reserved, "boom") is True
+    assert await mock_redis.zcard(DELAYED_KEY) == 1
+    assert await promote_delayed_jobs(mock_redis, now=time.time()) == 0
+    
+    far_future = time.time() + settings.job_retry_backoff_max_seconds + 1
+    assert await promote_delayed_jobs(mock_redis, now=far_future) == 1
+    retried = await reserve_job(mock_redis, timeout_seconds=0.1)
+    assert retried.attempts == 1
+    assert retried.last_error == "boom"
+
+
+async def test_job_dead_lettered_after_max_attempts(mock_redis):
+    """Test that a job exhausting its attempts lands in the dead-letter list."""
+    job = _job()
+    job.attempts = settings.job_max_attempts - 1
+    await enqueue_job(mock_redis, job)
+    reserved = await reserve_job(mock_redis, timeout_seconds=0.1)
+    
+    assert await fail_job(mock_redis, reserved, "boom") is False
+    assert await mock_redis.lrange(DEAD_LETTER_KEY, 0, -1) == [str(job.job_id)]
+    assert await mock_redis.get(job_status_key(job.job_id)) == "failed"
+
+
+async def test_expired_reservation_is_requeued(mock_redis):
+    """Test that a reservation past its visibility timeout is retried."""
+    job = _job()
+    await enqueue_job(mock_redis, job)
+    await reserve_job(mock_redis, timeout_seconds=0.1)
+    
+    later = time.time() + settings.job_visibility_timeout_seconds + 1
+    assert await requeue_expired_jobs(mock_redis, now=later) == 1
+    assert await mock_redis.llen(PROCESSING_KEY) == 0
+    assert await mock_redis.zcard(DELAYED_KEY) == 1
+
+
+async def test_orphaned_reservation_gets_deadline(mock_redis):
+    """Test that a processing entry without a deadline is eventually reclaimed."""
+    job = _job()
+    await enqueue_job(mock_redis, job)
+    await mock_redis.lmove(QUEUE_KEY, PROCESSING_KEY, "RIGHT", "LEFT")
+    
+    now = time.time()
+    assert await requeue_expired_jobs(mock_redis, now=now) == 0
+    later = now + settings.job_visibility_timeout_seconds + 1
+    assert await requeue_expired_jobs(mock_redis, now=later) == 1
+
+
+async def test_worker_runs_jobs(mock_redis):
+    """Test that the worker runs queued jobs with the given handler and acks them."""
+    jobs = [_job() for _ in range(3)]
+    for job in jobs:
+        await enqueue_job(mock_redis, job)
+    
+    handled = []
+    stop = asyncio.Event()
+    
+    async def handler(job, redis):
+        handled.append(job.job_id)
+        if len(handled) == len(jobs):
+            stop.set()
+    
+    await asyncio.wait_for(run_worker(mock_redis, handler, concurrency=2, stop=stop), 5)
+    
+    assert set(handled) == {job.job_id for job in jobs}
+    for job in jobs:
+        assert await mock_redis.get(job_status_key(job.job_id)) == "completed"
+
+
+async def test_stuck_handler_fails_before_reservation_expires(mock_redis, monkeypatch):
+    """Test that a stuck job is failed by its worker, never reclaimed while still running."""
+    monkeypatch.setattr(settings, "job_visibility_timeout_seconds", 0.5)
+    monkeypatch.setattr(settings, "job_handler_margin_seconds", 0.3)
+    monkeypatch.setattr(settings, "job_retry_backoff_seconds", 0.01)
+    job = _job()
+    await enqueue_job(mock_redis, job)
+    running, peak, stop = 0, 0, asyncio.Event()
+    
+    async def handler(job, redis):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Cleanup after cancellation takes a moment too.
+            await asyncio.sleep(0.1)
+            running -= 1
+    
+    async def stop_when_dead():
+        while not await mock_redis.llen(DEAD_LETTER_KEY):
+            await asyncio.sleep(0.05)
+        stop.set()
+    
+    reclaimed = []
+    
+    async def requeue(redis):
+        reclaimed.append(await requeue_expired_jobs(redis))
+        return reclaimed[-1]
+    
+    monkeypatch.setattr(worker, "requeue_expired_jobs", requeue)
+    await asyncio.wait_for(asyncio.gather(
+        run_worker(mock_redis, handler, concurrency=2, stop=stop, maintenance_interval_seconds=0.05),
+        stop_when_dead(),
+    ), 10)
+    
+    assert peak == 1
+    assert not any(reclaimed)
+    failed = await load_job(mock_redis, job.job_id)
+    assert failed.attempts == settings.job_max_attempts
+    assert "TimeoutError" in failed.last_error
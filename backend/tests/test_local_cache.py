@@ -0,0 +1,109 @@
+"""Tests for the in-process summary cache tier."""
+import pytest
+from app.config import settings
+from app.services.local_cache import LocalLRUCache, summary_local_cache
+from app.services.summary_cache import (
+    apply_invalidation_message,
+    cache_summary,
+    get_cached_summary,
+    invalidate_summary,
+    summary_cache_key,
+)
+from uuid import uuid4
+
+
+def test_lru_evicts_least_recently_used():
+    """Test that the entry limit evicts the least recently used key."""
+    cache = LocalLRUCache(max_entries=2, max_bytes=1024, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.evictions == 1
+
+
+def test_lru_respects_max_bytes():
+    """Test that the byte limit is enforced and oversized values are skipped."""
+    cache = LocalLRUCache(max_entries=10, max_bytes=10, ttl_seconds=60)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+    
+    assert len(cache) == 1
+    assert cache.size_bytes == 6
+    assert cache.get("b") == "y" * 6
+    
+    cache.set("huge", "z" * 11)
+    assert cache.get("huge") is None
+
+
+def test_lru_expires_entries():
+    """Test that entries past their TTL are treated as misses."""
+    cache = LocalLRUCache(max_entries=10, max_bytes=1024, ttl_seconds=0)
+    cache.set("a", "1")
+    
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_counters():
+    """Test hit and miss counters."""
+    cache = LocalLRUCache(max_entries=10, max_bytes=1024, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.get("a")
+    cache.get("missing")
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+async def test_local_tier_served_before_redis(mock_redis):
+    """Test that a warm local entry is returned without a Redis round trip."""
+    summary_id = uuid4()
+    await cache_summary(mock_redis, summary_id, '{"id": "cached"}')
+    await mock_redis.delete(summary_cache_key(summary_id))
+    
+    assert await get_cached_summary(mock_redis, summary_id) == '{"id": "cached"}'
+
+
+async def test_redis_hit_populates_local_tier(mock_redis):
+    """Test that a Redis hit warms the local tier."""
+    summary_id = uuid4()
+    key = summary_cache_key(summary_id)
+    await mock_redis.setex(key, 60, "payload")
+    
+    await get_cached_summary(mock_redis, summary_id)
+    assert summary_local_cache.get(key) == "payload"
+
+
+async def test_invalidate_publishes_to_other_workers(mock_redis):
+    """Test that invalidation clears local state and notifies other workers."""
+    summary_id = uuid4()
+    key = summary_cache_key(summary_id)
+    await cache_summary(mock_redis, summary_id, "payload")
+    pubsub = mock_redis.pubsub()
+    await pubsub.subscribe(settings.cache_invalidation_channel)
+    await pubsub.get_message(timeout=1)
+    
+    await invalidate_summary(mock_redis, summary_id)
+    
+    assert summary_local_cache.get(key) is None
+    message = await pubsub.get_message(timeout=1)
+    assert message["data"] == key
+    await pubsub.reset()
+
+
+def test_apply_invalidation_message():
+    """Test that a pub/sub message evicts the named local entry."""
+    summary_local_cache.set("summary:1", "payload")
+    
+    apply_invalidation_message({"type": "subscribe", "data": 1})
+    assert summary_local_cache.get("summary:1") == "payload"
+    
+    apply_invalidation_message({"type": "message", "data": "summary:1"})
+    assert summary_local_cache.get("summary:1") is None
@@ -0,0 +1,260 @@
+"""Tests for the rate-aware model client."""
+import asyncio
+import json
+import httpx
+import pytest
+from sqlalchemy import func, select
+from app.config import settings
+from app.models.database import ModelResponse
+from app.services import analysis
+from app.services.extraction import ExtractedDocument
+from app.services.model_client import (
+    TOKEN_BUCKET_KEY,
+    AdaptiveLimiter,
+    ModelAPIError,
+    ModelClient,
+    RedisTokenBucket,
+)
+from tests.conftest import TestingSessionLocal
+
+
+class FakeAnthropic:
+    """Local stand-in for the Messages API that can rate limit and fail on demand."""
+    
+    def __init__(self):
+        self.requests = []
+        self.statuses = []  # Status codes to answer with before succeeding
+        self.reply = "[]"
+        self.latency = 0.0
+        self.active = 0
+        self.peak = 0
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        if self.statuses:
+            status = self.statuses.pop(0)
+            return httpx.Response(status, headers={"retry-after": "0"}, json={"type": "error"})
+        return httpx.Response(200, json={
+            "type": "message",
+            "content": [{"type": "text", "text": self.reply}],
+            "usage": {"input_tokens": 100, "output_tokens": 20},
+        })
+
+
+@pytest.fixture
+def pipeline_db(monkeypatch, db_session):
+    """Let the analysis pipeline open its sessions on the test database."""
+    monkeypatch.setattr(analysis, "AsyncSessionLocal", TestingSessionLocal)
+    return db_session
+
+
+@pytest.fixture
+def api():
+    return FakeAnthropic()
+
+
+@pytest.fixture
+async def model_client(api, mock_redis, monkeypatch):
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+    monkeypatch.setattr(settings, "model_retry_backoff_seconds", 0.01)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(api.handle), base_url="https://api.test")
+    client = ModelClient(mock_redis, http_client)
+    yield client
+    await client.close()
+
+
+async def test_complete_returns_reply(model_client, api):
+    """Test the request sent to the API and the text returned."""
+    assert await model_client.complete("Summarize this.", max_tokens=100) == "[]"
+    
+    request = api.requests[0]
+    assert request.url.path == "/v1/messages"
+    assert request.headers["x-api-key"] == "test-key"
+    assert request.headers["anthropic-version"] == settings.anthropic_api_version
+    body = json.loads(request.content)
+    assert body["model"] == settings.anthropic_model
+    assert body["messages"] == [{"role": "user", "content": "Summarize this."}]
+
+
+async def test_rate_limited_call_backs_off_and_retries(model_client, api):
+    """Test that a 429 halves the concurrency limit and the call is retried."""
+    api.statuses = [429, 529]
+    
+    assert await model_client.complete("Summarize this.") == "[]"
+    
+    assert len(api.requests) == 3
+    assert model_client.limiter.limit < settings.model_concurrency_initial
+    assert model_client.limiter.in_flight == 0
+
+
+async def test_gives_up_after_max_attempts(model_client, api, monkeypatch):
+    """Test that persistent rate limiting surfaces as an error."""
+    monkeypatch.setattr(settings, "model_max_attempts", 2)
+    api.statuses = [429] * 3
+    
+    with pytest.raises(ModelAPIError):
+        await model_client.complete("Summarize this.")
+    assert len(api.requests) == 2
+
+
+async def test_client_error_not_retried(model_client, api):
+    """Test that a rejected request fails immediately."""
+    api.statuses = [400]
+    
+    with pytest.raises(ModelAPIError, match="400"):
+        await model_client.complete("Summarize this.")
+    assert len(api.requests) == 1
+
+
+async def test_token_usage_reconciled(model_client, mock_redis):
+    """Test that the token bucket is charged the reported usage, not the estimate."""
+    await model_client.complete("Summarize this.", max_tokens=1000)
+    
+    tokens = float(await mock_redis.hget(TOKEN_BUCKET_KEY, "tokens"))
+    assert tokens == pytest.approx(settings.model_tokens_per_minute - 120, abs=50)
+
+
+async def test_concurrency_limited_by_adaptive_limit(model_client, api):
+    """Test that no more calls are in flight than the current limit."""
+    api.latency = 0.01
+    # Pin the limit: successes would otherwise raise it while calls are queued.
+    model_client.limiter.limit = model_client.limiter.maximum = 2
+    
+    await asyncio.gather(*(model_client.complete(f"Chunk {i}") for i in range(6)))
+    
+    assert api.peak == 2
+
+
+async def test_call_waiting_for_tokens_holds_no_slot(model_client):
+    """Test that a re-scan held back by the token bucket leaves its slot to a user call."""
+    model_client.limiter.limit = 1
+    # Leave exactly the reserve that background calls may not touch.
+    reserve = settings.model_background_reserve_ratio * model_client.tokens.capacity
+    await model_client.tokens.charge(model_client.tokens.capacity - reserve)
+    background = asyncio.create_task(model_client.complete("Re-scan chunk", priority="background"))
+    await asyncio.sleep(0.05)
+    
+    assert await asyncio.wait_for(model_client.complete("User chunk"), 1) == "[]"
+    assert not background.done()
+    background.cancel()
+    await asyncio.gather(background, return_exceptions=True)
+
+
+async def test_token_bucket_shared_through_redis(mock_redis):
+    """Test that two buckets on the same key draw from one budget."""
+    first = RedisTokenBucket(mock_redis, "ratelimit:test", capacity=2, refill_per_second=0.01)
+    second = RedisTokenBucket(mock_redis, "ratelimit:test", capacity=2, refill_per_second=0.01)
+    
+    assert await first.try_acquire(1) == 0
+    assert await second.try_acquire(1) == 0
+    assert await first.try_acquire(1) > 0
+    
+    await second.charge(-1)
+    assert await first.try_acquire(1) == 0
+
+
+async def test_background_leaves_reserve(mock_redis):
+    """Test that a reserve kept for interactive calls is not taken by background ones."""
+    bucket = RedisTokenBucket(mock_redis, "ratelimit:test", capacity=10, refill_per_second=0.01)
+    
+    assert await bucket.try_acquire(8, reserve=2) == 0
+    assert await bucket.try_acquire(1, reserve=2) > 0
+    assert await bucket.try_acquire(1) == 0
+
+
+async def test_limiter_admits_interactive_before_background():
+    """Test that queued interactive calls take a freed slot before background ones."""
+    limiter = AdaptiveLimiter(initial=1, minimum=1, maximum=4)
+    await limiter.acquire()
+    admitted = []
+    
+    async def call(name, priority):
+        await limiter.acquire(priority)
+        admitted.append(name)
+        limiter.release()
+    
+    tasks = [
+        asyncio.create_task(call("rescan", "background")),
+        asyncio.create_task(call("user", "interactive")),
+    ]
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*tasks)
+    
+    assert admitted == ["user", "rescan"]
+
+
+def test_limiter_increases_additively_and_decreases_multiplicatively():
+    """Test the AIMD limit updates and their bounds."""
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=5)
+    
+    limiter.on_success()
+    assert limiter.limit == pytest.approx(4.25)
+    limiter.on_rate_limited()
+    assert limiter.limit == pytest.approx(2.125)
+    for _ in range(3):
+        limiter.on_rate_limited()
+    assert limiter.limit == 1
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 5
+
+
+async def test_analyze_section_parses_reply(model_client, api, monkeypatch):
+    """Test a section analysis against the fake API."""
+    api.reply = 'Here you go:\n[{"category": "content", "title": "No spam", "description": "Do not spam."}]'
+    
+    async def get_model_client():
+        return model_client
+    
+    monkeypatch.setattr(analysis, "get_model_client", get_model_client)
+    document = ExtractedDocument(
+        url="https://example.com/tos",
+        service_name="Example",
+        document_type="tos",
+        text="You must not send spam.",
+        content_hash="abc",
+    )
+    
+    items = await analysis.analyze_section(document, "rules")
+    
+    assert items == [{"category": "content", "title": "No spam", "description": "Do not spam."}]
+    assert "You must not send spam." in json.loads(api.requests[0].content)["messages"][0]["content"]
+    
+    api.reply = "I could not find any rules."
+    with pytest.raises(ModelAPIError):
+        await analysis.analyze_section(document, "rules")
+
+
+@pytest.mark.parametrize("item", [
+    {"category": "arbitration", "title": "Arbitration", "explanation": "x", "source_quote": "y", "severity": "high"},
+    {"title": "Arbitration", "explanation": "x", "source_quote": "y", "severity": "critical"},
+    {"category": "arbitration", "severity": "critical", "source_quote": "y"},
+    "Arbitration",
+])
+async def test_malformed_items_rejected_and_not_cached(item, pipeline_db, mock_redis, model_client, api, monkeypatch):
+    """Test that items failing the section schema fail the call and are never cached."""
+    api.reply = json.dumps([item])
+    
+    async def get_model_client():
+        return model_client
+    
+    monkeypatch.setattr(analysis, "get_model_client", get_model_client)
+    chunk = ExtractedDocument(
+        url="https://example.com/tos",
+        service_name="Example",
+        document_type="tos",
+        text="All disputes go to arbitration.",
+        content_hash="abc",
+    )
+    
+    with pytest.raises(ModelAPIError):
+        await analysis._analyze_chunk(mock_redis, chunk, "red_flags")
+    
+    assert await pipeline_db.scalar(select(func.count()).select_from(ModelResponse)) == 0
@@ -1,12 +1,12 @@
 """Tests for database models."""
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.database import Document, Summary
 from datetime import datetime
 import hashlib
 
 
-def test_create_document(db_session: Session):
+async def test_create_document(db_session: AsyncSession):
     """Test creating a document."""
     content = "This is test content"
     content_hash = hashlib.sha256(content.encode()).hexdigest()
@@ -20,8 +20,8 @@ def test_create_document(db_session: Session):
     )
     
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     assert document.id is not None
     assert document.service_name == "Example Service"
@@ -29,7 +29,7 @@ def test_create_document(db_session: Session):
     assert document.content_hash == content_hash
 
 
-def test_create_summary(db_session: Session):
+async def test_create_summary(db_session: AsyncSession):
     """Test creating a summary."""
     # First create a document
     content = "This is test content"
@@ -44,8 +44,8 @@ def test_create_summary(db_session: Session):
     )
     
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     # Create summary
     summary = Summary(
@@ -62,17 +62,18 @@ def test_create_summary(db_session: Session):
     )
     
     db_session.add(summary)
-    db_session.commit()
-    db_session.refresh(summary)
+    await db_session.commit()
+    await db_session.refresh(summary)
     
     assert summary.id is not None
     assert summary.document_id == document.id
     assert summary.clarity_score == 75
-    assert len(document.summaries) == 1
-    assert document.summaries[0].id == summary.id
+    document_summaries = await document.awaitable_attrs.summaries
+    assert len(document_summaries) == 1
+    assert document_summaries[0].id == summary.id
 
 
-def test_document_summary_relationship(db_session: Session):
+async def test_document_summary_relationship(db_session: AsyncSession):
     """Test document-summary relationship."""
     content = "This is test content"
     content_hash = hashlib.sha256(content.encode()).hexdigest()
@@ -86,8 +87,8 @@ def test_document_summary_relationship(db_session: Session):
     )
     
     db_session.add(document)
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
     # Create multiple summaries
     summary1 = Summary(
@@ -117,8 +118,9 @@ def test_document_summary_relationship(db_session: Session):
     )
     
     db_session.add_all([summary1, summary2])
-    db_session.commit()
-    db_session.refresh(document)
+    await db_session.commit()
+    await db_session.refresh(document)
     
-    assert len(document.summaries) == 2
-    assert {s.version for s in document.summaries} == {1, 2}
+    document_summaries = await document.awaitable_attrs.summaries
+    assert len(document_summaries) == 2
+    assert {s.version for s in document_summaries} == {1, 2}
@@ -0,0 +1,111 @@
+"""Tests for the parsing process pool."""
+import asyncio
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from app.services import parsing
+from app.services.parsing import ParseError, ParserPool, ParseTimeoutError, parse_document
+from app.utils.html_text import parse_html
+
+BIG_PAGE = "<html><body><nav>Menu</nav>" + "".join(
+    f"<p>Clause {i}: données partagées — “{i}”.</p>" for i in range(20000)
+) + "</body></html>"
+
+
+@pytest.fixture
+def pool():
+    pool = ParserPool(processes=1, max_pending=4, timeout_seconds=30)
+    yield pool
+    pool.close()
+
+
+async def test_pool_parses_html_from_shared_memory(pool):
+    """Test that a multi-MB page parses in a child process exactly like in-process."""
+    data = BIG_PAGE.encode("utf-8")
+    assert len(data) > 1024 * 1024
+    
+    title, text = await pool.parse(data, "html", "utf-8")
+    
+    assert text == parse_html(BIG_PAGE)[1]
+    assert text.startswith('Clause 0: données partagées - "0".')
+
+
+async def test_pool_timeout_and_recovery(pool):
+    """Test that a parse over the timeout fails without breaking later parses."""
+    pool.timeout_seconds = 0.01
+    with pytest.raises(ParseTimeoutError):
+        await pool.parse(BIG_PAGE.encode("utf-8") * 3, "html", "utf-8")
+    
+    pool.timeout_seconds = 30
+    title, text = await pool.parse(b"<title>T</title><p>Still works</p>", "html")
+    assert (title, text) == ("T", "Still works")
+
+
+class FakeExecutor(Executor):
+    """Executor whose calls return ``result``, or hang until shutdown breaks them."""
+    
+    def __init__(self, result=None):
+        self.result = result
+        self.futures = []
+    
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        if self.result is not None:
+            future.set_result(self.result)
+        self.futures.append(future)
+        return future
+    
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        for future in self.futures:
+            if not future.done():
+                future.set_exception(BrokenProcessPool("pool killed"))
+
+
+async def test_parses_interrupted_by_timeout_kill_are_retried(monkeypatch):
+    """Test that killing the pool for one stuck parse does not fail the others."""
+    monkeypatch.setattr(parsing, "_KILL_GRACE_SECONDS", 0)
+    pool = ParserPool(processes=2, max_pending=4, timeout_seconds=0.2)
+    stuck, fresh = FakeExecutor(), FakeExecutor(result=("T", "Parsed again"))
+    executors = [stuck, fresh]
+    
+    def get_executor():
+        if pool._executor is None:
+            pool._executor = executors.pop(0)
+        return pool._executor
+    
+    monkeypatch.setattr(pool, "_get_executor", get_executor)
+    culprit = asyncio.create_task(pool.parse(b"<p>Stuck</p>", "html"))
+    await asyncio.sleep(0.1)
+    innocent = asyncio.create_task(pool.parse(b"<p>Innocent</p>", "html"))
+    
+    with pytest.raises(ParseTimeoutError):
+        await culprit
+    assert await innocent == ("T", "Parsed again")
+    assert (len(stuck.futures), len(fresh.futures)) == (2, 1)
+
+
+async def test_unknown_kind_rejected(pool):
+    """Test that only known document kinds are parsed."""
+    with pytest.raises(ParseError):
+        await pool.parse(b"data", "docx")
+
+
+async def test_small_html_parsed_inline(monkeypatch):
+    """Test that small pages skip the process pool."""
+    monkeypatch.setattr(parsing, "_pool", None)
+    
+    title, text = await parse_document(b"<p>Short page</p>", "html")
+    
+    assert text == "Short page"
+    assert parsing._pool is None
+
+
+async def test_pdf_parsed_in_pool(pool):
+    """Test PDF text extraction when PyMuPDF is installed."""
+    fitz = pytest.importorskip("fitz")
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), "You waive class actions.")
+    
+    title, text = await pool.parse(pdf.tobytes(), "pdf")
+    
+    assert text == "You waive class actions."
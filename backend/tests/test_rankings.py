@@ -0,0 +1,132 @@
+"""Tests for precomputed category rankings and the rankings endpoint."""
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.database import ServiceCategoryScore
+from app.services.rankings import category_ranking_select, latest_summary_select
+from app.services.summaries import save_summary
+from tests.conftest import make_document, make_flag, make_rule, make_summary
+
+
+# Every summary also has a rule, so its service is ranked in "content" too
+RULES = [make_rule("content")]
+
+
+async def _scores(db_session: AsyncSession, service_name: str) -> dict:
+    result = await db_session.scalars(
+        select(ServiceCategoryScore).where(ServiceCategoryScore.service_name == service_name)
+    )
+    return {row.category: row for row in result}
+
+
+@pytest.mark.asyncio
+async def test_save_summary_writes_category_scores(db_session: AsyncSession, mock_redis):
+    """Test that saving a summary materializes per-category scores."""
+    document = make_document("Chirp")
+    summary = await save_summary(db_session, mock_redis, make_summary(document, 1, rules=RULES, red_flags=[
+        make_flag("data_sharing", "critical"),
+        make_flag("data_sharing", "info"),
+        make_flag("arbitration", "warning"),
+    ]))
+    
+    scores = await _scores(db_session, "Chirp")
+    
+    assert set(scores) == {"arbitration", "content", "data_sharing"}
+    assert scores["data_sharing"].summary_id == summary.id
+    assert (scores["data_sharing"].critical_count, scores["data_sharing"].info_count) == (1, 1)
+    assert scores["data_sharing"].severity_score == 4
+    assert scores["arbitration"].severity_score == 2
+    assert scores["content"].severity_score == 0
+
+
+@pytest.mark.asyncio
+async def test_new_version_replaces_category_scores(db_session: AsyncSession, mock_redis):
+    """Test that a newer version replaces the scores and an older one does not."""
+    document = make_document("Chirp")
+    await save_summary(db_session, mock_redis, make_summary(
+        document, 1, [make_flag("data_sharing", "critical")], RULES
+    ))
+    newer = make_summary(document, 2, [make_flag("tracking", "warning")], RULES)
+    await save_summary(db_session, mock_redis, newer)
+    # A slow writer finishing an older analysis late
+    stale = make_summary(document, 1, [make_flag("arbitration", "critical")], RULES)
+    stale.generated_at = datetime.now(timezone.utc) - timedelta(days=1)
+    await save_summary(db_session, mock_redis, stale)
+    
+    scores = await _scores(db_session, "Chirp")
+    
+    assert set(scores) == {"content", "tracking"}
+    assert all(row.summary_id == newer.id for row in scores.values())
+
+
+@pytest.mark.asyncio
+async def test_latest_summary_wins_across_service_urls(db_session: AsyncSession, mock_redis):
+    """Test that a new URL's first version replaces another URL's higher version."""
+    old_terms = make_summary(make_document("Chirp"), 5, [make_flag("data_sharing", "critical")], RULES)
+    old_terms.generated_at = datetime.now(timezone.utc) - timedelta(days=30)
+    await save_summary(db_session, mock_redis, old_terms)
+    moved = make_document("Chirp", url="https://chirp.com/legal/terms")
+    latest = make_summary(moved, 1, [make_flag("tracking", "warning")], RULES)
+    await save_summary(db_session, mock_redis, latest)
+    
+    scores = await _scores(db_session, "Chirp")
+    
+    assert set(scores) == {"content", "tracking"}
+    assert all(row.summary_id == latest.id for row in scores.values())
+
+
+@pytest.mark.asyncio
+async def test_rankings_endpoint_orders_by_severity(client: TestClient, db_session: AsyncSession, mock_redis):
+    """Test that the least severe service ranks first, ties broken by clarity."""
+    for service_name, flag, clarity in [
+        ("Chirp", make_flag("data_sharing", "critical"), 60),
+        ("Pixel", make_flag("data_sharing", "info"), 50),
+        ("Forum", make_flag("data_sharing", "info"), 80),
+        ("Other", make_flag("arbitration", "critical"), 60),
+    ]:
+        summary = make_summary(make_document(service_name), 1, [flag], RULES, clarity_score=clarity)
+        await save_summary(db_session, mock_redis, summary)
+    
+    response = client.get("/api/rankings/data_sharing")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["category"] == "data_sharing"
+    assert data["document_type"] == "tos"
+    assert [entry["service_name"] for entry in data["rankings"]] == ["Forum", "Pixel", "Chirp"]
+    assert [entry["rank"] for entry in data["rankings"]] == [1, 2, 3]
+    assert data["rankings"][2]["critical_count"] == 1
+    
+    limited = client.get("/api/rankings/data_sharing?limit=1").json()
+    assert [entry["service_name"] for entry in limited["rankings"]] == ["Forum"]
+
+
+def test_rankings_endpoint_unknown_category(client: TestClient):
+    """Test that an unknown category yields an empty ranking."""
+    response = client.get("/api/rankings/nothing")
+    
+    assert response.status_code == 200
+    assert response.json()["rankings"] == []
+
+
+def test_ranking_query_covered_by_index():
+    """Test that the ranking query reads no column outside the covering index."""
+    index = next(i for i in ServiceCategoryScore.__table__.indexes if i.name == "ix_service_category_scores_ranking")
+    covered = {column.name for column in index.columns} | set(index.dialect_options["postgresql"]["include"])
+    
+    query = category_ranking_select("content", "tos", 20)
+    
+    assert {column.name for column in query.selected_columns} <= covered
+
+
+async def test_latest_summary_lookup_uses_indexes(db_session: AsyncSession):
+    """Test that the latest summary is found by index seeks, not table scans."""
+    query = latest_summary_select("Forum", "tos").compile(
+        dialect=db_session.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = " ".join(row[-1] for row in await db_session.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+    
+    assert "ix_documents_service_name_document_type" in plan
+    assert "ix_summaries_document_id_generated_at_version" in plan
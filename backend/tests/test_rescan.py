@@ -0,0 +1,192 @@
+"""Tests for the re-scan scheduler."""
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models.database import Document, RescanTarget
+from app.services import rescan
+from app.services.dedup import cache_extraction, extraction_cache_key
+from app.services.job_queue import QUEUE_KEY, AnalysisJob, job_data_key
+from app.services.single_flight import single_flight_key
+from app.services.rescan import (
+    CHANGED,
+    ERROR,
+    NOT_MODIFIED,
+    RATE_LIMITED,
+    UNCHANGED,
+    next_check_at,
+    run_rescan_batch,
+)
+from tests.conftest import TestingSessionLocal
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+class Site:
+    """Local HTTP stand-in honouring ETag validators."""
+    
+    def __init__(self):
+        self.body = b"<p>Terms v1</p>"
+        self.requests = []
+        self.open_sessions = []
+        self.sessions_during_fetch = []
+    
+    @property
+    def etag(self):
+        return '"' + hashlib.md5(self.body).hexdigest() + '"'
+    
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.sessions_during_fetch.append(len(self.open_sessions))
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=self.body, headers={"ETag": self.etag, "Content-Type": "text/html"})
+
+
+@pytest.fixture
+def site(monkeypatch, db_session):
+    """The tracked site, with the scheduler's sessions opened on the test database."""
+    site = Site()
+    
+    @asynccontextmanager
+    async def session():
+        async with TestingSessionLocal() as db:
+            site.open_sessions.append(db)
+            try:
+                yield db
+            finally:
+                site.open_sessions.remove(db)
+    
+    monkeypatch.setattr(rescan, "AsyncSessionLocal", session)
+    # Test pages are short; keep them from being sent to a browser.
+    monkeypatch.setattr(settings, "extraction_min_words", 0)
+    return site
+
+
+@pytest.fixture
+async def http_client(site):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(site.handle)) as client:
+        yield client
+
+
+def _document(url: str) -> Document:
+    return Document(
+        url=url,
+        service_name="Example",
+        document_type="tos",
+        raw_content="Terms",
+        content_hash="abc123",
+        extracted_at=NOW - timedelta(days=2),
+    )
+
+
+async def _target(db_session, url):
+    # Results are written by the scheduler's own session.
+    return await db_session.scalar(
+        select(RescanTarget).where(RescanTarget.url == url).execution_options(populate_existing=True)
+    )
+
+
+async def _run(mock_redis, http_client, now):
+    # Each pass gets a clean domain cooldown unless a test is about rate limits.
+    await mock_redis.delete("rescan:domain:example.com")
+    return await run_rescan_batch(mock_redis, http_client, now)
+
+
+async def test_rescan_enqueues_only_on_change(db_session: AsyncSession, mock_redis, http_client, site):
+    """Test 304 and unchanged bodies skip analysis while a changed page is queued."""
+    url = "https://example.com/tos"
+    db_session.add(_document(url))
+    await db_session.commit()
+    await cache_extraction(mock_redis, url, "abc123")
+    
+    # First pass starts tracking and records the validators.
+    assert await _run(mock_redis, http_client, NOW) == {CHANGED: 1}
+    assert await mock_redis.llen(QUEUE_KEY) == 1
+    job = AnalysisJob.model_validate_json(await mock_redis.get(job_data_key(await mock_redis.lindex(QUEUE_KEY, 0))))
+    assert job.priority == "background"
+    assert await mock_redis.get(extraction_cache_key(url)) is None
+    target = await _target(db_session, url)
+    assert target.etag == site.etag
+    assert target.next_check_at.replace(tzinfo=timezone.utc) > NOW
+    
+    later = NOW + timedelta(days=2)
+    assert await _run(mock_redis, http_client, later) == {NOT_MODIFIED: 1}
+    assert site.requests[-1].headers["If-None-Match"] == site.etag
+    
+    # Same body without validators is detected by hash.
+    target.etag = None
+    await db_session.commit()
+    assert await _run(mock_redis, http_client, later + timedelta(days=2)) == {UNCHANGED: 1}
+    
+    # The first job finished; the next change starts a fresh one.
+    await mock_redis.delete(single_flight_key(url, {}))
+    site.body = b"<p>Terms v2</p>"
+    assert await _run(mock_redis, http_client, later + timedelta(days=4)) == {CHANGED: 1}
+    assert await mock_redis.llen(QUEUE_KEY) == 2
+
+
+async def test_rescan_skips_targets_not_due(db_session: AsyncSession, mock_redis, http_client, site):
+    """Test that only due targets are fetched."""
+    db_session.add(RescanTarget(url="https://example.com/tos", domain="example.com", next_check_at=NOW + timedelta(hours=1)))
+    await db_session.commit()
+    
+    assert await _run(mock_redis, http_client, NOW) == {}
+    assert site.requests == []
+
+
+async def test_rescan_rate_limits_per_domain(db_session: AsyncSession, mock_redis, http_client, site):
+    """Test that a domain is fetched at most once per cooldown."""
+    for path in ("tos", "privacy"):
+        db_session.add(RescanTarget(url=f"https://example.com/{path}", domain="example.com", next_check_at=NOW))
+    db_session.add(RescanTarget(url="https://other.org/tos", domain="other.org", next_check_at=NOW))
+    await db_session.commit()
+    
+    outcomes = await run_rescan_batch(mock_redis, http_client, NOW)
+    
+    assert outcomes == {CHANGED: 2, RATE_LIMITED: 1}
+    assert sorted(request.url.host for request in site.requests) == ["example.com", "other.org"]
+    targets = await db_session.scalars(select(RescanTarget).execution_options(populate_existing=True))
+    deferred = [t for t in targets.all() if t.last_checked_at is None]
+    assert len(deferred) == 1
+    assert deferred[0].next_check_at.replace(tzinfo=timezone.utc) <= NOW + timedelta(
+        seconds=2 * settings.rescan_domain_min_interval_seconds
+    )
+
+
+async def test_markup_churn_is_not_a_change(db_session: AsyncSession, mock_redis, http_client, site):
+    """Test that only a change of the extracted text counts, not nonces or timestamps."""
+    db_session.add(RescanTarget(url="https://example.com/tos", domain="example.com", next_check_at=NOW))
+    await db_session.commit()
+    site.body = b'<script nonce="a1">init()</script><!-- rendered 10:00 --><p>Terms v1</p>'
+    assert await _run(mock_redis, http_client, NOW) == {CHANGED: 1}
+    
+    site.body = b'<script nonce="b2">init()</script><!-- rendered 11:00 --><p>Terms   v1</p>'
+    assert await _run(mock_redis, http_client, NOW + timedelta(days=2)) == {UNCHANGED: 1}
+    
+    assert not any(site.sessions_during_fetch)
+
+
+async def test_oversized_page_is_not_downloaded(db_session: AsyncSession, mock_redis, http_client, site, monkeypatch):
+    """Test that re-scans honour the fetch size cap."""
+    monkeypatch.setattr(settings, "fetch_max_bytes", 8)
+    db_session.add(RescanTarget(url="https://example.com/tos", domain="example.com", next_check_at=NOW))
+    await db_session.commit()
+    
+    assert await _run(mock_redis, http_client, NOW) == {ERROR: 1}
+    target = await _target(db_session, "https://example.com/tos")
+    assert target.body_hash is None
+    assert target.next_check_at.replace(tzinfo=timezone.utc) > NOW
+
+
+def test_next_check_at_is_jittered(monkeypatch):
+    """Test that checks spread within the jitter band."""
+    monkeypatch.setattr(settings, "rescan_jitter_ratio", 0.1)
+    times = {next_check_at(NOW, 1000) for _ in range(50)}
+    
+    assert len(times) > 1
+    assert all(NOW + timedelta(seconds=900) <= t <= NOW + timedelta(seconds=1100) for t in times)
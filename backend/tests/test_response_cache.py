@@ -0,0 +1,174 @@
+"""Tests for the persistent model response cache."""
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select
+from app.config import settings
+from app.models.database import ModelResponse
+from app.prompts.sections import prompt_hash
+from app.services.dedup import content_hash
+from app.services.response_cache import (
+    cache_stats,
+    evict_lru,
+    flush_touches,
+    get_cached_response,
+    maintain_response_cache,
+    purge_prompt_version,
+    purge_stale_prompts,
+    store_response,
+)
+
+ITEMS = [{"category": "content", "title": "No spam", "description": "Do not spam."}]
+
+
+async def test_miss_then_hit(db_session, mock_redis):
+    """Test that a stored response is returned for the same section and text only."""
+    assert await get_cached_response(db_session, mock_redis, "rules", "Do not spam.") is None
+    await store_response(db_session, "rules", "Do not spam.", ITEMS)
+    
+    assert await get_cached_response(db_session, mock_redis, "rules", "Do not spam.") == ITEMS
+    assert await get_cached_response(db_session, mock_redis, "rules", "Do not spam!") is None
+    assert await get_cached_response(db_session, mock_redis, "concessions", "Do not spam.") is None
+    
+    # Hits are only written back by the periodic flush.
+    entry = await db_session.scalar(select(ModelResponse).where(ModelResponse.section == "rules"))
+    assert entry.hit_count == 0
+    assert await get_cached_response(db_session, mock_redis, "rules", "Do not spam.") == ITEMS
+    assert await flush_touches(db_session) == 1
+    await db_session.refresh(entry)
+    assert entry.hit_count == 2
+    assert entry.prompt_hash == prompt_hash("rules")
+    assert entry.model_version == settings.anthropic_model
+
+
+async def test_model_version_is_part_of_key(db_session, mock_redis, monkeypatch):
+    """Test that switching models does not reuse the old model's responses."""
+    await store_response(db_session, "rules", "Do not spam.", ITEMS)
+    monkeypatch.setattr(settings, "anthropic_model", "another-model")
+    
+    assert await get_cached_response(db_session, mock_redis, "rules", "Do not spam.") is None
+
+
+async def test_store_is_idempotent(db_session):
+    """Test that caching the same chunk twice keeps a single entry."""
+    await store_response(db_session, "rules", "Do not spam.", ITEMS)
+    await store_response(db_session, "rules", "Do not spam.", [])
+    
+    assert await db_session.scalar(select(func.count()).select_from(ModelResponse)) == 1
+
+
+async def test_store_does_not_evict(db_session, monkeypatch):
+    """Test that inserts leave eviction to the periodic maintenance."""
+    monkeypatch.setattr(settings, "model_cache_max_entries", 1)
+    for i in range(3):
+        await store_response(db_session, "rules", f"Rule {i}.", ITEMS)
+    
+    assert await db_session.scalar(select(func.count()).select_from(ModelResponse)) == 3
+
+
+async def test_least_recently_used_entries_evicted(db_session, mock_redis, monkeypatch):
+    """Test that eviction keeps the most recently used entries."""
+    for i in range(4):
+        await store_response(db_session, "rules", f"Rule {i}.", ITEMS)
+    # Age the entries so their LRU order is unambiguous, oldest first.
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+    for i in range(4):
+        entry = await db_session.scalar(
+            select(ModelResponse).where(ModelResponse.chunk_hash == content_hash(f"Rule {i}."))
+        )
+        entry.last_used_at = base + timedelta(minutes=i)
+    await db_session.commit()
+    # Reading the oldest entry makes it the most recently used once flushed.
+    assert await get_cached_response(db_session, mock_redis, "rules", "Rule 0.") == ITEMS
+    
+    monkeypatch.setattr(settings, "model_cache_max_entries", 2)
+    assert await maintain_response_cache(db_session) == 2
+    
+    assert await get_cached_response(db_session, mock_redis, "rules", "Rule 0.") == ITEMS
+    assert await get_cached_response(db_session, mock_redis, "rules", "Rule 3.") == ITEMS
+    assert await get_cached_response(db_session, mock_redis, "rules", "Rule 1.") is None
+
+
+async def test_evict_lru_keeps_newest_entries(db_session):
+    """Test that eviction removes the entries used longest ago beyond the limit."""
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+    for i in range(3):
+        await store_response(db_session, "rules", f"Rule {i}.", ITEMS)
+        entry = await db_session.scalar(
+            select(ModelResponse).where(ModelResponse.chunk_hash == content_hash(f"Rule {i}."))
+        )
+        entry.last_used_at = base + timedelta(minutes=i)
+    await db_session.commit()
+    
+    assert await evict_lru(db_session, max_entries=3) == 0
+    assert await evict_lru(db_session, max_entries=1) == 2
+    
+    remaining = await db_session.scalars(select(ModelResponse.chunk_hash))
+    assert remaining.all() == [content_hash("Rule 2.")]
+
+
+async def test_failed_flush_keeps_hits(db_session, mock_redis, monkeypatch):
+    """Test that hits survive a failed write-back, merged with hits recorded since."""
+    await store_response(db_session, "rules", "Do not spam.", ITEMS)
+    await get_cached_response(db_session, mock_redis, "rules", "Do not spam.")
+    
+    async def fail(*args, **kwargs):
+        raise ConnectionError("database went away")
+    
+    with monkeypatch.context() as patch:
+        patch.setattr(db_session, "execute", fail)
+        with pytest.raises(ConnectionError):
+            await flush_touches(db_session)
+    await get_cached_response(db_session, mock_redis, "rules", "Do not spam.")
+    
+    assert await flush_touches(db_session) == 1
+    entry = await db_session.scalar(select(ModelResponse))
+    assert entry.hit_count == 2
+
+
+async def test_purge_by_prompt_version(db_session):
+    """Test purging one prompt version and every outdated one."""
+    await store_response(db_session, "rules", "Do not spam.", ITEMS)
+    await store_response(db_session, "red_flags", "Do not spam.", [])
+    db_session.add(ModelResponse(
+        model_version=settings.anthropic_model,
+        prompt_hash="0" * 16,
+        chunk_hash="1" * 64,
+        section="rules",
+        items=ITEMS,
+        hit_count=0,
+    ))
+    await db_session.commit()
+    
+    assert await purge_stale_prompts(db_session) == 1
+    assert await purge_prompt_version(db_session, prompt_hash("rules")) == 1
+    
+    remaining = (await db_session.scalars(select(ModelResponse.section))).all()
+    assert remaining == ["red_flags"]
+
+
+async def test_stats_report_hit_rate(db_session, mock_redis):
+    """Test hit and miss counts per section and entries per prompt version."""
+    await get_cached_response(db_session, mock_redis, "rules", "Do not spam.")
+    await store_response(db_session, "rules", "Do not spam.", ITEMS)
+    for _ in range(3):
+        await get_cached_response(db_session, mock_redis, "rules", "Do not spam.")
+    
+    stats = await cache_stats(db_session, mock_redis)
+    
+    assert stats["sections"]["rules"] == {
+        "prompt_hash": prompt_hash("rules"),
+        "hits": 3,
+        "misses": 1,
+        "hit_rate": 0.75,
+    }
+    assert stats["sections"]["red_flags"]["hit_rate"] is None
+    assert stats["entries"] == [{"section": "rules", "prompt_hash": prompt_hash("rules"), "entries": 1}]
+
+
+def test_stats_endpoint(client):
+    """Test the model cache stats endpoint."""
+    response = client.get("/api/model-cache/stats")
+    
+    assert response.status_code == 200
+    assert set(response.json()["sections"]) == {"red_flags", "rules", "concessions"}
+    assert response.json()["entries"] == []
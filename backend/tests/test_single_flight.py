@@ -0,0 +1,64 @@
+"""Tests for single-flight coalescing of analyze submissions."""
+import pytest
+from fastapi.testclient import TestClient
+from app.services.job_queue import QUEUE_KEY, ack_job, reserve_job
+from app.services.single_flight import (
+    COALESCED_TOTAL_KEY,
+    coalesced_count,
+    normalize_url,
+    release,
+    single_flight_key,
+)
+
+URL = "https://www.youtube.com/static?template=terms"
+
+
+def test_normalize_url():
+    """Test that cosmetic URL differences normalize to the same form."""
+    assert normalize_url("HTTPS://Example.COM:443/terms/?b=2&a=1#section") == (
+        "https://example.com/terms?a=1&b=2"
+    )
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+
+def test_single_flight_key_includes_options():
+    """Test that options are part of the coalescing identity."""
+    assert single_flight_key(URL, {}) == single_flight_key(URL + "#top", None)
+    assert single_flight_key(URL, {"a": 1, "b": 2}) == single_flight_key(URL, {"b": 2, "a": 1})
+    assert single_flight_key(URL, {}) != single_flight_key(URL, {"language": "de"})
+
+
+async def test_identical_submissions_share_job(client: TestClient, mock_redis):
+    """Test that concurrent identical submissions get the same job id."""
+    first = client.post("/api/analyze", json={"url": URL, "options": {}}).json()
+    second = client.post("/api/analyze", json={"url": URL + "#x", "options": {}}).json()
+    
+    assert second["job_id"] == first["job_id"]
+    assert first["coalesced"] is False
+    assert second["coalesced"] is True
+    assert await mock_redis.llen(QUEUE_KEY) == 1
+    assert await coalesced_count(mock_redis, first["job_id"]) == 1
+    assert await mock_redis.get(COALESCED_TOTAL_KEY) == "1"
+
+
+async def test_finished_job_releases_key(client: TestClient, mock_redis):
+    """Test that a new job is started once the previous one completed."""
+    first = client.post("/api/analyze", json={"url": URL, "options": {}}).json()
+    job = await reserve_job(mock_redis, timeout_seconds=0.1)
+    await ack_job(mock_redis, job)
+    
+    second = client.post("/api/analyze", json={"url": URL, "options": {}}).json()
+    assert second["job_id"] != first["job_id"]
+    assert second["coalesced"] is False
+
+
+async def test_release_only_by_owner(mock_redis):
+    """Test that a stale job cannot release a key claimed by a newer job."""
+    key = single_flight_key(URL, {})
+    await mock_redis.set(key, "new-job")
+    
+    await release(mock_redis, key, "old-job")
+    assert await mock_redis.get(key) == "new-job"
+    
+    await release(mock_redis, key, "new-job")
+    assert await mock_redis.get(key) is None
@@ -0,0 +1,94 @@
+"""Tests for delta-encoded document version chains."""
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.services.dedup import content_hash
+from app.services.extraction import ExtractedDocument
+from app.services.summaries import store_analysis
+from app.services.version_chain import (
+    apply_ops,
+    diff_ops,
+    load_document_text,
+    load_text,
+    version_text_cache,
+)
+
+PARAGRAPHS = [f"Section {i}. We may process your data for purpose number {i}.\n" for i in range(200)]
+
+
+def _version(edit: int) -> str:
+    paragraphs = list(PARAGRAPHS)
+    paragraphs[edit] = f"Section {edit}. Revised clause {edit}.\n"
+    return "".join(paragraphs)
+
+
+def test_diff_round_trip():
+    """Test that applying a diff rebuilds the new text exactly."""
+    base = "".join(PARAGRAPHS)
+    text = _version(3).replace("Section 150.", "Section 150 (amended).") + "Trailing line without newline"
+    
+    ops = diff_ops(base, text)
+    
+    assert apply_ops(base, ops) == text
+    assert sum(isinstance(op, str) for op in ops) == 3
+
+
+async def _store(db_session, mock_redis, text):
+    extracted = ExtractedDocument(
+        url="https://example.com/tos",
+        service_name="Example",
+        document_type="tos",
+        text=text,
+        content_hash=content_hash(text),
+    )
+    summary = await store_analysis(db_session, mock_redis, extracted, {})
+    return await summary.awaitable_attrs.document
+
+
+async def test_versions_stored_as_diffs_between_snapshots(
+    db_session: AsyncSession, mock_redis, blob_store, monkeypatch
+):
+    """Test snapshots every N versions, diffs in between, and reconstruction."""
+    monkeypatch.setattr(settings, "version_snapshot_interval", 3)
+    texts = [_version(i) for i in range(5)]
+    
+    documents = [await _store(db_session, mock_redis, text) for text in texts]
+    
+    assert [d.chain_depth for d in documents] == [0, 1, 2, 0, 1]
+    assert documents[1].base_content_hash == documents[0].content_hash
+    assert documents[3].base_content_hash is None
+    
+    deltas = list(blob_store.root.rglob("*.delta.zst"))
+    snapshots = [p for p in blob_store.root.rglob("*.zst") if p not in deltas]
+    assert (len(snapshots), len(deltas)) == (2, 3)
+    assert sum(p.stat().st_size for p in deltas) < min(p.stat().st_size for p in snapshots)
+    
+    version_text_cache.clear()
+    for document, text in zip(documents, texts):
+        assert await load_document_text(document) == text
+
+
+async def test_unchanged_text_reuses_chain_position(db_session: AsyncSession, mock_redis):
+    """Test that re-storing an identical text writes nothing new."""
+    first = await _store(db_session, mock_redis, _version(0))
+    second = await _store(db_session, mock_redis, _version(1))
+    again = await _store(db_session, mock_redis, _version(1))
+    
+    assert (again.base_content_hash, again.chain_depth) == (first.content_hash, 1)
+    assert second.content_hash == again.content_hash
+
+
+async def test_large_change_stores_snapshot(db_session: AsyncSession, mock_redis):
+    """Test that a rewrite is stored as a snapshot rather than a bulky diff."""
+    await _store(db_session, mock_redis, _version(0))
+    rewritten = await _store(db_session, mock_redis, "".join(p.upper() for p in PARAGRAPHS))
+    
+    assert (rewritten.base_content_hash, rewritten.chain_depth) == (None, 0)
+
+
+async def test_load_text_uses_cache(blob_store):
+    """Test that recently rebuilt versions are served from memory."""
+    text = _version(0)
+    await blob_store.put_text(content_hash(text), text)
+    
+    assert await load_text(content_hash(text)) == text
+    assert version_text_cache.get(content_hash(text)) == text